@@ -2,7 +2,9 @@ from flask import Flask, request, jsonify
 from flask_cors import CORS
 from dotenv import load_dotenv
 from google import genai
+from google.genai import types
 import os
+import sys
 import base64
 import time
 import threading
@@ -12,6 +14,9 @@ from werkzeug.utils import secure_filename
 from PIL import Image
 import io
 
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'classification'))
+from structured_labels import StructuredLabeler, StubModel, response_schema
+
 # Load environment variables from specific path
 load_dotenv(dotenv_path=os.path.join(os.path.dirname(__file__), '.env'))
 
@@ -144,6 +149,34 @@ else:
     print("GEMINI_API_KEY not found in environment variables") 
     gemini_client = None
 
+# Schema-constrained image classification: the model answers {"label", "confidence"}
+CLASSIFY_LABELS = ['can', 'plastic', 'paper', 'glass']
+CLASSIFY_PROMPT = """Analyze this recycling image. Look for:
+- ALUMINUM CANS: metallic shine, cylindrical shape, pull-tabs
+- PLASTIC: bottles, containers, clear/colored plastic
+- PAPER: cardboard, newspapers, paper packaging  
+- GLASS: transparent bottles, jars
+
+Answer with the label (can, plastic, paper, or glass) and your confidence from 0.0 to 1.0"""
+
+def generate_image_label(image_data, mime_type):
+    """One Gemini call with the image; returns the JSON response text"""
+    response = gemini_client.models.generate_content(
+        model="gemini-2.5-flash",
+        contents=[types.Part.from_bytes(data=image_data, mime_type=mime_type), CLASSIFY_PROMPT],
+        config=types.GenerateContentConfig(
+            response_mime_type='application/json',
+            response_schema=response_schema(CLASSIFY_LABELS)
+        )
+    )
+    return response.text
+
+if os.getenv("CLASSIFIER_STUB"):
+    print("CLASSIFIER_STUB set - classifying with the offline stub model")
+    image_labeler = StructuredLabeler(StubModel(CLASSIFY_LABELS), CLASSIFY_LABELS)
+else:
+    image_labeler = StructuredLabeler(generate_image_label, CLASSIFY_LABELS)
+
 @app.route("/generate-thankyou", methods=["POST"])
 def generate_thankyou():
     """Generate thank you message with smart caching to reduce API calls"""
@@ -384,36 +417,33 @@ def classify_image():
             })
         
         # Only use Gemini for unclear cases (reduces API calls by 70%)
-        if gemini_client and random.random() < 0.8:  # 80% chance to use AI for unclear images
+        use_model = gemini_client or os.getenv("CLASSIFIER_STUB")
+        if use_model and random.random() < 0.8:  # 80% chance to use AI for unclear images
             try:
-                api_stats['gemini_calls'] += 1
-                # Single optimized prompt (no secondary analysis)
-                optimized_prompt = """Analyze this recycling image. Look for:
-- ALUMINUM CANS: metallic shine, cylindrical shape, pull-tabs
-- PLASTIC: bottles, containers, clear/colored plastic
-- PAPER: cardboard, newspapers, paper packaging  
-- GLASS: transparent bottles, jars
-
-Respond with exactly ONE word: can, plastic, paper, or glass"""
-                
-                response = gemini_client.models.generate_content(
-                    model="gemini-2.5-flash",
-                    contents=optimized_prompt
-                )
+                calls_before = image_labeler.stats['model_calls']
+                labeled = image_labeler.classify(image_data, Image.MIME.get(image.format, 'image/jpeg'))
+                api_stats['gemini_calls'] += image_labeler.stats['model_calls'] - calls_before
                 
-                classification_text = response.text.strip().lower()
-                valid_categories = ['can', 'plastic', 'paper', 'glass']
+                if labeled['status'] == 'unparseable':
+                    # No valid answer after the retry: say so rather than guessing, and don't cache it
+                    return jsonify({
+                        "classification": "unknown",
+                        "confidence": "gemini_unparseable",
+                        "source": "optimized",
+                        "attempts": labeled['attempts']
+                    })
                 
-                if classification_text in valid_categories:
-                    classification_result = classification_text
-                    confidence_score = "gemini_single_pass"
-                else:
-                    # Simple keyword extraction (no second API call)
-                    for category in valid_categories:
-                        if category in classification_text:
-                            classification_result = category
-                            confidence_score = "gemini_keyword"
-                            break
+                classification_result = labeled['label']
+                if labeled['status'] == 'low_confidence':
+                    # Uncached, so the next upload of this image asks again
+                    return jsonify({
+                        "classification": classification_result,
+                        "confidence": "gemini_low_confidence",
+                        "model_confidence": labeled['confidence'],
+                        "source": "optimized",
+                        "attempts": labeled['attempts']
+                    })
+                confidence_score = "gemini_structured"
                 
             except Exception as e:
                 print(f"Gemini classification error: {e}")
@@ -559,6 +589,7 @@ def get_api_stats():
     
     return jsonify({
         "api_usage": api_stats,
+        "structured_output": image_labeler.get_stats(),
         "cache_status": current_cache_status,
         "performance_metrics": {
             "uptime_hours": round(uptime_hours, 2),
@@ -0,0 +1,3 @@
+"""
+Shared camera utilities for the classification and human detection services
+"""
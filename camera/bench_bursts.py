@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""
+Offline burst selection evaluation
+Replays a recorded session (see frame_source.py) as fast as possible, runs the
+BurstSelector over every burst of consecutive frames and compares its pick with
+the trigger frame the classifier used before: how often the pick differs, the
+sharpness gain and the time per selection.
+
+Without a recording, --synthesize writes a session built from a still capture:
+the plate is empty, the item slides in with motion blur, shakes, then settles,
+once per second.
+
+Usage:
+    python -m camera.bench_bursts sessions/plate01 [--burst-size 5] [--roi x y w h]
+    python -m camera.bench_bursts sessions/synthetic --synthesize classification/WIN_20260221_15_35_17_Pro.jpg
+"""
+
+import argparse
+import time
+from collections import deque
+
+import cv2
+import numpy as np
+
+from camera.burst_selector import BurstSelector
+from camera.frame_source import FrameRecorder, ReplaySource
+
+
+def motion_blur(frame, length):
+    """Horizontal motion blur of the given length in pixels"""
+    kernel = np.zeros((length, length), dtype=np.float32)
+    kernel[length // 2, :] = 1.0 / length
+    return cv2.filter2D(frame, -1, kernel)
+
+
+def synthesize_session(path, image_path, cycles=5, fps=30, shape=(480, 640)):
+    """Record a session from a still: per cycle 5 empty frames, 10 sliding, 5 shaking, 10 settled"""
+    still = cv2.imread(image_path)
+    if still is None:
+        raise ValueError(f"Could not read {image_path}")
+    still = cv2.resize(still, (shape[1], shape[0]))
+    empty = np.full_like(still, int(still.mean()))
+    rng = np.random.default_rng(0)
+
+    recorder = FrameRecorder(path, 'raw', fps=fps)
+    timestamp = time.time()
+    for _ in range(cycles):
+        for i in range(30):
+            if i < 5:
+                frame = empty.copy()
+            elif i < 15:
+                # Sliding in from the right: displaced and smeared along the motion
+                offset = (15 - i) * shape[1] // 20
+                frame = empty.copy()
+                frame[:, :shape[1] - offset] = still[:, offset:]
+                frame = motion_blur(frame, 25)
+            elif i < 20:
+                frame = motion_blur(still, 7)  # Plate still shaking
+            else:
+                frame = still.copy()
+            noise = rng.normal(0, 2, frame.shape)
+            recorder.write(np.clip(frame + noise, 0, 255).astype(np.uint8), timestamp)
+            timestamp += 1.0 / fps
+    recorder.close()
+    print(f"💾 Synthesized {recorder.frames} frames to {path}")
+
+
+def evaluate(path, burst_size=5, roi=None):
+    """Replay a recording through the selector; returns summary metrics"""
+    source = ReplaySource(path, realtime=False)
+    selector = BurstSelector(burst_size=burst_size, roi=roi)
+    burst = deque(maxlen=burst_size)
+    gains = []
+    moved = 0
+    selection_ms = []
+
+    while True:
+        ret, frame = source.read()
+        if not ret:
+            break
+        if selector.reference is None:
+            selector.set_reference(frame)  # Sessions start on an empty plate
+        burst.append(frame)
+        if len(burst) < burst_size:
+            continue
+
+        start_time = time.perf_counter()
+        index, info = selector.select(list(burst))
+        selection_ms.append((time.perf_counter() - start_time) * 1000)
+        if index != burst_size - 1:
+            moved += 1
+        if info['trigger_sharpness'] > 0:
+            gains.append(info['sharpness'] / info['trigger_sharpness'])
+    source.release()
+
+    bursts = len(selection_ms)
+    return {
+        'frames': source.count,
+        'bursts': bursts,
+        'pick_differs': round(moved / bursts, 3) if bursts else None,
+        'avg_sharpness_gain': round(float(np.mean(gains)), 2) if gains else None,
+        'p95_sharpness_gain': round(float(np.percentile(gains, 95)), 2) if gains else None,
+        'avg_selection_ms': round(float(np.mean(selection_ms)), 3) if bursts else None
+    }
+
+
+def main():
+    """Main function"""
+    parser = argparse.ArgumentParser(description="Evaluate burst selection on a recorded session")
+    parser.add_argument('path', help='Recording directory')
+    parser.add_argument('--burst-size', type=int, default=5)
+    parser.add_argument('--roi', type=int, nargs=4, metavar=('X', 'Y', 'W', 'H'))
+    parser.add_argument('--synthesize', metavar='IMAGE', help='First write a synthetic session from a still')
+    args = parser.parse_args()
+
+    if args.synthesize:
+        synthesize_session(args.path, args.synthesize)
+
+    results = evaluate(args.path, args.burst_size, tuple(args.roi) if args.roi else None)
+    print(f"📊 Burst selection over {results['bursts']} bursts of {args.burst_size} "
+          f"({results['frames']} frames)")
+    print(f"   Pick differs from trigger frame: {results['pick_differs']:.0%}")
+    print(f"   Sharpness gain: avg {results['avg_sharpness_gain']}x, p95 {results['p95_sharpness_gain']}x")
+    print(f"   Selection time: {results['avg_selection_ms']}ms per burst")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""
+Capture mode benchmark
+Opens a camera in each candidate mode, verifies what the device delivered and
+measures achieved fps and process CPU use while reading frames, then suggests
+the cheapest mode that keeps up.
+
+Usage:
+    python -m camera.bench_formats [--camera 0] [--seconds 5] [--min-fps 25]
+    python -m camera.bench_formats --modes MJPG:640x480@30 YUYV:640x480@30
+"""
+
+import argparse
+import time
+
+import cv2
+
+from camera.capture_format import CaptureFormat
+
+DEFAULT_MODES = [
+    'MJPG:640x480@30',
+    'YUYV:640x480@30',
+    'MJPG:320x240@30',
+    'YUYV:320x240@30',
+    'MJPG:1280x720@30',
+    'YUYV:1280x720@10'
+]
+
+
+def measure_mode(camera_index, capture_format, seconds):
+    """Open the camera in one mode and read frames for a while; returns a result dict"""
+    cap = cv2.VideoCapture(camera_index)
+    if not cap.isOpened():
+        return None
+    for prop, value in capture_format.settings().items():
+        cap.set(prop, value)
+
+    ret, frame = cap.read()
+    if not ret:
+        cap.release()
+        return None
+    report = capture_format.verify(cap, frame)
+
+    # Let auto-exposure and the driver queue settle before timing
+    for _ in range(5):
+        cap.read(image=frame)
+
+    frames = 0
+    wall_start = time.perf_counter()
+    cpu_start = time.process_time()
+    while time.perf_counter() - wall_start < seconds:
+        ret, frame = cap.read(image=frame)
+        if not ret:
+            break
+        frames += 1
+    wall = time.perf_counter() - wall_start
+    cpu = time.process_time() - cpu_start
+    cap.release()
+
+    return {
+        'mode': str(capture_format),
+        'delivered': report['delivered'],
+        'mismatches': report['mismatches'],
+        'fps': frames / wall if wall > 0 else 0.0,
+        'cpu_percent': 100 * cpu / wall if wall > 0 else 0.0
+    }
+
+
+def main():
+    """Main function"""
+    parser = argparse.ArgumentParser(description="Capture mode benchmark")
+    parser.add_argument('--camera', type=int, default=0)
+    parser.add_argument('--seconds', type=float, default=5.0)
+    parser.add_argument('--min-fps', type=float, default=25.0)
+    parser.add_argument('--modes', nargs='+', default=DEFAULT_MODES)
+    args = parser.parse_args()
+
+    print(f"📊 Capture modes on camera {args.camera} ({args.seconds:.0f}s each)")
+    print("=" * 78)
+    print(f"   {'Requested':<20} {'Delivered':<24} {'FPS':>6} {'CPU %':>7}  Notes")
+
+    results = []
+    for mode in args.modes:
+        result = measure_mode(args.camera, CaptureFormat.parse(mode), args.seconds)
+        if result is None:
+            print(f"   {mode:<20} {'(could not open)':<24}")
+            continue
+        results.append(result)
+        delivered = result['delivered']
+        delivered_text = f"{delivered['fourcc'] or '?'}:{delivered['width']}x{delivered['height']}@{delivered['fps']:g}"
+        notes = f"mismatch: {', '.join(result['mismatches'])}" if result['mismatches'] else ""
+        print(f"   {mode:<20} {delivered_text:<24} {result['fps']:6.1f} {result['cpu_percent']:7.1f}  {notes}")
+
+    # Cheapest mode that was delivered as asked and keeps up with the minimum rate
+    acceptable = [r for r in results if not r['mismatches'] and r['fps'] >= args.min_fps]
+    print("=" * 78)
+    if acceptable:
+        best = min(acceptable, key=lambda r: r['cpu_percent'])
+        print(f"✅ Cheapest mode at >= {args.min_fps:g} fps: {best['mode']} ({best['cpu_percent']:.1f}% CPU)")
+        print(f"   Use it with: CAMERA_FORMAT={best['mode']}")
+    else:
+        print(f"⚠️ No mode delivered as requested at >= {args.min_fps:g} fps")
+
+
+if __name__ == "__main__":
+    main()
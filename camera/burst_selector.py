@@ -0,0 +1,123 @@
+"""
+Best-frame selection from a short burst
+Scores the last few frames from the capture ring for sharpness (Laplacian
+variance), exposure and plate ROI occupancy on strided grayscale samples, all
+vectorized across the burst, so classification gets the clearest frame rather
+than whichever one tripped the motion detector.
+"""
+
+import threading
+
+import numpy as np
+
+# BGR -> luma weights (ITU-R BT.601)
+LUMA_WEIGHTS = np.array([0.114, 0.587, 0.299], dtype=np.float32)
+
+
+class BurstSelector:
+    def __init__(self, burst_size=5, roi=None, step=4, weights=(0.6, 0.2, 0.2), diff_threshold=25):
+        """Initialize the selector; roi is (x, y, w, h) in frame pixels or None for the full frame
+
+        weights are (sharpness, exposure, occupancy); step is the sampling stride.
+        """
+        self.burst_size = burst_size
+        self.roi = roi
+        self.step = step
+        self.weights = np.array(weights, dtype=np.float32)
+        self.diff_threshold = diff_threshold
+
+        # Empty-plate reference sample for occupancy; None until the first empty frame
+        self.reference = None
+        self.lock = threading.Lock()
+
+        self.stats = {
+            'selections': 0,
+            'trigger_frame_kept': 0,
+            'sharpness_gain_total': 0.0
+        }
+
+    def _sample(self, frames):
+        """Stack strided grayscale samples of the ROI as a (K, H, W) float32 array"""
+        if self.roi is None:
+            crops = [frame[::self.step, ::self.step] for frame in frames]
+        else:
+            x, y, w, h = self.roi
+            crops = [frame[y:y + h:self.step, x:x + w:self.step] for frame in frames]
+        return np.stack(crops).astype(np.float32) @ LUMA_WEIGHTS
+
+    def set_reference(self, frame):
+        """Use a frame known to show an empty plate as the occupancy reference"""
+        sample = self._sample([frame])[0]
+        with self.lock:
+            if self.reference is None or self.reference.shape != sample.shape:
+                self.reference = sample
+            else:
+                # Slow blend follows lighting drift between sorts
+                self.reference = 0.8 * self.reference + 0.2 * sample
+
+    def score(self, frames):
+        """Score a burst of frames; returns per-frame arrays keyed by metric"""
+        gray = self._sample(frames)
+
+        # Sharpness: variance of the 4-neighbour Laplacian over each sample
+        laplacian = (4 * gray[:, 1:-1, 1:-1] - gray[:, :-2, 1:-1] - gray[:, 2:, 1:-1]
+                     - gray[:, 1:-1, :-2] - gray[:, 1:-1, 2:])
+        sharpness = laplacian.reshape(len(frames), -1).var(axis=1)
+
+        # Exposure: penalize a mean far from mid-grey and clipped shadows/highlights
+        flat = gray.reshape(len(frames), -1)
+        clipped = ((flat < 8) | (flat > 247)).mean(axis=1)
+        exposure = np.clip(1.0 - np.abs(flat.mean(axis=1) - 128.0) / 128.0 - clipped, 0.0, 1.0)
+
+        # Occupancy: share of the ROI that differs from the empty-plate reference
+        with self.lock:
+            reference = self.reference
+        if reference is not None and reference.shape == gray.shape[1:]:
+            occupancy = (np.abs(gray - reference) > self.diff_threshold).reshape(len(frames), -1).mean(axis=1)
+        else:
+            occupancy = np.zeros(len(frames), dtype=np.float32)
+
+        # Sharpness and occupancy are relative to the best frame in the burst
+        sharpness_norm = sharpness / sharpness.max() if sharpness.max() > 0 else np.zeros_like(sharpness)
+        occupancy_norm = occupancy / occupancy.max() if occupancy.max() > 0 else np.ones_like(occupancy)
+        combined = np.stack([sharpness_norm, exposure, occupancy_norm]).T @ self.weights
+
+        return {
+            'sharpness': sharpness,
+            'exposure': exposure,
+            'occupancy': occupancy,
+            'score': combined
+        }
+
+    def select(self, frames):
+        """Pick the best frame of a burst (oldest first); returns (index, scores of the pick)"""
+        scores = self.score(frames)
+
+        # Ties go to the newest frame, which is the one closest to the plate at rest
+        index = len(frames) - 1 - int(np.argmax(scores['score'][::-1]))
+
+        trigger_sharpness = float(scores['sharpness'][-1])
+        self.stats['selections'] += 1
+        if index == len(frames) - 1:
+            self.stats['trigger_frame_kept'] += 1
+        if trigger_sharpness > 0:
+            self.stats['sharpness_gain_total'] += float(scores['sharpness'][index]) / trigger_sharpness
+
+        return index, {
+            'burst_size': len(frames),
+            'index': index,
+            'sharpness': round(float(scores['sharpness'][index]), 1),
+            'trigger_sharpness': round(trigger_sharpness, 1),
+            'exposure': round(float(scores['exposure'][index]), 3),
+            'occupancy': round(float(scores['occupancy'][index]), 3)
+        }
+
+    def get_stats(self):
+        """Get selection statistics for the status endpoint"""
+        selections = self.stats['selections']
+        return {
+            'selections': selections,
+            'trigger_frame_kept': self.stats['trigger_frame_kept'],
+            'avg_sharpness_gain': round(self.stats['sharpness_gain_total'] / selections, 2) if selections else None,
+            'reference_ready': self.reference is not None
+        }
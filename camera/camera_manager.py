@@ -0,0 +1,242 @@
+"""
+Camera manager
+Opens a webcam quickly: the last good device (and the format it delivered) is
+remembered on disk and tried first, the remaining indices are probed in
+parallel with a timeout, and a released camera can be kept open on warm
+standby so a stop/start cycle reuses it instead of reopening the device.
+"""
+
+import json
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+
+import cv2
+
+from camera.capture_format import CaptureFormat
+
+DEFAULT_CACHE_PATH = os.path.join(os.path.expanduser('~'), '.cache', 'makemit', 'cameras.json')
+
+
+class CameraManager:
+    def __init__(self, name, indices=range(5), settings=None, capture_format=None, cache_path=None,
+                 probe_timeout=3.0, standby_timeout=60.0, capture_factory=None):
+        """Initialize the manager
+
+        name keys the cache entry (one per service); capture_format is the
+        CaptureFormat to negotiate (defaults to CAMERA_FORMAT or 640x480);
+        settings maps other cv2.CAP_PROP_* ids to values applied after it,
+        right after opening and before the first read. capture_factory(index)
+        opens a device (cv2.VideoCapture by default).
+        """
+        self.name = name
+        self.indices = list(indices)
+        self.capture_format = capture_format or CaptureFormat.from_env()
+        # Format first: drivers pick the pixel format before the size and rate
+        self.settings = {**self.capture_format.settings(), **(settings or {})}
+        self.format_report = None
+        self.cache_path = cache_path or os.getenv("CAMERA_CACHE_PATH", DEFAULT_CACHE_PATH)
+        self.probe_timeout = probe_timeout
+        self.standby_timeout = standby_timeout
+        self.capture_factory = capture_factory or cv2.VideoCapture
+
+        self.device = None
+        self.device_index = None
+        self.standby_timer = None
+        self.lock = threading.Lock()
+
+        self.stats = {
+            'opens': 0,
+            'standby_reuses': 0,
+            'cache_hits': 0,
+            'probes': 0,
+            'failures': 0,
+            'last_open_ms': None,
+            'last_source': None
+        }
+
+    def _load_cache(self):
+        """Read all cached camera entries"""
+        try:
+            with open(self.cache_path) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _save_cache(self, index, cap):
+        """Remember the device index and the format it actually delivered"""
+        cache = self._load_cache()
+        cache[self.name] = {
+            'index': index,
+            'width': int(cap.get(cv2.CAP_PROP_FRAME_WIDTH)),
+            'height': int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT)),
+            'fps': cap.get(cv2.CAP_PROP_FPS),
+            'format': self.format_report,
+            'saved_at': time.time()
+        }
+        try:
+            os.makedirs(os.path.dirname(self.cache_path), exist_ok=True)
+            temp_path = self.cache_path + '.tmp'
+            with open(temp_path, 'w') as f:
+                json.dump(cache, f, indent=2)
+            os.replace(temp_path, self.cache_path)
+        except OSError as e:
+            print(f"⚠️ Could not save camera cache: {e}")
+
+    def _try_open(self, index, settings):
+        """Open one device, apply settings and read a frame; returns (capture, format report) or (None, None)
+
+        The format report compares the negotiated mode with the first frame.
+        """
+        try:
+            cap = self.capture_factory(index)
+            if not cap.isOpened():
+                cap.release()
+                return None, None
+            for prop, value in settings.items():
+                cap.set(prop, value)
+            ret, frame = cap.read()
+        except cv2.error as e:
+            print(f"⚠️ Camera {index} probe failed: {e}")
+            return None, None
+        if not ret:
+            cap.release()
+            return None, None
+
+        report = self.capture_format.verify(cap, frame)
+        if report['mismatches']:
+            print(f"⚠️ Camera {index} asked for {report['requested']}, delivered {report['delivered']}")
+        return cap, report
+
+    def _probe(self, indices):
+        """Open candidate devices in parallel; returns (index, capture, report) for the lowest index that works"""
+        if not indices:
+            return None, None, None
+
+        results = {}
+        pool = ThreadPoolExecutor(max_workers=len(indices))
+        futures = {pool.submit(self._try_open, index, self.settings): index for index in indices}
+        pending = set(futures)
+        deadline = time.monotonic() + self.probe_timeout
+
+        while pending:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            done, pending = wait(pending, timeout=remaining, return_when=FIRST_COMPLETED)
+            for future in done:
+                results[futures[future]] = future.result()
+            # Stop early once the lowest still-possible index has answered
+            lowest_pending = min((futures[f] for f in pending), default=None)
+            working = [i for i, (cap, _) in results.items() if cap is not None]
+            if working and (lowest_pending is None or min(working) < lowest_pending):
+                break
+
+        # Devices still opening when we give up are released as soon as they finish
+        for future in pending:
+            future.add_done_callback(lambda f: f.result()[0] is not None and f.result()[0].release())
+        pool.shutdown(wait=False)
+
+        working = sorted(i for i, (cap, _) in results.items() if cap is not None)
+        for index, (cap, _) in results.items():
+            if cap is not None and index != working[0]:
+                cap.release()
+        return (working[0], *results[working[0]]) if working else (None, None, None)
+
+    def open(self):
+        """Get an open camera: the standby device, the cached one, or the first found by probing"""
+        start_time = time.time()
+        with self.lock:
+            if self.standby_timer:
+                self.standby_timer.cancel()
+                self.standby_timer = None
+
+            # Warm standby: the device was never closed
+            if self.device is not None and self.device.isOpened():
+                self.stats['standby_reuses'] += 1
+                return self._opened(self.device, 'standby', start_time)
+
+            cached = self._load_cache().get(self.name)
+            index, cap, report = None, None, None
+            if cached and cached.get('index') in self.indices:
+                cap, report = self._try_open(cached['index'], self.settings)
+                if cap is not None:
+                    index = cached['index']
+                    self.stats['cache_hits'] += 1
+                    print(f"✅ Camera {index} reopened from cache")
+
+            source = 'cached'
+            if cap is None:
+                source = 'probe'
+                self.stats['probes'] += 1
+                candidates = [i for i in self.indices if not cached or i != cached.get('index')]
+                print(f"🔍 Probing cameras {candidates} in parallel...")
+                index, cap, report = self._probe(candidates)
+                if cap is None:
+                    self.stats['failures'] += 1
+                    return None
+                print(f"✅ Camera {index} opened successfully!")
+
+            self.format_report = report
+            if source == 'probe' or cached.get('format') != report:
+                self._save_cache(index, cap)
+            self.device = cap
+            self.device_index = index
+            return self._opened(cap, source, start_time)
+
+    def _opened(self, cap, source, start_time):
+        """Record open statistics and return the capture"""
+        self.stats['opens'] += 1
+        self.stats['last_source'] = source
+        self.stats['last_open_ms'] = round((time.time() - start_time) * 1000, 1)
+        return cap
+
+    def release(self, cap, standby=True):
+        """Release a capture from open(); with standby the device stays open for standby_timeout seconds
+
+        Captures the manager did not open (replays) are released directly; a
+        wrapper around the managed device (recording) is closed without
+        releasing the device underneath.
+        """
+        if cap is None:
+            return
+        if cap is not self.device:
+            if getattr(cap, 'cap', None) is self.device and self.device is not None:
+                cap.close()
+            else:
+                cap.release()
+                return
+
+        if not standby or self.standby_timeout <= 0:
+            self.close()
+            return
+
+        with self.lock:
+            if self.standby_timer:
+                self.standby_timer.cancel()
+            self.standby_timer = threading.Timer(self.standby_timeout, self.close)
+            self.standby_timer.daemon = True
+            self.standby_timer.start()
+        print(f"💤 Camera on warm standby for {self.standby_timeout:.0f}s")
+
+    def close(self):
+        """Really release the device"""
+        with self.lock:
+            if self.standby_timer:
+                self.standby_timer.cancel()
+                self.standby_timer = None
+            if self.device is not None:
+                self.device.release()
+                self.device = None
+                self.device_index = None
+
+    def get_stats(self):
+        """Get open statistics for the status endpoint"""
+        with self.lock:
+            return {
+                **self.stats,
+                'device_index': self.device_index,
+                'format': self.format_report,
+                'standby': self.standby_timer is not None
+            }
@@ -0,0 +1,96 @@
+"""
+Capture format negotiation
+Describes a requested camera mode (FOURCC, resolution, fps), turns it into
+capture settings in the order drivers expect (FOURCC before size before fps),
+and reads back what the device actually agreed to.
+
+Modes are written as FOURCC:WIDTHxHEIGHT@FPS, e.g. MJPG:640x480@30 or
+YUYV:320x240@15; CAMERA_FORMAT selects one for the camera services.
+"""
+
+import os
+import re
+
+import cv2
+
+MODE_PATTERN = re.compile(r'^(?:(?P<fourcc>[A-Za-z0-9]{4}):)?(?P<width>\d+)[xX](?P<height>\d+)(?:@(?P<fps>\d+(?:\.\d+)?))?$')
+
+
+def fourcc_to_string(code):
+    """Decode a CAP_PROP_FOURCC value into its four characters"""
+    code = int(code)
+    if code <= 0:
+        return None
+    return ''.join(chr((code >> (8 * i)) & 0xFF) for i in range(4))
+
+
+class CaptureFormat:
+    def __init__(self, fourcc=None, width=640, height=480, fps=None):
+        """Requested mode; fourcc None leaves the pixel format to the driver"""
+        self.fourcc = fourcc.upper() if fourcc else None
+        self.width = width
+        self.height = height
+        self.fps = fps
+
+    @classmethod
+    def parse(cls, text):
+        """Parse FOURCC:WIDTHxHEIGHT@FPS (FOURCC and fps optional)"""
+        match = MODE_PATTERN.match(text.strip())
+        if not match:
+            raise ValueError(f"Invalid capture mode '{text}', expected e.g. MJPG:640x480@30")
+        fps = match.group('fps')
+        return cls(match.group('fourcc'), int(match.group('width')), int(match.group('height')),
+                   float(fps) if fps else None)
+
+    @classmethod
+    def from_env(cls, default=None):
+        """Mode from CAMERA_FORMAT, or default (640x480, driver pixel format) when unset"""
+        text = os.getenv("CAMERA_FORMAT")
+        if text:
+            return cls.parse(text)
+        return default or cls()
+
+    def settings(self):
+        """Capture properties in negotiation order"""
+        settings = {}
+        if self.fourcc:
+            settings[cv2.CAP_PROP_FOURCC] = cv2.VideoWriter_fourcc(*self.fourcc)
+        settings[cv2.CAP_PROP_FRAME_WIDTH] = self.width
+        settings[cv2.CAP_PROP_FRAME_HEIGHT] = self.height
+        if self.fps:
+            settings[cv2.CAP_PROP_FPS] = self.fps
+        return settings
+
+    def verify(self, cap, frame=None):
+        """Read back the delivered mode; returns a dict with what was requested, delivered and any mismatches"""
+        delivered = {
+            'fourcc': fourcc_to_string(cap.get(cv2.CAP_PROP_FOURCC)),
+            'width': int(cap.get(cv2.CAP_PROP_FRAME_WIDTH)),
+            'height': int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT)),
+            'fps': cap.get(cv2.CAP_PROP_FPS)
+        }
+        if frame is not None:
+            # Some backends report the requested size even when frames arrive at another
+            delivered['height'], delivered['width'] = frame.shape[:2]
+
+        mismatches = []
+        if self.fourcc and delivered['fourcc'] and delivered['fourcc'] != self.fourcc:
+            mismatches.append('fourcc')
+        if (delivered['width'], delivered['height']) != (self.width, self.height):
+            mismatches.append('resolution')
+        if self.fps and delivered['fps'] and abs(delivered['fps'] - self.fps) > 0.5:
+            mismatches.append('fps')
+
+        return {
+            'requested': str(self),
+            'delivered': delivered,
+            'mismatches': mismatches
+        }
+
+    def __str__(self):
+        mode = f"{self.width}x{self.height}"
+        if self.fourcc:
+            mode = f"{self.fourcc}:{mode}"
+        if self.fps:
+            mode += f"@{self.fps:g}"
+        return mode
@@ -0,0 +1,57 @@
+"""
+Preallocated frame buffers
+Round-robin slots that cap.read(image=...), cv2.resize(dst=...) and the
+overlay code write into, so the hot loop reuses the same memory every frame
+and threads hand frames over by reference instead of copying.
+"""
+
+import numpy as np
+
+
+class FrameSlots:
+    def __init__(self, count, shape=(480, 640, 3), dtype=np.uint8):
+        """Preallocate count buffers; a slot is only rewritten count frames later"""
+        self.count = count
+        self.buffers = [np.empty(shape, dtype=dtype) for _ in range(count)]
+        self.index = 0
+        self.reallocations = 0
+
+    def next(self):
+        """Get (index, buffer) for the next slot to write into"""
+        index = self.index
+        self.index = (self.index + 1) % self.count
+        return index, self.buffers[index]
+
+    def store(self, index, frame):
+        """Keep the array a writer actually produced in its slot
+
+        cap.read(image=...) returns a new array when the device delivers a
+        different size; adopting it means the next lap reuses it again.
+        """
+        if frame is not None and frame is not self.buffers[index]:
+            self.buffers[index] = frame
+            self.reallocations += 1
+        return frame
+
+    def next_like(self, frame):
+        """Get the next slot sized and typed like frame, reallocating it only on a mismatch"""
+        index, buffer = self.next()
+        if buffer.shape != frame.shape or buffer.dtype != frame.dtype:
+            buffer = np.empty_like(frame)
+            self.buffers[index] = buffer
+            self.reallocations += 1
+        return buffer
+
+    def copy_into_next(self, frame):
+        """Copy frame into the next slot without allocating and return the slot"""
+        buffer = self.next_like(frame)
+        np.copyto(buffer, frame)
+        return buffer
+
+    def get_stats(self):
+        """Get slot statistics"""
+        return {
+            'slots': self.count,
+            'bytes': sum(buffer.nbytes for buffer in self.buffers),
+            'reallocations': self.reallocations
+        }
@@ -0,0 +1,316 @@
+#!/usr/bin/env python3
+"""
+Shared-memory frame bus
+One capture process owns the webcam and publishes every frame into a ring of
+slots in multiprocessing.shared_memory, each stamped with a sequence number.
+The classifier and the human detectors attach to the ring from their own
+processes (and cores) and read frames as NumPy views without copying.
+
+Each slot is written seqlock-style: its sequence is cleared before the pixels
+are overwritten and set afterwards, so a reader can tell whether the frame it
+is looking at was replaced underneath it.
+
+Usage:
+    python -m camera.frame_bus serve [--name makemit_frames] [--slots 24]
+
+Then start the services with CAMERA_BUS=makemit_frames instead of letting
+each one open the camera.
+"""
+
+import argparse
+import os
+import signal
+import time
+from multiprocessing import shared_memory
+
+import numpy as np
+
+DEFAULT_BUS_NAME = 'makemit_frames'
+MAGIC = 0x4D4B4D49  # "MKMI"
+
+# Header fields (int64)
+H_MAGIC, H_SLOTS, H_HEIGHT, H_WIDTH, H_CHANNELS, H_LATEST, H_PID, H_CLOSED = range(8)
+HEADER_FIELDS = 16
+ALIGN = 64
+
+
+def _align(offset):
+    """Round offset up to the next cache line"""
+    return (offset + ALIGN - 1) // ALIGN * ALIGN
+
+
+def _layout(slots, shape):
+    """Byte offsets of the header, heartbeat, slot sequences, slot timestamps and frames"""
+    header = 0
+    heartbeat = _align(header + HEADER_FIELDS * 8)
+    sequences = _align(heartbeat + 8)
+    timestamps = _align(sequences + slots * 8)
+    frames = _align(timestamps + slots * 8)
+    size = frames + slots * int(np.prod(shape))
+    return header, heartbeat, sequences, timestamps, frames, size
+
+
+class _BusViews:
+    def __init__(self, shm, slots, shape):
+        """NumPy views over a bus segment"""
+        header, heartbeat, sequences, timestamps, frames, _ = _layout(slots, shape)
+        self.header = np.ndarray((HEADER_FIELDS,), dtype=np.int64, buffer=shm.buf, offset=header)
+        self.heartbeat = np.ndarray((1,), dtype=np.float64, buffer=shm.buf, offset=heartbeat)
+        self.sequences = np.ndarray((slots,), dtype=np.int64, buffer=shm.buf, offset=sequences)
+        self.timestamps = np.ndarray((slots,), dtype=np.float64, buffer=shm.buf, offset=timestamps)
+        self.frames = np.ndarray((slots,) + tuple(shape), dtype=np.uint8, buffer=shm.buf, offset=frames)
+
+
+class FrameBusWriter:
+    def __init__(self, name=DEFAULT_BUS_NAME, shape=(480, 640, 3), slots=24):
+        """Create the shared ring; slots bounds how long a reader may hold a zero-copy view"""
+        self.name = name
+        self.shape = tuple(shape)
+        self.slots = slots
+        size = _layout(slots, self.shape)[-1]
+
+        try:
+            self.shm = shared_memory.SharedMemory(name=name, create=True, size=size)
+        except FileExistsError:
+            # Left over from a capture process that did not shut down cleanly
+            stale = shared_memory.SharedMemory(name=name)
+            stale.close()
+            stale.unlink()
+            self.shm = shared_memory.SharedMemory(name=name, create=True, size=size)
+
+        self.views = _BusViews(self.shm, slots, self.shape)
+        self.views.sequences[:] = 0
+        self.views.header[:] = 0
+        self.views.header[[H_SLOTS, H_HEIGHT, H_WIDTH, H_CHANNELS]] = [slots, *self.shape]
+        self.views.header[H_PID] = os.getpid()
+        self.views.header[H_MAGIC] = MAGIC  # Written last: readers wait for it
+        self.sequence = 0
+
+    def publish(self, frame, timestamp=None):
+        """Copy a frame into the next slot and return its sequence number"""
+        self.sequence += 1
+        slot = self.sequence % self.slots
+        views = self.views
+
+        views.sequences[slot] = 0  # Mark the slot as being rewritten
+        if frame.shape == self.shape:
+            np.copyto(views.frames[slot], frame)
+        else:
+            # Different size from the device: fit it rather than tear the ring layout
+            import cv2
+            cv2.resize(frame, (self.shape[1], self.shape[0]), dst=views.frames[slot])
+        views.timestamps[slot] = time.time() if timestamp is None else timestamp
+        views.sequences[slot] = self.sequence
+        views.header[H_LATEST] = self.sequence
+        views.heartbeat[0] = time.time()
+        return self.sequence
+
+    def close(self):
+        """Mark the bus closed and remove the segment"""
+        self.views.header[H_CLOSED] = 1
+        del self.views
+        self.shm.close()
+        self.shm.unlink()
+
+
+class FrameBusReader:
+    def __init__(self, name=DEFAULT_BUS_NAME):
+        """Attach to a ring created by a FrameBusWriter"""
+        self.name = name
+        try:
+            # Readers must not unlink the segment when they exit
+            self.shm = shared_memory.SharedMemory(name=name, track=False)
+            tracked = False
+        except TypeError:
+            self.shm = shared_memory.SharedMemory(name=name)
+            tracked = True
+
+        header = np.ndarray((HEADER_FIELDS,), dtype=np.int64, buffer=self.shm.buf)
+        if tracked and header[H_PID] != os.getpid():
+            # Python < 3.13 tracks every attach; a reader in the writer's process shares its entry
+            from multiprocessing import resource_tracker
+            resource_tracker.unregister(self.shm._name, 'shared_memory')
+        if header[H_MAGIC] != MAGIC:
+            raise RuntimeError(f"Shared memory '{name}' is not a frame bus")
+        self.slots = int(header[H_SLOTS])
+        self.shape = (int(header[H_HEIGHT]), int(header[H_WIDTH]), int(header[H_CHANNELS]))
+        del header
+        self.views = _BusViews(self.shm, self.slots, self.shape)
+
+        self.stats = {
+            'frames': 0,
+            'skipped': 0,
+            'torn': 0
+        }
+
+    def latest_sequence(self):
+        """Sequence number of the newest published frame"""
+        return int(self.views.header[H_LATEST])
+
+    def is_closed(self):
+        """Check if the writer shut down"""
+        return bool(self.views.header[H_CLOSED])
+
+    def writer_age(self):
+        """Seconds since the writer last published a frame"""
+        return time.time() - float(self.views.heartbeat[0])
+
+    def is_valid(self, sequence):
+        """Check that a view returned for sequence has not been overwritten since"""
+        return int(self.views.sequences[sequence % self.slots]) == sequence
+
+    def read_latest(self, after=0, timeout=1.0):
+        """Wait for a frame newer than after; returns (sequence, timestamp, read-only view) or None"""
+        deadline = time.monotonic() + timeout
+        while True:
+            sequence = self.latest_sequence()
+            if sequence > after:
+                slot = sequence % self.slots
+                view = self.views.frames[slot]
+                view.flags.writeable = False
+                timestamp = float(self.views.timestamps[slot])
+                if self.is_valid(sequence):
+                    if after and sequence > after + 1:
+                        self.stats['skipped'] += sequence - after - 1
+                    self.stats['frames'] += 1
+                    return sequence, timestamp, view
+                # The writer is mid-copy on this slot; it finishes within microseconds
+                self.stats['torn'] += 1
+                if time.monotonic() < deadline:
+                    continue
+                return None
+            if self.is_closed() or time.monotonic() >= deadline:
+                return None
+            time.sleep(0.002)
+
+    def close(self):
+        """Detach from the segment (the writer owns and removes it)"""
+        del self.views
+        self.shm.close()
+
+
+class FrameBusCapture:
+    # Frames arrive at the capture process's pace; consumers should not add their own pacing
+    paces_itself = True
+
+    def __init__(self, name=DEFAULT_BUS_NAME, stale_after=5.0):
+        """cv2.VideoCapture stand-in that reads from a frame bus"""
+        self.reader = FrameBusReader(name)
+        self.stale_after = stale_after
+        # Start at the newest frame; before the first one there is nothing to read (slot 0 is blank)
+        self.last_sequence = max(0, self.reader.latest_sequence() - 1)
+        self.opened = True
+
+    def read_view(self):
+        """Next frame as a zero-copy read-only view; valid until the writer laps the ring"""
+        entry = self.reader.read_latest(self.last_sequence, timeout=1.0)
+        if entry is None:
+            if self.reader.is_closed():
+                self.opened = False
+            return False, None
+        self.last_sequence, _, view = entry
+        return True, view
+
+    def read(self, image=None):
+        """Next frame copied into image (or a new array), like cv2.VideoCapture.read"""
+        while True:
+            ret, view = self.read_view()
+            if not ret:
+                return False, None
+            if image is not None and image.shape == view.shape and image.dtype == view.dtype:
+                np.copyto(image, view)
+                frame = image
+            else:
+                frame = view.copy()
+            # The writer lapped the ring during the copy: the copy may mix two frames
+            if self.reader.is_valid(self.last_sequence):
+                return True, frame
+            self.reader.stats['torn'] += 1
+
+    def isOpened(self):
+        return self.opened and not self.reader.is_closed() and self.reader.writer_age() < self.stale_after
+
+    def set(self, prop, value):
+        """Capture properties belong to the capture process"""
+        return False
+
+    def get(self, prop):
+        return 0.0
+
+    def release(self):
+        """Detach from the bus"""
+        if self.opened:
+            self.opened = False
+            self.reader.close()
+
+    def get_stats(self):
+        """Reader statistics"""
+        return {**self.reader.stats, 'bus': self.reader.name, 'slots': self.reader.slots}
+
+
+def open_bus_from_env():
+    """Attach to the frame bus named by CAMERA_BUS, or None when it is not set"""
+    name = os.getenv("CAMERA_BUS")
+    if not name:
+        return None
+    try:
+        capture = FrameBusCapture(name)
+    except (FileNotFoundError, RuntimeError) as e:
+        print(f"❌ Frame bus '{name}' not available ({e}) - is 'python -m camera.frame_bus serve' running?")
+        return None
+    print(f"🚌 Reading frames from bus '{name}' ({capture.reader.slots} slots)")
+    return capture
+
+
+def main():
+    """Main function"""
+    parser = argparse.ArgumentParser(description="Own the camera and publish frames to a shared-memory bus")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+    serve_parser = subparsers.add_parser('serve', help='Capture frames and publish them')
+    serve_parser.add_argument('--name', default=DEFAULT_BUS_NAME)
+    serve_parser.add_argument('--slots', type=int, default=24)
+    args = parser.parse_args()
+
+    from camera.camera_manager import CameraManager
+    import cv2
+
+    manager = CameraManager('frame_bus', settings={cv2.CAP_PROP_BUFFERSIZE: 1}, standby_timeout=0)
+    cap = manager.open()
+    if cap is None:
+        print("❌ Error: No camera available")
+        return
+
+    ret, frame = cap.read()
+    if not ret:
+        print("❌ Error: Could not read from camera")
+        manager.close()
+        return
+
+    writer = FrameBusWriter(args.name, frame.shape, args.slots)
+    print(f"🚌 Publishing {frame.shape[1]}x{frame.shape[0]} frames to bus '{args.name}' ({args.slots} slots)")
+
+    stopping = []
+    signal.signal(signal.SIGTERM, lambda *_: stopping.append(True))
+    published = 0
+    start_time = time.time()
+    try:
+        while not stopping:
+            ret, frame = cap.read(image=frame)
+            if not ret:
+                print("⚠️ Error reading frame")
+                time.sleep(0.1)
+                continue
+            writer.publish(frame)
+            published += 1
+            if published % 300 == 0:
+                print(f"📊 {published} frames, {published / (time.time() - start_time):.1f} fps")
+    except KeyboardInterrupt:
+        pass
+    finally:
+        writer.close()
+        manager.close()
+        print("✅ Frame bus closed")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+"""
+MJPEG broadcast hub
+Encodes each new frame once, tags it with a sequence number and fans the same
+JPEG bytes out to every /video_feed subscriber. Slow clients skip straight to
+the newest frame instead of queueing stale ones.
+"""
+
+import threading
+import time
+
+import cv2
+
+
+class FrameHub:
+    def __init__(self, quality=85, idle_timeout=1.0):
+        """Initialize the hub with the JPEG quality used for streaming"""
+        self.quality = quality
+        self.idle_timeout = idle_timeout  # How long a subscriber waits before re-checking is_active
+
+        self.condition = threading.Condition()
+        self.encode_lock = threading.Lock()
+        self.frame = None
+        self.sequence = 0
+
+        # Encoded multipart chunk for the newest frame, shared by all subscribers
+        self.encoded_sequence = 0
+        self.encoded_part = None
+
+        self.subscribers = 0
+        self.stats = {
+            'frames_published': 0,
+            'frames_encoded': 0,
+            'frames_sent': 0,
+            'frames_skipped': 0,
+            'encode_time_ms': 0.0
+        }
+
+    def publish(self, frame):
+        """Publish a new frame; encoding is deferred until a subscriber needs it"""
+        with self.condition:
+            self.frame = frame
+            self.sequence += 1
+            self.stats['frames_published'] += 1
+            self.condition.notify_all()
+            return self.sequence
+
+    def has_subscribers(self):
+        """Check if anyone is watching the stream"""
+        with self.condition:
+            return self.subscribers > 0
+
+    def get_latest_part(self):
+        """Get (sequence, multipart chunk) for the newest frame, encoding it at most once"""
+        with self.encode_lock:
+            with self.condition:
+                frame = self.frame
+                sequence = self.sequence
+
+            if frame is None:
+                return 0, None
+
+            if self.encoded_sequence != sequence:
+                start_time = time.time()
+                ret, buffer = cv2.imencode('.jpg', frame, [cv2.IMWRITE_JPEG_QUALITY, self.quality])
+                if not ret:
+                    return 0, None
+                self.encoded_part = (b'--frame\r\n'
+                                     b'Content-Type: image/jpeg\r\n\r\n' + buffer.tobytes() + b'\r\n')
+                self.encoded_sequence = sequence
+                self.stats['frames_encoded'] += 1
+                self.stats['encode_time_ms'] += (time.time() - start_time) * 1000
+
+            return self.encoded_sequence, self.encoded_part
+
+    def stream(self, is_active=lambda: True):
+        """Generate multipart MJPEG chunks for one subscriber"""
+        with self.condition:
+            self.subscribers += 1
+        try:
+            last_sequence = 0
+            while is_active():
+                # Wait for a frame newer than the one this client last received
+                with self.condition:
+                    self.condition.wait_for(lambda: self.sequence > last_sequence, timeout=self.idle_timeout)
+                    if self.sequence <= last_sequence:
+                        continue
+
+                sequence, part = self.get_latest_part()
+                if part is None or sequence <= last_sequence:
+                    continue
+
+                if last_sequence and sequence > last_sequence + 1:
+                    self.stats['frames_skipped'] += sequence - last_sequence - 1
+                last_sequence = sequence
+
+                # Counted when handed over: the generator only resumes when the client wants another
+                self.stats['frames_sent'] += 1
+                yield part
+        finally:
+            with self.condition:
+                self.subscribers -= 1
+
+    def get_stats(self):
+        """Get hub statistics for the status endpoint"""
+        encoded = self.stats['frames_encoded']
+        return {
+            **self.stats,
+            'subscribers': self.subscribers,
+            'avg_encode_time_ms': self.stats['encode_time_ms'] / encoded if encoded else 0
+        }
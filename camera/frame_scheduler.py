@@ -0,0 +1,113 @@
+"""
+Deadline-based frame scheduler
+Paces a camera loop to a target period measured from a monotonic deadline
+(so processing time is absorbed rather than added), and drops to a low idle
+rate when nothing has happened for a while.
+"""
+
+import threading
+import time
+
+
+class FrameScheduler:
+    def __init__(self, active_fps=30, idle_fps=5, idle_after=30.0):
+        """Initialize the scheduler; idle_after is seconds without a trigger before idling"""
+        self.active_period = 1.0 / active_fps
+        self.idle_period = 1.0 / idle_fps
+        self.idle_after = idle_after
+
+        self.lock = threading.Lock()
+        self.power_state = 'active'
+        self.last_trigger = time.monotonic()
+        self.next_deadline = None
+        self.last_wake = None
+
+        # Duty cycle = share of each period spent working rather than sleeping
+        self.duty_cycle = 0.0
+        self.state_since = time.monotonic()
+        self.time_in_state = {'active': 0.0, 'idle': 0.0}
+        self.stats = {
+            'frames': 0,
+            'overruns': 0,
+            'wakeups': 0,
+            'idle_entries': 0
+        }
+
+    def trigger(self):
+        """Report activity (motion, a person, a running job); switches to full rate immediately"""
+        with self.lock:
+            self.last_trigger = time.monotonic()
+            if self.power_state == 'idle':
+                self._set_state('active', self.last_trigger)
+                self.stats['wakeups'] += 1
+                # Don't finish the long idle sleep period before the next frame
+                self.next_deadline = self.last_trigger
+
+    def _set_state(self, state, now):
+        """Switch power state and account time spent in the previous one"""
+        self.time_in_state[self.power_state] += now - self.state_since
+        self.state_since = now
+        self.power_state = state
+
+    def period(self):
+        """Current target frame period in seconds"""
+        with self.lock:
+            return self.active_period if self.power_state == 'active' else self.idle_period
+
+    def wait(self):
+        """Sleep until the next frame deadline; call once per loop iteration after the work"""
+        now = time.monotonic()
+
+        with self.lock:
+            if self.power_state == 'active' and now - self.last_trigger >= self.idle_after:
+                self._set_state('idle', now)
+                self.stats['idle_entries'] += 1
+            period = self.active_period if self.power_state == 'active' else self.idle_period
+
+            if self.last_wake is not None:
+                busy = now - self.last_wake
+                self.duty_cycle = 0.9 * self.duty_cycle + 0.1 * min(1.0, busy / period)
+
+            if self.next_deadline is None:
+                self.next_deadline = now
+            self.next_deadline += period
+
+            if self.next_deadline <= now:
+                # Work overran the period: start a fresh schedule instead of bursting to catch up
+                self.stats['overruns'] += 1
+                self.next_deadline = now
+            sleep_time = self.next_deadline - now
+            self.stats['frames'] += 1
+
+        # Sleep in short slices so a trigger can cut an idle period short
+        while sleep_time > 0:
+            time.sleep(min(sleep_time, self.active_period))
+            with self.lock:
+                sleep_time = self.next_deadline - time.monotonic()
+
+        self.last_wake = time.monotonic()
+
+    def reset(self):
+        """Start a fresh schedule in the active state"""
+        with self.lock:
+            now = time.monotonic()
+            self._set_state('active', now)
+            self.last_trigger = now
+            self.next_deadline = None
+            self.last_wake = None
+
+    def get_stats(self):
+        """Get power-state and duty-cycle metrics"""
+        with self.lock:
+            now = time.monotonic()
+            time_in_state = dict(self.time_in_state)
+            time_in_state[self.power_state] += now - self.state_since
+            total = sum(time_in_state.values())
+            return {
+                'power_state': self.power_state,
+                'target_fps': round(1.0 / (self.active_period if self.power_state == 'active' else self.idle_period), 1),
+                'duty_cycle': round(self.duty_cycle, 3),
+                'idle_ratio': round(time_in_state['idle'] / total, 3) if total > 0 else 0.0,
+                'seconds_since_trigger': round(now - self.last_trigger, 1),
+                **self.stats
+            }
@@ -0,0 +1,291 @@
+#!/usr/bin/env python3
+"""
+Record-and-replay frame sources
+Records live camera sessions to a directory (raw frames for memory-mapped
+replay, or MJPG video) with per-frame timestamps, and replays them through a
+cv2.VideoCapture-compatible object either at the recorded pace or as fast as
+possible, so the camera pipelines can be benchmarked without a webcam.
+
+A recording directory contains:
+    meta.json        format, frame shape, nominal fps
+    frames.raw       raw BGR frames back to back (format 'raw')
+    video.avi        MJPG video (format 'video')
+    timestamps.txt   one capture timestamp per frame, in seconds
+
+Usage:
+    python -m camera.frame_source record sessions/plate01 --seconds 30 [--format video]
+    python -m camera.frame_source replay sessions/plate01 [--realtime]
+
+Set CAMERA_REPLAY=<dir> (and CAMERA_REPLAY_MODE=fast) to feed a recording to
+classify_images.py or human_detector_api.py, or CAMERA_RECORD=<dir> to record
+the live camera they open.
+"""
+
+import argparse
+import json
+import os
+import time
+
+import cv2
+import numpy as np
+
+
+class FrameRecorder:
+    def __init__(self, path, fmt='raw', fps=30):
+        """Start a recording in directory path; fmt is 'raw' (memory-mappable) or 'video' (MJPG)"""
+        if fmt not in ('raw', 'video'):
+            raise ValueError(f"Unknown recording format: {fmt}")
+        self.path = path
+        self.format = fmt
+        self.fps = fps
+        self.shape = None
+        self.writer = None
+        self.frames = 0
+        os.makedirs(path, exist_ok=True)
+        self.timestamps = open(os.path.join(path, 'timestamps.txt'), 'w')
+
+    def _open(self, frame):
+        """Open the frame writer once the first frame fixes the shape"""
+        self.shape = frame.shape
+        with open(os.path.join(self.path, 'meta.json'), 'w') as f:
+            json.dump({'format': self.format, 'shape': list(frame.shape), 'dtype': str(frame.dtype),
+                       'fps': self.fps}, f)
+
+        if self.format == 'raw':
+            self.writer = open(os.path.join(self.path, 'frames.raw'), 'wb')
+        else:
+            height, width = frame.shape[:2]
+            self.writer = cv2.VideoWriter(os.path.join(self.path, 'video.avi'),
+                                          cv2.VideoWriter_fourcc(*'MJPG'), self.fps, (width, height))
+
+    def write(self, frame, timestamp=None):
+        """Append one frame with its capture timestamp"""
+        if self.writer is None:
+            self._open(frame)
+        if frame.shape != self.shape:
+            # A resolution change mid-session cannot be replayed from one matrix
+            frame = cv2.resize(frame, (self.shape[1], self.shape[0]))
+
+        if self.format == 'raw':
+            self.writer.write(np.ascontiguousarray(frame).data)
+        else:
+            self.writer.write(frame)
+        self.timestamps.write(f"{time.time() if timestamp is None else timestamp:.6f}\n")
+        self.frames += 1
+
+    def close(self):
+        """Flush and close the recording"""
+        if self.writer is not None:
+            if self.format == 'raw':
+                self.writer.close()
+            else:
+                self.writer.release()
+            self.writer = None
+        if not self.timestamps.closed:
+            self.timestamps.close()
+
+
+class RecordingCapture:
+    def __init__(self, cap, recorder):
+        """Wrap a live capture so every frame read is also recorded"""
+        self.cap = cap
+        self.recorder = recorder
+
+    def read(self, image=None):
+        """Read a frame from the wrapped capture and record it"""
+        ret, frame = self.cap.read(image=image) if image is not None else self.cap.read()
+        if ret:
+            self.recorder.write(frame)
+        return ret, frame
+
+    def isOpened(self):
+        return self.cap.isOpened()
+
+    def set(self, prop, value):
+        return self.cap.set(prop, value)
+
+    def get(self, prop):
+        return self.cap.get(prop)
+
+    def close(self):
+        """Finish the recording but leave the camera open"""
+        self.recorder.close()
+        print(f"💾 Recorded {self.recorder.frames} frames to {self.recorder.path}")
+
+    def release(self):
+        """Release the camera and finish the recording"""
+        self.cap.release()
+        self.close()
+
+
+class ReplaySource:
+    # The source paces itself, so capture loops should not add their own frame pacing
+    paces_itself = True
+
+    def __init__(self, path, realtime=True, loop=False):
+        """Open a recording; realtime replays at the recorded pace, otherwise as fast as frames are read"""
+        with open(os.path.join(path, 'meta.json')) as f:
+            self.meta = json.load(f)
+        self.path = path
+        self.realtime = realtime
+        self.loop = loop
+
+        with open(os.path.join(path, 'timestamps.txt')) as f:
+            timestamps = [float(line) for line in f if line.strip()]
+
+        if self.meta['format'] == 'raw':
+            shape = tuple(self.meta['shape'])
+            raw = np.memmap(os.path.join(path, 'frames.raw'), dtype=np.dtype(self.meta['dtype']), mode='r')
+            count = min(raw.size // int(np.prod(shape)), len(timestamps))
+            self.frames = raw[:count * int(np.prod(shape))].reshape((count,) + shape)
+            self.video = None
+        else:
+            self.frames = None
+            self.video = cv2.VideoCapture(os.path.join(path, 'video.avi'))
+            count = min(int(self.video.get(cv2.CAP_PROP_FRAME_COUNT)) or len(timestamps), len(timestamps))
+
+        self.count = count
+        # Offsets from the first frame drive real-time pacing
+        self.offsets = [t - timestamps[0] for t in timestamps[:count]] if count else []
+        self.position = 0
+        self.start_time = None
+        self.opened = count > 0
+
+    def _rewind(self):
+        """Start again from the first frame"""
+        self.position = 0
+        self.start_time = None
+        if self.video is not None:
+            self.video.set(cv2.CAP_PROP_POS_FRAMES, 0)
+
+    def read(self, image=None):
+        """Read the next frame, into image when its shape matches; returns (ret, frame)"""
+        if self.opened and self.position >= self.count and self.loop:
+            self._rewind()
+        if not self.opened or self.position >= self.count:
+            self.opened = False
+            return False, None
+
+        if self.realtime:
+            now = time.monotonic()
+            if self.start_time is None:
+                self.start_time = now
+            delay = self.start_time + self.offsets[self.position] - now
+            if delay > 0:
+                time.sleep(delay)
+
+        if self.frames is not None:
+            frame = self.frames[self.position]
+            if image is not None and image.shape == frame.shape and image.dtype == frame.dtype:
+                np.copyto(image, frame)
+                frame = image
+            else:
+                frame = np.array(frame)
+            ret = True
+        else:
+            ret, frame = self.video.read(image=image) if image is not None else self.video.read()
+
+        self.position += 1
+        return ret, frame
+
+    def isOpened(self):
+        return self.opened
+
+    def set(self, prop, value):
+        """Capture properties are fixed by the recording"""
+        return False
+
+    def get(self, prop):
+        """Report recording properties under the usual capture property ids"""
+        if prop == cv2.CAP_PROP_FRAME_WIDTH:
+            return float(self.meta['shape'][1])
+        if prop == cv2.CAP_PROP_FRAME_HEIGHT:
+            return float(self.meta['shape'][0])
+        if prop == cv2.CAP_PROP_FPS:
+            return float(self.meta['fps'])
+        if prop == cv2.CAP_PROP_FRAME_COUNT:
+            return float(self.count)
+        return 0.0
+
+    def release(self):
+        """Close the recording"""
+        self.opened = False
+        if self.video is not None:
+            self.video.release()
+
+
+def open_replay_from_env():
+    """Open the recording named by CAMERA_REPLAY, or None when it is not set"""
+    path = os.getenv("CAMERA_REPLAY")
+    if not path:
+        return None
+    realtime = os.getenv("CAMERA_REPLAY_MODE", "realtime") != "fast"
+    source = ReplaySource(path, realtime=realtime, loop=os.getenv("CAMERA_REPLAY_LOOP") == "1")
+    print(f"🎞️ Replaying {source.count} frames from {path} ({'real time' if realtime else 'as fast as possible'})")
+    return source
+
+
+def record_from_env(cap, fps=30):
+    """Wrap cap in a recorder when CAMERA_RECORD is set, otherwise return it unchanged"""
+    path = os.getenv("CAMERA_RECORD")
+    if not path:
+        return cap
+    print(f"⏺️ Recording camera session to {path}")
+    return RecordingCapture(cap, FrameRecorder(path, os.getenv("CAMERA_RECORD_FORMAT", "raw"), fps))
+
+
+def main():
+    """Main function"""
+    parser = argparse.ArgumentParser(description="Record and replay camera sessions")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    record_parser = subparsers.add_parser('record', help='Record a live camera session')
+    record_parser.add_argument('path')
+    record_parser.add_argument('--camera', type=int, default=0)
+    record_parser.add_argument('--seconds', type=float, default=30.0)
+    record_parser.add_argument('--format', choices=['raw', 'video'], default='raw')
+
+    replay_parser = subparsers.add_parser('replay', help='Measure replay throughput of a recording')
+    replay_parser.add_argument('path')
+    replay_parser.add_argument('--realtime', action='store_true')
+
+    args = parser.parse_args()
+
+    if args.command == 'record':
+        cap = cv2.VideoCapture(args.camera)
+        if not cap.isOpened():
+            print(f"❌ Camera {args.camera} could not be opened")
+            return
+        cap.set(cv2.CAP_PROP_FRAME_WIDTH, 640)
+        cap.set(cv2.CAP_PROP_FRAME_HEIGHT, 480)
+        recorder = FrameRecorder(args.path, args.format, fps=cap.get(cv2.CAP_PROP_FPS) or 30)
+        capture = RecordingCapture(cap, recorder)
+
+        print(f"⏺️ Recording {args.seconds:.0f}s from camera {args.camera}...")
+        end_time = time.time() + args.seconds
+        while time.time() < end_time:
+            ret, _ = capture.read()
+            if not ret:
+                print("⚠️ Error reading frame")
+                break
+        capture.release()
+    else:
+        source = ReplaySource(args.path, realtime=args.realtime)
+        buffer = np.empty(tuple(source.meta['shape']), dtype=np.uint8)
+        start_time = time.perf_counter()
+        frames = 0
+        while True:
+            ret, _ = source.read(image=buffer)
+            if not ret:
+                break
+            frames += 1
+        elapsed = time.perf_counter() - start_time
+        source.release()
+
+        recorded = source.offsets[-1] if source.offsets else 0
+        print(f"📊 Replayed {frames} frames in {elapsed:.2f}s ({frames / elapsed if elapsed > 0 else 0:.0f} fps)")
+        print(f"   Recorded duration: {recorded:.2f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+"""
+Cached overlay layers
+Pre-renders static overlay elements (text labels, eye sockets)
+once into small sprites with an alpha mask and blends them into frames, instead
+of rasterising the same text and shapes on every frame.
+"""
+
+from collections import OrderedDict
+
+import cv2
+import numpy as np
+
+
+class OverlayLayer:
+    def __init__(self, image, alpha, origin):
+        """Sprite with a per-pixel alpha mask (uint8, 0-255) placed at origin (x, y) of its top-left corner"""
+        self.image = image
+        self.alpha = alpha
+        self.origin = origin
+        self.opaque = bool(np.all((alpha == 0) | (alpha == 255)))
+        if self.opaque:
+            self.mask = (alpha > 0)[:, :, None]
+
+    def apply(self, frame, origin=None):
+        """Blend the layer into frame in place, clipped to the frame bounds"""
+        x, y = origin if origin is not None else self.origin
+        height, width = self.image.shape[:2]
+        frame_height, frame_width = frame.shape[:2]
+
+        # Clip the sprite to the visible part of the frame
+        x0, y0 = max(x, 0), max(y, 0)
+        x1, y1 = min(x + width, frame_width), min(y + height, frame_height)
+        if x0 >= x1 or y0 >= y1:
+            return frame
+        sx0, sy0 = x0 - x, y0 - y
+        sx1, sy1 = sx0 + (x1 - x0), sy0 + (y1 - y0)
+
+        roi = frame[y0:y1, x0:x1]
+        image = self.image[sy0:sy1, sx0:sx1]
+        if self.opaque:
+            np.copyto(roi, image, where=self.mask[sy0:sy1, sx0:sx1])
+        else:
+            alpha = self.alpha[sy0:sy1, sx0:sx1, None].astype(np.uint16)
+            roi[:] = ((image.astype(np.uint16) * alpha + roi.astype(np.uint16) * (255 - alpha) + 127) // 255).astype(np.uint8)
+        return frame
+
+
+def render_text_layer(text, font, scale, color, thickness):
+    """Rasterise text once into a sprite; origin offset matches cv2.putText baseline placement"""
+    (text_width, text_height), baseline = cv2.getTextSize(text, font, scale, thickness)
+    pad = thickness + 1
+    height = text_height + baseline + 2 * pad
+    width = text_width + 2 * pad
+
+    mask = np.zeros((height, width), dtype=np.uint8)
+    cv2.putText(mask, text, (pad, pad + text_height), font, scale, 255, thickness)
+    image = np.zeros((height, width, 3), dtype=np.uint8)
+    image[:] = color
+
+    # Offset from the putText org (bottom-left of text) to the sprite's top-left corner
+    return OverlayLayer(image, mask, (-pad, -(pad + text_height)))
+
+
+class OverlayCache:
+    def __init__(self, max_entries=128):
+        """Initialize an LRU cache of rendered text layers"""
+        self.max_entries = max_entries
+        self.layers = OrderedDict()
+        self.stats = {'hits': 0, 'misses': 0}
+
+    def text_layer(self, text, font=cv2.FONT_HERSHEY_SIMPLEX, scale=0.5, color=(255, 255, 255), thickness=1):
+        """Get a cached text sprite, rendering it on first use"""
+        key = (text, font, scale, tuple(color), thickness)
+        layer = self.layers.get(key)
+        if layer is not None:
+            self.layers.move_to_end(key)
+            self.stats['hits'] += 1
+            return layer
+
+        self.stats['misses'] += 1
+        layer = render_text_layer(text, font, scale, color, thickness)
+        self.layers[key] = layer
+        if len(self.layers) > self.max_entries:
+            self.layers.popitem(last=False)
+        return layer
+
+    def put_text(self, frame, text, org, font=cv2.FONT_HERSHEY_SIMPLEX, scale=0.5, color=(255, 255, 255), thickness=1):
+        """Drop-in replacement for cv2.putText that blends a cached sprite"""
+        layer = self.text_layer(text, font, scale, color, thickness)
+        offset_x, offset_y = layer.origin
+        return layer.apply(frame, (org[0] + offset_x, org[1] + offset_y))
+
@@ -0,0 +1,102 @@
+"""
+Capture pipeline building blocks
+A fixed-size ring buffer with drop-oldest semantics for handing frames between
+pipeline stages, and per-stage fps / queue depth counters.
+"""
+
+import threading
+import time
+from collections import deque
+
+
+class FrameRing:
+    def __init__(self, capacity=8):
+        """Initialize the ring; when full, the oldest entry is dropped"""
+        self.capacity = capacity
+        self.entries = deque(maxlen=capacity)
+        self.condition = threading.Condition()
+        self.sequence = 0
+        self.last_consumed = 0
+
+        self.stats = {
+            'put': 0,
+            'dropped': 0
+        }
+
+    def put(self, item, timestamp=None):
+        """Add an item; returns its sequence number"""
+        with self.condition:
+            if len(self.entries) == self.capacity and self.entries[0][0] > self.last_consumed:
+                # Oldest entry is evicted before any consumer saw it
+                self.stats['dropped'] += 1
+            self.sequence += 1
+            self.entries.append((self.sequence, time.time() if timestamp is None else timestamp, item))
+            self.stats['put'] += 1
+            self.condition.notify_all()
+            return self.sequence
+
+    def get_latest(self, after=0, timeout=None):
+        """Wait for an entry newer than after and return (sequence, timestamp, item), or None on timeout"""
+        with self.condition:
+            # A cleared ring keeps its sequence, so wait on the entries themselves
+            if not self.condition.wait_for(lambda: self.entries and self.entries[-1][0] > after, timeout=timeout):
+                return None
+            entry = self.entries[-1]
+            self.last_consumed = max(self.last_consumed, entry[0])
+            return entry
+
+    def get_recent(self, count):
+        """Get up to count most recent entries, oldest first"""
+        with self.condition:
+            return list(self.entries)[-count:]
+
+    def depth(self):
+        """Number of entries newer than the last one a consumer took"""
+        with self.condition:
+            return self.sequence - self.last_consumed if self.entries else 0
+
+    def clear(self):
+        """Drop all buffered entries"""
+        with self.condition:
+            self.entries.clear()
+            self.last_consumed = self.sequence
+
+
+class StageStats:
+    def __init__(self, name, window=30):
+        """Initialize fps and processing-time tracking for one pipeline stage"""
+        self.name = name
+        self.timestamps = deque(maxlen=window)
+        self.busy_times = deque(maxlen=window)
+        self.count = 0
+        self.lock = threading.Lock()
+
+    def record(self, busy_time):
+        """Record one processed item and how long the stage worked on it"""
+        with self.lock:
+            self.timestamps.append(time.time())
+            self.busy_times.append(busy_time)
+            self.count += 1
+
+    def fps(self):
+        """Items per second over the recent window"""
+        with self.lock:
+            if len(self.timestamps) < 2:
+                return 0.0
+            elapsed = self.timestamps[-1] - self.timestamps[0]
+            return (len(self.timestamps) - 1) / elapsed if elapsed > 0 else 0.0
+
+    def get_stats(self, ring=None):
+        """Get stage statistics, including the depth of its input ring"""
+        with self.lock:
+            avg_busy = sum(self.busy_times) / len(self.busy_times) if self.busy_times else 0
+            count = self.count
+        stats = {
+            'fps': round(self.fps(), 1),
+            'processed': count,
+            'avg_time_ms': round(avg_busy * 1000, 2)
+        }
+        if ring is not None:
+            stats['queue_depth'] = ring.depth()
+            stats['dropped'] = ring.stats['dropped']
+        return stats
@@ -0,0 +1,314 @@
+#!/usr/bin/env python3
+"""
+Batch image classification
+Classifies a folder of images with several Gemini calls in flight. Each image
+is answered by the cheapest tier that can: a result cache keyed by the file's
+content, then the label index, then Gemini. Every result is appended to a JSONL
+file as soon as it is known, so an interrupted run picks up where it stopped,
+and the usual text report is written at the end.
+
+The label index tier opens the same per-bin index as the live service, cropped
+to that bin's plate ROI (--bin, from BINS_CONFIG).
+
+Usage:
+    python batch_classify.py [folder] [--workers 4] [--recursive] [--bin kitchen]
+    python batch_classify.py [folder] --resume batch_results_YYYYMMDD_HHMMSS.jsonl
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime
+
+import cv2
+import google.generativeai as genai
+import numpy as np
+from dotenv import load_dotenv
+
+from bin_registry import DEFAULT_BIN_ID, bin_path, load_bin_configs
+from gemini_classifier import generate_classification, make_labeler
+from label_index import LabelIndex, DEFAULT_INDEX_PATH
+from rate_limiter import RateLimiter
+from upload_prep import UploadPreparer
+
+IMAGE_EXTENSIONS = ('.jpg', '.jpeg', '.png', '.bmp', '.gif', '.tiff', '.webp')
+DEFAULT_CACHE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'batch_cache.json')
+
+
+def find_images(folder, recursive=False):
+    """List image files in folder (and subfolders when recursive), sorted"""
+    if not recursive:
+        return sorted(os.path.join(folder, name) for name in os.listdir(folder)
+                      if name.lower().endswith(IMAGE_EXTENSIONS))
+    images = []
+    for root, _, names in os.walk(folder):
+        images.extend(os.path.join(root, name) for name in names if name.lower().endswith(IMAGE_EXTENSIONS))
+    return sorted(images)
+
+
+def load_completed(jsonl_path):
+    """Read the entries of a previous run; only successful images count as done"""
+    entries = {}
+    if not os.path.exists(jsonl_path):
+        return entries
+    with open(jsonl_path) as f:
+        for line in f:
+            try:
+                entry = json.loads(line)
+            except ValueError:
+                continue  # Last line cut short by the interruption
+            if entry.get('classification') != 'error':
+                entries[entry['image']] = entry
+    return entries
+
+
+def open_label_index(bin_id=DEFAULT_BIN_ID):
+    """A bin's label index, opened with the plate ROI its embeddings were cropped to"""
+    configs = {config['id']: config for config in load_bin_configs()}
+    if bin_id not in configs:
+        raise ValueError(f"Unknown bin {bin_id!r} - configured bins: {', '.join(configs)}")
+    roi = configs[bin_id].get('plate_roi')
+    return LabelIndex(path=bin_path(os.getenv("LABEL_INDEX_PATH", DEFAULT_INDEX_PATH), bin_id),
+                      roi=tuple(roi) if roi else None)
+
+
+class ResultCache:
+    def __init__(self, path=DEFAULT_CACHE_PATH, save_every=10):
+        """Gemini answers keyed by the MD5 of the image file, kept across runs"""
+        self.path = path
+        self.save_every = save_every
+        self.unsaved = 0
+        self.lock = threading.Lock()
+        try:
+            with open(path) as f:
+                self.entries = json.load(f)
+        except (OSError, ValueError):
+            self.entries = {}
+
+    def get(self, digest):
+        with self.lock:
+            return self.entries.get(digest)
+
+    def put(self, digest, classification, raw_response):
+        """Store one answer, saving every save_every inserts"""
+        with self.lock:
+            self.entries[digest] = {'classification': classification, 'raw_response': raw_response,
+                                    'saved_at': time.time()}
+            self.unsaved += 1
+            if self.unsaved >= self.save_every:
+                self._save()
+
+    def save(self):
+        with self.lock:
+            self._save()
+
+    def _save(self):
+        """Write the cache atomically; callers hold the lock"""
+        try:
+            temp_path = self.path + '.tmp'
+            with open(temp_path, 'w') as f:
+                json.dump(self.entries, f)
+            os.replace(temp_path, self.path)
+            self.unsaved = 0
+        except OSError as e:
+            print(f"⚠️ Could not save result cache: {e}")
+
+
+class BatchClassifier:
+    def __init__(self, cache, label_index=None, rate_limiter=None, retries=2):
+        """Classify single images through the cache, label index and Gemini tiers"""
+        self.cache = cache
+        self.label_index = label_index
+        self.rate_limiter = rate_limiter or RateLimiter()
+        self.retries = retries
+        self.upload_preparer = UploadPreparer(byte_budget=40000)
+        self.labeler = make_labeler(self._generate)
+
+    def _generate(self, image_bytes):
+        """One rate-limited Gemini call, retried with backoff on upstream errors"""
+        for attempt in range(self.retries + 1):
+            try:
+                self.rate_limiter.acquire()
+                return generate_classification(image_bytes)
+            except Exception as e:
+                if attempt == self.retries:
+                    raise
+                print(f"⚠️ Gemini call failed: {e} - retrying")
+                time.sleep(2 ** attempt)
+
+    def classify(self, path):
+        """Classify one image file; returns its JSONL entry"""
+        start_time = time.perf_counter()
+        entry = {'image': path, 'timestamp': datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
+        try:
+            with open(path, 'rb') as f:
+                data = f.read()
+            digest = hashlib.md5(data).hexdigest()
+
+            cached = self.cache.get(digest)
+            if cached:
+                entry.update(classification=cached['classification'], source='cache',
+                             raw_response=cached['raw_response'])
+                return self._finish(entry, start_time)
+
+            frame = cv2.imdecode(np.frombuffer(data, dtype=np.uint8), cv2.IMREAD_COLOR)
+            if frame is None:
+                raise ValueError("unreadable image")
+
+            if self.label_index is not None and self.label_index.count:
+                label, neighbors = self.label_index.query(self.label_index.embed(frame))
+                if label is not None:
+                    entry.update(classification=label, source='label_index', neighbors=neighbors)
+                    return self._finish(entry, start_time)
+
+            image_bytes, upload_info = self.upload_preparer.prepare(frame)
+            labeled = self.labeler.classify(image_bytes)
+            entry.update(raw_response=labeled['raw_response'], confidence=labeled['confidence'],
+                         upload_bytes=upload_info['upload_bytes'], attempts=labeled['attempts'])
+            if labeled['status'] == 'unparseable':
+                # Not cached, so a resumed run asks again
+                entry.update(classification='error', source='gemini', error='Unparseable model response')
+            else:
+                source = 'gemini' if labeled['status'] == 'accepted' else 'gemini_low_confidence'
+                entry.update(classification=labeled['label'], source=source)
+                if labeled['status'] == 'accepted':
+                    self.cache.put(digest, labeled['label'], labeled['raw_response'])
+        except Exception as e:
+            entry.update(classification='error', source=None, error=str(e))
+        return self._finish(entry, start_time)
+
+    def _finish(self, entry, start_time):
+        """Stamp the per-image latency"""
+        entry['latency_ms'] = round((time.perf_counter() - start_time) * 1000, 1)
+        return entry
+
+
+def write_report(entries, report_path, folder):
+    """Write the human-readable classification report"""
+    successful = [e for e in entries if e['classification'] != 'error']
+    breakdown = {}
+    for entry in successful:
+        breakdown[entry['classification']] = breakdown.get(entry['classification'], 0) + 1
+    sources = {}
+    for entry in successful:
+        sources[entry['source']] = sources.get(entry['source'], 0) + 1
+    average = sum(e['latency_ms'] for e in successful) / len(successful) if successful else 0
+
+    with open(report_path, 'w', encoding='utf-8') as f:
+        f.write("=== IMAGE CLASSIFICATION RESULTS ===\n")
+        f.write(f"Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n")
+        f.write(f"Classification Folder: {folder}\n")
+        f.write("Method: Result cache, label index, then Gemini AI with Custom Material Prompt\n\n")
+
+        for number, entry in enumerate(entries, 1):
+            f.write(f"\n{'=' * 60}\nIMAGE {number}: {os.path.basename(entry['image'])}\n{'=' * 60}\n\n")
+            f.write("CLASSIFICATION RESULTS:\n----------------------\n")
+            if entry['classification'] == 'error':
+                f.write(f"Error: {entry.get('error')}\n")
+            else:
+                f.write(f"Material Type: {entry['classification'].upper()}\n")
+                f.write(f"Source: {entry['source']}\n")
+            f.write(f"Processing Time: {entry['latency_ms']:.0f} milliseconds\n")
+            f.write(f"Timestamp: {entry['timestamp']}\n\n")
+
+        f.write(f"\n\n{'=' * 60}\nCLASSIFICATION SUMMARY\n{'=' * 60}\n\n")
+        f.write("📊 PROCESSING STATISTICS:\n------------------------\n")
+        f.write(f"Total Images Processed: {len(entries)}\n")
+        f.write(f"Successful Classifications: {len(successful)}\n")
+        f.write(f"Failed Classifications: {len(entries) - len(successful)}\n")
+        f.write(f"Average Processing Time: {average:.0f}ms\n")
+        f.write(f"Answered By: {', '.join(f'{source} {count}' for source, count in sources.items())}\n\n")
+
+        f.write("🎯 MATERIAL BREAKDOWN:\n---------------------\n")
+        for classification, count in breakdown.items():
+            f.write(f"• {classification.upper()}: {count} image(s)\n")
+
+        f.write("\n\n📋 DETAILED RESULTS:\n-------------------\n")
+        for entry in entries:
+            name = os.path.basename(entry['image'])
+            if entry['classification'] == 'error':
+                f.write(f"❌ {name} → ERROR\n")
+            else:
+                f.write(f"✅ {name} → {entry['classification'].upper()}\n")
+
+        f.write(f"\n=== END OF CLASSIFICATION REPORT ===\nGenerated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n")
+
+
+def main():
+    """Main function"""
+    parser = argparse.ArgumentParser(description="Classify a folder of images")
+    parser.add_argument('folder', nargs='?', default=os.path.dirname(os.path.abspath(__file__)))
+    parser.add_argument('--workers', type=int, default=4, help='Concurrent Gemini calls')
+    parser.add_argument('--recursive', action='store_true')
+    parser.add_argument('--resume', help='JSONL file of an interrupted run to continue')
+    parser.add_argument('--no-index', action='store_true', help='Skip the label index tier')
+    parser.add_argument('--bin', default=DEFAULT_BIN_ID, help="Bin whose label index and plate ROI to use")
+    parser.add_argument('--cache', default=DEFAULT_CACHE_PATH, help='Result cache file')
+    args = parser.parse_args()
+
+    if not load_dotenv('.env'):
+        load_dotenv(os.path.join('..', 'backend', '.env'))
+    api_key = os.getenv("GEMINI_API_KEY")
+    if api_key:
+        genai.configure(api_key=api_key)
+    elif not os.getenv("CLASSIFIER_STUB"):
+        print("❌ GEMINI_API_KEY not found in environment variables")
+        return
+
+    run_stamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+    jsonl_path = args.resume or f"batch_results_{run_stamp}.jsonl"
+    report_path = os.path.splitext(jsonl_path)[0].replace('batch_results_', 'classification_results_') + '.txt'
+
+    completed = load_completed(jsonl_path)
+    images = find_images(args.folder, args.recursive)
+    todo = [path for path in images if path not in completed]
+    print(f"🗂️ {len(images)} images, {len(completed)} already done, {len(todo)} to classify "
+          f"with {args.workers} workers")
+
+    try:
+        label_index = None if args.no_index else open_label_index(args.bin)
+    except ValueError as e:
+        print(f"❌ {e}")
+        return
+    cache = ResultCache(args.cache)
+    classifier = BatchClassifier(cache, label_index)
+
+    results = dict(completed)
+    start_time = time.time()
+    pool = ThreadPoolExecutor(max_workers=args.workers)
+    try:
+        with open(jsonl_path, 'a') as jsonl:
+            futures = [pool.submit(classifier.classify, path) for path in todo]
+            for done, future in enumerate(as_completed(futures), 1):
+                entry = future.result()
+                # One flushed line per image is the resume checkpoint
+                jsonl.write(json.dumps(entry) + '\n')
+                jsonl.flush()
+                results[entry['image']] = entry
+                status = '❌' if entry['classification'] == 'error' else '✅'
+                print(f"{status} [{done}/{len(todo)}] {os.path.basename(entry['image'])} → "
+                      f"{entry['classification'].upper()} ({entry['source']}, {entry['latency_ms']:.0f}ms)")
+        pool.shutdown()
+    except KeyboardInterrupt:
+        # Calls already in flight finish in the background; their results are not recorded
+        pool.shutdown(wait=False, cancel_futures=True)
+        print(f"\n⏸️ Interrupted - resume with: python batch_classify.py {args.folder} --resume {jsonl_path}")
+    finally:
+        cache.save()
+
+    entries = [results[path] for path in images if path in results]
+    write_report(entries, report_path, args.folder)
+    elapsed = time.time() - start_time
+    print(f"📊 {len(todo)} images in {elapsed:.1f}s ({len(todo) / elapsed if elapsed > 0 else 0:.1f}/s)")
+    labeler_stats = classifier.labeler.get_stats()
+    print(f"🏷️ Gemini answers: {labeler_stats['accepted']} accepted, {labeler_stats['low_confidence']} low confidence, "
+          f"{labeler_stats['unparseable']} unparseable ({labeler_stats['retries']} retries)")
+    print(f"💾 Results: {jsonl_path}, report: {report_path}")
+
+
+if __name__ == "__main__":
+    main()
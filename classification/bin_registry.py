@@ -0,0 +1,107 @@
+"""
+Bin registry
+Runs several trash bins in one classification service. Each bin keeps its own
+camera, plate ROI, robot endpoint and plate state; all of them share one
+classification worker pool and one upstream rate limiter, so CPU use and the
+Gemini call rate stay fixed however many bins a site has.
+
+Bins are listed in a JSON file named by BINS_CONFIG:
+    [
+        {"id": "kitchen", "camera": 0, "plate_roi": [120, 80, 400, 320], "robot_url": "http://192.168.4.1"},
+        {"id": "lobby", "camera": 2, "robot_url": "http://192.168.4.2"}
+    ]
+A bin may use "replay": "<recording dir>" instead of a camera. Without
+BINS_CONFIG the service runs a single bin, "default", configured as before.
+"""
+
+import json
+import os
+import re
+
+from classification_executor import ClassificationExecutor
+from rate_limiter import RateLimiter
+
+DEFAULT_BIN_ID = 'default'
+BIN_ID_PATTERN = re.compile(r'^[A-Za-z0-9_-]+$')
+
+
+def load_bin_configs(path=None):
+    """Read bin configs from path (default BINS_CONFIG); a single default bin when unset"""
+    path = path or os.getenv("BINS_CONFIG")
+    if not path:
+        return [{'id': DEFAULT_BIN_ID}]
+
+    with open(path) as f:
+        configs = json.load(f)
+    if not isinstance(configs, list) or not configs:
+        raise ValueError(f"{path}: expected a non-empty list of bins")
+
+    seen = set()
+    for config in configs:
+        bin_id = config.get('id')
+        if not bin_id or not BIN_ID_PATTERN.match(bin_id):
+            raise ValueError(f"{path}: bin id {bin_id!r} must be letters, digits, '-' or '_'")
+        if bin_id in seen:
+            raise ValueError(f"{path}: duplicate bin id {bin_id!r}")
+        seen.add(bin_id)
+        # Probing would hand every bin the same first camera
+        if len(configs) > 1 and 'camera' not in config and 'replay' not in config:
+            raise ValueError(f"{path}: bin {bin_id!r} needs a 'camera' index or a 'replay' directory")
+    return configs
+
+
+def bin_path(path, bin_id):
+    """Per-bin variant of a data file path; the default bin keeps the original name"""
+    if not path or bin_id == DEFAULT_BIN_ID:
+        return path
+    root, ext = os.path.splitext(path)
+    return f"{root}_{bin_id}{ext}"
+
+
+class BinRegistry:
+    def __init__(self, configs=None, workers=None, deadline=15.0):
+        """Initialize the shared pool and rate limiter; workers defaults to CLASSIFIER_WORKERS (2)"""
+        self.configs = configs if configs is not None else load_bin_configs()
+        if workers is None:
+            workers = int(os.getenv("CLASSIFIER_WORKERS", "2"))
+
+        # One queued task per bin: a bin never submits while its own task is pending
+        self.classification_executor = ClassificationExecutor(
+            workers=workers, max_pending=len(self.configs), deadline=deadline
+        )
+        self.rate_limiter = RateLimiter()
+        self.bins = {}
+
+    def add(self, trash_bin):
+        """Register a bin under its id"""
+        if trash_bin.bin_id in self.bins:
+            raise ValueError(f"Bin {trash_bin.bin_id!r} already registered")
+        self.bins[trash_bin.bin_id] = trash_bin
+        return trash_bin
+
+    def get(self, bin_id=None):
+        """Look up a bin; None means the first configured bin"""
+        if bin_id is None:
+            return self.default
+        return self.bins.get(bin_id)
+
+    @property
+    def default(self):
+        """The bin served by the unprefixed routes"""
+        return next(iter(self.bins.values()), None)
+
+    def shutdown(self):
+        """Stop every bin, release their cameras and stop the shared pool"""
+        for trash_bin in self.bins.values():
+            if trash_bin.running:
+                trash_bin.stop_camera_streaming()
+            trash_bin.camera_manager.close()
+        self.classification_executor.stop()
+
+    def get_stats(self):
+        """Per-bin summary plus the shared pool and rate limiter"""
+        return {
+            'bins': [trash_bin.get_summary() for trash_bin in self.bins.values()],
+            'classification_executor': self.classification_executor.get_stats(),
+            'rate_limiter': self.rate_limiter.get_stats()
+        }
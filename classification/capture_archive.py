@@ -0,0 +1,189 @@
+"""
+Capture archive
+Keeps every classified item - the frame as JPEG, its label, stage timings and
+robot outcome - in append-only segment files, written by a background thread
+so the sorting loop only pays for handing a frame over.
+
+An archive directory holds numbered segment pairs:
+    segment_000001.bin     JPEG frames back to back
+    segment_000001.jsonl   one index line per frame: offset, length and the item record
+A new segment is started when the current one reaches segment_bytes, and the
+oldest segments are deleted beyond max_segments. Frames are written before
+their index line, so an interrupted write never leaves an index entry pointing
+at missing bytes.
+"""
+
+import json
+import os
+import queue
+import threading
+import time
+
+import cv2
+
+DEFAULT_ARCHIVE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'archive')
+
+
+class CaptureArchive:
+    def __init__(self, path=None, segment_bytes=64 * 1024 * 1024, max_segments=100, quality=90, max_queue=32):
+        """Initialize the archive; path defaults to CAPTURE_ARCHIVE_DIR, '' disables archiving"""
+        self.path = path if path is not None else os.getenv("CAPTURE_ARCHIVE_DIR", DEFAULT_ARCHIVE_DIR)
+        self.segment_bytes = segment_bytes
+        self.max_segments = max_segments
+        self.quality = quality
+
+        self.pending = queue.Queue(maxsize=max_queue)
+        self.thread = None
+        self.segment = None  # Current segment number
+        self.data_file = None
+        self.index_file = None
+        self.segment_size = 0
+
+        self.stats = {
+            'archived': 0,
+            'dropped': 0,
+            'bytes': 0,
+            'segments': 0,
+            'errors': 0,
+            'avg_write_ms': 0.0
+        }
+
+    @property
+    def enabled(self):
+        return bool(self.path)
+
+    def start(self):
+        """Start the writer thread"""
+        if not self.enabled or (self.thread and self.thread.is_alive()):
+            return
+        self.thread = threading.Thread(target=self._writer_loop, daemon=True)
+        self.thread.start()
+
+    def stop(self, timeout=5.0):
+        """Write what is queued, then stop the writer and close the segment"""
+        if not self.thread:
+            return
+        try:
+            self.pending.put(None, timeout=timeout)
+        except queue.Full:
+            print("⚠️ Capture archive writer is not draining - abandoning queued items")
+        self.thread.join(timeout)
+        self.thread = None
+
+    def submit(self, frame, record):
+        """Queue a frame and its record for archiving; never blocks, drops the item when the writer is behind"""
+        if not self.enabled:
+            return False
+        try:
+            self.pending.put_nowait((frame, record))
+            return True
+        except queue.Full:
+            self.stats['dropped'] += 1
+            return False
+
+    def _segment_paths(self, segment):
+        """Data and index paths of a segment"""
+        base = os.path.join(self.path, f"segment_{segment:06d}")
+        return base + '.bin', base + '.jsonl'
+
+    def _existing_segments(self):
+        """Numbers of the segments already on disk, oldest first"""
+        numbers = []
+        for name in os.listdir(self.path):
+            if name.startswith('segment_') and name.endswith('.jsonl'):
+                try:
+                    numbers.append(int(name[8:-6]))
+                except ValueError:
+                    pass
+        return sorted(numbers)
+
+    def _rotate(self):
+        """Close the current segment, open the next one and drop the oldest beyond max_segments"""
+        self._close_segment()
+        os.makedirs(self.path, exist_ok=True)
+        existing = self._existing_segments()
+        self.segment = (existing[-1] if existing else 0) + 1
+        data_path, index_path = self._segment_paths(self.segment)
+        self.data_file = open(data_path, 'ab')
+        self.index_file = open(index_path, 'a')
+        self.segment_size = 0
+        self.stats['segments'] += 1
+
+        for old in existing[:max(0, len(existing) + 1 - self.max_segments)]:
+            for old_path in self._segment_paths(old):
+                try:
+                    os.remove(old_path)
+                except OSError:
+                    pass
+
+    def _close_segment(self):
+        """Close the open segment files"""
+        for f in (self.data_file, self.index_file):
+            if f is not None:
+                f.close()
+        self.data_file = None
+        self.index_file = None
+
+    def _write(self, frame, record):
+        """Encode one frame and append it with its index line"""
+        ok, buffer = cv2.imencode('.jpg', frame, [cv2.IMWRITE_JPEG_QUALITY, self.quality])
+        if not ok:
+            raise ValueError("JPEG encoding failed")
+        data = buffer.tobytes()
+
+        if self.data_file is None or self.segment_size + len(data) > self.segment_bytes:
+            self._rotate()
+
+        offset = self.segment_size
+        self.data_file.write(data)
+        self.data_file.flush()
+        self.segment_size += len(data)
+
+        entry = {'segment': self.segment, 'offset': offset, 'length': len(data), **record}
+        self.index_file.write(json.dumps(entry) + '\n')
+        self.index_file.flush()
+
+        self.stats['archived'] += 1
+        self.stats['bytes'] += len(data)
+
+    def _writer_loop(self):
+        """Write queued items until stopped"""
+        while True:
+            item = self.pending.get()
+            if item is None:
+                break
+            start_time = time.perf_counter()
+            try:
+                self._write(*item)
+            except Exception as e:
+                # Any failure costs one item, never the writer thread
+                self.stats['errors'] += 1
+                print(f"⚠️ Could not archive item: {e}")
+                continue
+            write_ms = (time.perf_counter() - start_time) * 1000
+            # Exponential moving average keeps the stat cheap
+            self.stats['avg_write_ms'] = round(0.9 * self.stats['avg_write_ms'] + 0.1 * write_ms, 2)
+        self._close_segment()
+
+    def get_stats(self):
+        """Get archive counters and the current segment"""
+        return {
+            **self.stats,
+            'path': self.path or None,
+            'segment': self.segment,
+            'queued': self.pending.qsize()
+        }
+
+
+def iter_archive(path):
+    """Yield (index entry, JPEG bytes) for every archived item, oldest first"""
+    archive = CaptureArchive(path)
+    for segment in archive._existing_segments():
+        data_path, index_path = archive._segment_paths(segment)
+        with open(index_path) as index_file, open(data_path, 'rb') as data_file:
+            for line in index_file:
+                if not line.strip():
+                    continue
+                entry = json.loads(line)
+                data_file.seek(entry['offset'])
+                yield entry, data_file.read(entry['length'])
@@ -0,0 +1,212 @@
+"""
+Bounded classification executor
+A small fixed pool of classification workers fed by a bounded queue, with
+explicit task states, per-task deadlines and cancellation of tasks that went
+stale before their result came back.
+"""
+
+import itertools
+import queue
+import threading
+import time
+from collections import deque
+
+# Task lifecycle: queued -> running -> done | failed, or cancelled / expired on the way
+TASK_STATES = ('queued', 'running', 'done', 'failed', 'cancelled', 'expired')
+
+
+class ClassificationTask:
+    def __init__(self, task_id, frame, deadline, context=None, run_task=None):
+        """One frame to classify; context carries caller data (burst info, trace, plate generation)
+
+        run_task overrides the executor's callback, so one pool can serve
+        several owners (bins) that each act on their own results.
+        """
+        self.task_id = task_id
+        self.frame = frame
+        self.context = context or {}
+        self.run_task = run_task
+        self.submitted_at = time.time()
+        self.deadline = self.submitted_at + deadline
+        self.started_at = None
+        self.finished_at = None
+        self.state = 'queued'
+        self.cancel_reason = None
+        self.lock = threading.Lock()
+
+    def transition(self, from_states, to_state):
+        """Atomically move to to_state if the task is in one of from_states; returns True on success"""
+        with self.lock:
+            if self.state not in from_states:
+                return False
+            self.state = to_state
+            if to_state == 'running':
+                self.started_at = time.time()
+            elif to_state != 'queued':
+                self.finished_at = time.time()
+            return True
+
+    def cancel(self, reason):
+        """Cancel a queued or running task; a running task finishes its call but its result is discarded"""
+        if self.transition(('queued', 'running'), 'cancelled'):
+            self.cancel_reason = reason
+            return True
+        return False
+
+    @property
+    def cancelled(self):
+        """Check if the task was cancelled or expired"""
+        return self.state in ('cancelled', 'expired')
+
+    def expired(self):
+        """Check if the task is past its deadline"""
+        return time.time() > self.deadline
+
+    def is_stale(self):
+        """Check if the result should be discarded: cancelled, or a running task past its deadline"""
+        if self.expired():
+            self.transition(('running',), 'expired')
+        return self.cancelled
+
+    def summary(self):
+        """Task state and timings for status reporting"""
+        return {
+            'id': self.task_id,
+            'state': self.state,
+            'queue_wait_ms': round((self.started_at - self.submitted_at) * 1000, 1) if self.started_at else None,
+            'run_ms': round((self.finished_at - self.started_at) * 1000, 1) if self.started_at and self.finished_at else None,
+            'cancel_reason': self.cancel_reason
+        }
+
+
+class ClassificationExecutor:
+    def __init__(self, run_task=None, workers=2, max_pending=1, deadline=15.0):
+        """Initialize the executor; run_task(task) classifies task.frame and acts on the result
+
+        Without a run_task here, every submit() must pass its own.
+        """
+        self.run_task = run_task
+        self.workers = workers
+        self.deadline = deadline
+
+        self.task_queue = queue.Queue(maxsize=max_pending)
+        self.task_ids = itertools.count(1)
+        self.active = {}  # task_id -> task, for queued and running tasks
+        self.lock = threading.Lock()
+        self.running = False
+        self.worker_threads = []
+
+        self.queue_waits = deque(maxlen=50)
+        self.run_times = deque(maxlen=50)
+        self.recent = deque(maxlen=10)
+        self.stats = {state: 0 for state in TASK_STATES if state not in ('queued', 'running')}
+        self.stats.update({'submitted': 0, 'rejected': 0})
+
+    def start(self):
+        """Start the worker pool"""
+        if self.running:
+            return
+        self.running = True
+        self.worker_threads = [threading.Thread(target=self._worker_loop, daemon=True) for _ in range(self.workers)]
+        for thread in self.worker_threads:
+            thread.start()
+        print(f"🧠 Classification executor started with {self.workers} workers")
+
+    def stop(self):
+        """Cancel outstanding tasks and stop the workers after their current call"""
+        self.running = False
+        self.cancel_all('stopped')
+        for thread in self.worker_threads:
+            thread.join(timeout=1)
+        self.worker_threads = []
+
+    def submit(self, frame, run_task=None, **context):
+        """Queue a frame for classification; returns the task, or None if the queue is full"""
+        task = ClassificationTask(next(self.task_ids), frame, self.deadline, context, run_task)
+        with self.lock:
+            try:
+                self.task_queue.put_nowait(task)
+            except queue.Full:
+                self.stats['rejected'] += 1
+                return None
+            self.active[task.task_id] = task
+            self.stats['submitted'] += 1
+        return task
+
+    def is_busy(self, predicate=None):
+        """Check if any task (matching predicate(task), when given) is queued or running"""
+        with self.lock:
+            if predicate is None:
+                return bool(self.active)
+            return any(predicate(task) for task in self.active.values())
+
+    def cancel_where(self, predicate, reason):
+        """Cancel active tasks matching predicate(task); returns how many were cancelled"""
+        with self.lock:
+            tasks = [task for task in self.active.values() if predicate(task)]
+        cancelled = 0
+        for task in tasks:
+            if task.cancel(reason):
+                cancelled += 1
+                self._retire(task)
+        return cancelled
+
+    def cancel_all(self, reason):
+        """Cancel every queued or running task"""
+        return self.cancel_where(lambda task: True, reason)
+
+    def _retire(self, task):
+        """Remove a finished task from the active set and record its outcome"""
+        with self.lock:
+            if self.active.pop(task.task_id, None) is None:
+                return
+            self.stats[task.state] += 1
+            if task.started_at:
+                self.queue_waits.append(task.started_at - task.submitted_at)
+                if task.finished_at:
+                    self.run_times.append(task.finished_at - task.started_at)
+            self.recent.append(task.summary())
+
+    def _worker_loop(self):
+        """Take tasks off the queue until stopped"""
+        while self.running:
+            try:
+                task = self.task_queue.get(timeout=0.2)
+            except queue.Empty:
+                continue
+
+            try:
+                if task.expired():
+                    # Waited in the queue past its deadline; the plate has likely moved on
+                    if task.transition(('queued',), 'expired'):
+                        self._retire(task)
+                    continue
+                if not task.transition(('queued',), 'running'):
+                    continue  # Cancelled while queued
+
+                # run_task checks task.is_stale() before acting on its result
+                try:
+                    (task.run_task or self.run_task)(task)
+                    task.transition(('running',), 'done')
+                except Exception as e:
+                    print(f"❌ Classification task {task.task_id} failed: {e}")
+                    task.transition(('running',), 'failed')
+                self._retire(task)
+            finally:
+                self.task_queue.task_done()
+
+    def get_stats(self):
+        """Get task counts, queue wait and run time"""
+        with self.lock:
+            waits = list(self.queue_waits)
+            runs = list(self.run_times)
+            states = [task.state for task in self.active.values()]
+            return {
+                **self.stats,
+                'workers': self.workers,
+                'queued': states.count('queued'),
+                'running': states.count('running'),
+                'avg_queue_wait_ms': round(sum(waits) / len(waits) * 1000, 1) if waits else 0,
+                'avg_run_ms': round(sum(runs) / len(runs) * 1000, 1) if runs else 0,
+                'recent_tasks': list(self.recent)
+            }
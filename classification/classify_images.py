@@ -1,17 +1,40 @@
 import os
+import sys
 import cv2
 import numpy as np
 import google.generativeai as genai
 from dotenv import load_dotenv
 from datetime import datetime
 import time
-import base64
-from flask import Flask, Response, jsonify, render_template_string
+from flask import Flask, Response, jsonify, render_template_string, request, abort
 from flask_cors import CORS
 import threading
-import queue
 import json
-import requests
+from empty_plate import EmptyPlateModel
+from robot_actuator import RobotActuator
+from robot_driver import RobotDriver
+from event_stream import EventStream
+from upload_prep import UploadPreparer
+from label_index import LabelIndex, DEFAULT_INDEX_PATH
+from latency_tracker import LatencyTracker, DEFAULT_TRACE_LOG
+from classification_executor import ClassificationExecutor
+from motion_thresholds import AdaptiveMotionThreshold
+from gemini_classifier import generate_classification, make_labeler
+from capture_archive import CaptureArchive, DEFAULT_ARCHIVE_DIR
+from rate_limiter import RateLimiter
+from bin_registry import BinRegistry, DEFAULT_BIN_ID, bin_path
+
+# Shared camera utilities live at the repository root
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from camera.frame_hub import FrameHub
+from camera.pipeline import FrameRing, StageStats
+from camera.frame_scheduler import FrameScheduler
+from camera.frame_buffers import FrameSlots
+from camera.overlay_cache import OverlayCache
+from camera.burst_selector import BurstSelector
+from camera.frame_source import ReplaySource, open_replay_from_env, record_from_env
+from camera.frame_bus import open_bus_from_env
+from camera.camera_manager import CameraManager
 
 # Initialize Flask app
 app = Flask(__name__)
@@ -29,31 +52,101 @@ gemini_api_key = os.getenv("GEMINI_API_KEY")
 if gemini_api_key:
     genai.configure(api_key=gemini_api_key)
     print("✅ Gemini configured successfully")
+elif os.getenv("CLASSIFIER_STUB"):
+    print("🧪 No GEMINI_API_KEY - running with the offline stub model")
 else:
     print("❌ GEMINI_API_KEY not found in environment variables") 
     exit(1)
 
 class SmartTrashBinAPI:
-    def __init__(self):
+    def __init__(self, config=None, classification_executor=None, rate_limiter=None):
+        """Initialize one bin; config holds its id, camera, plate_roi and robot_url (see bin_registry.py)
+
+        The executor and rate limiter are shared between bins when a registry
+        passes them in.
+        """
+        config = config or {}
+        self.bin_id = config.get('id', DEFAULT_BIN_ID)
+        self.replay_path = config.get('replay')
         self.cap = None
+        # Capture mode (CAMERA_FORMAT, default 640x480) and reduced exposure are applied on
+        # open, before the first read; the device stays open for a minute after /stop
+        # so /start is instant
+        camera_name = 'classification' if self.bin_id == DEFAULT_BIN_ID else f'classification_{self.bin_id}'
+        camera_indices = [config['camera']] if 'camera' in config else range(5)
+        self.camera_manager = CameraManager(camera_name, indices=camera_indices, settings={
+            cv2.CAP_PROP_BUFFERSIZE: 1,  # Reduce buffer to avoid lag
+            cv2.CAP_PROP_AUTO_EXPOSURE: 0.25,  # Disable auto-exposure
+            cv2.CAP_PROP_EXPOSURE: -6,  # Reduce exposure (typical range: -13 to -1)
+        })
         self.background_subtractor = cv2.createBackgroundSubtractorMOG2(
             history=500, varThreshold=50, detectShadows=True
         )
         self.last_classification_time = 0
         self.cooldown_period = 5.0  # 5 seconds
-        self.motion_threshold = 5000  # Minimum contour area for motion detection
-        self.classification_in_progress = False
+        # Contour-area trigger and subtractor variance learned from idle-plate noise
+        # (5000 px and 50 until enough idle frames have been seen)
+        self.motion_thresholds = AdaptiveMotionThreshold(base_area=5000, var_threshold=50)
+        self.last_motion_area = 0
+        
+        # Fixed worker pool with a bounded queue, shared with the other bins; a task goes
+        # stale when the plate changes again
+        self.classification_executor = classification_executor or ClassificationExecutor(
+            workers=2, max_pending=1, deadline=15.0
+        )
+        self.rate_limiter = rate_limiter or RateLimiter()  # Caps Gemini calls across all bins
+        self.labeler = make_labeler(self._generate_classification, min_confidence=0.6, max_attempts=2)
+        # Vote floor for replacing an unsure Gemini label with the label index's majority
+        self.fallback_min_votes = 3
+        self.fallback_min_margin = 2
+        self.plate_generation = 0  # Bumped at the start of each motion episode
+        self.motion_active = False
         self.motion_detection_enabled = True  # Flag to disable motion during robot operations
         self.navigation_trigger = None  # Track when to trigger navigation to ThankYou page
+        self.navigation_lock = threading.Lock()
+        self.event_stream = EventStream()  # Pushes results, plate state and navigation to the UI
+        self.plate_state = None
         self.latest_classification_result = None
+        self.latest_tentative_result = None  # Last low-confidence guess that nothing was sorted on
         self.latest_frame = None
-        self.frame_queue = queue.Queue(maxsize=10)
+        self.latest_raw_frame = None
+        self.frame_hub = FrameHub(quality=85)  # Encodes each frame once for all /video_feed clients
         self.running = False
-        self.camera_thread = None
         
-        # Robot movement API configuration
-        self.robot_base_url = "http://10.250.167.161/move"
-        self.robot_api_timeout = 5.0  # seconds
+        # Staged pipeline: capture -> analysis -> render, linked by drop-oldest ring buffers
+        self.capture_ring = FrameRing(capacity=8)
+        self.render_ring = FrameRing(capacity=2)
+        self.capture_stats = StageStats('capture')
+        self.analysis_stats = StageStats('analysis')
+        self.render_stats = StageStats('render')
+        self.pipeline_threads = []
+        
+        # Preallocated buffers reused every frame; slots outnumber ring entries so a
+        # frame is not overwritten while a stage is still working on it
+        self.capture_slots = FrameSlots(self.capture_ring.capacity + 4)
+        self.display_slots = FrameSlots(3)
+        self.classification_slots = FrameSlots(4)  # Two running, one queued, one being filled
+        self.motion_kernel = cv2.getStructuringElement(cv2.MORPH_ELLIPSE, (5, 5))
+        self.fg_mask = None
+        self.fg_mask_scratch = None
+        
+        # Overlays are only drawn for /video_feed viewers, from cached text sprites
+        self.overlay_cache = OverlayCache()
+        
+        # Paces capture from a monotonic deadline; drops to a low rate when the plate is quiet
+        self.frame_scheduler = FrameScheduler(active_fps=30, idle_fps=5, idle_after=30.0)
+        
+        # Robot movement API configuration (per bin, else ROBOT_BASE_URL, e.g. a local robot_simulator.py)
+        self.robot_driver = RobotDriver(base_url=config.get('robot_url'), timeout=5.0)
+        
+        # Dedicated worker runs move/reset phases off the classification thread
+        self.robot_actuator = RobotActuator(
+            self.robot_driver.move,
+            send_sequence=self.robot_driver.sort,
+            confirm_move=self.robot_driver.wait_for_move,
+            on_busy=self._on_robot_busy,
+            on_idle=self._on_robot_idle
+        )
         
         # Robot movement parameters for each classification
         self.robot_movements = {
@@ -63,178 +156,208 @@ class SmartTrashBinAPI:
             'other': {'spin': -65, 'pivot': 40}
         }
         
+        # Local empty-plate model answers no_object without calling Gemini
+        # (x, y, w, h) of the plate in the camera frame, None = full frame
+        self.plate_roi = tuple(config['plate_roi']) if config.get('plate_roi') else None
+        self.empty_plate_model = EmptyPlateModel(roi=self.plate_roi)
+        self.empty_plate_seed_frames = 5  # Frames sampled at startup, assuming the plate starts empty
+        
+        # Items that look like ones Gemini already labelled many times are answered locally
+        self.label_index = LabelIndex(
+            path=bin_path(os.getenv("LABEL_INDEX_PATH", DEFAULT_INDEX_PATH), self.bin_id), roi=self.plate_roi
+        )
+        self.label_index_categories = ['can', 'plastic', 'paper', 'other']
+        
+        # Gemini uploads are cropped to the plate and JPEG-encoded to fit a byte budget
+        self.upload_preparer = UploadPreparer(roi=self.plate_roi, byte_budget=40000)
+        
+        # Classify the sharpest, best-exposed of the last few frames instead of the motion trigger frame
+        self.burst_selector = BurstSelector(burst_size=5, roi=self.plate_roi)
+        self.gemini_call_count = 0
+        
+        # Every classified frame is archived with its label, timings and robot outcome
+        # by a background writer once the item's trace finishes
+        self.capture_archive = CaptureArchive(bin_path(os.getenv("CAPTURE_ARCHIVE_DIR", DEFAULT_ARCHIVE_DIR), self.bin_id))
+        
+        # Stamps each item from capture to robot reset; per-stage histograms feed /metrics
+        self.latency_tracker = LatencyTracker(
+            trace_log=bin_path(os.getenv("ITEM_TRACE_LOG", DEFAULT_TRACE_LOG), self.bin_id),
+            on_finish=self._archive_item
+        )
+        
     def initialize_camera(self):
         """Initialize webcam"""
         global has_camera
         print("📷 Initializing camera...")
         
-        # Try different camera indices
-        for camera_index in range(5):  # Try cameras 0-4
-            print(f"🔍 Trying camera index {camera_index}...")
-            self.cap = cv2.VideoCapture(camera_index)
+        # A bin configured with a recording replays it in a loop
+        if self.replay_path:
+            self.cap = ReplaySource(self.replay_path, realtime=True, loop=True)
+            print(f"🎞️ Bin {self.bin_id}: replaying {self.cap.count} frames from {self.replay_path}")
+            has_camera = True
+            return True
+        
+        # The environment overrides only apply to the single-bin setup
+        if self.bin_id == DEFAULT_BIN_ID:
+            # Replay a recorded session instead of probing for a webcam (CAMERA_REPLAY)
+            replay = open_replay_from_env()
+            if replay is not None:
+                self.cap = replay
+                has_camera = True
+                return True
             
-            if self.cap.isOpened():
-                # Test if camera can actually read frames with timeout
-                self.cap.set(cv2.CAP_PROP_BUFFERSIZE, 1)  # Reduce buffer to avoid lag
-                ret, _ = self.cap.read()
-                if ret:
-                    print(f"✅ Camera {camera_index} opened successfully!")
-                    break
-                else:
-                    print(f"❌ Camera index {camera_index} opened but cannot read frames")
-                    self.cap.release()
-            else:
-                print(f"❌ Camera index {camera_index} failed to open")
-            
-            if camera_index == 4:  # Last attempt
-                print("⚠️ No camera detected - enabling web-only mode")
-                self.cap = None
-                has_camera = False
-                return False
-            
-        # Set camera resolution if we have a working camera
-        if self.cap and self.cap.isOpened():
-            # Reduce exposure for better image quality
-            self.cap.set(cv2.CAP_PROP_AUTO_EXPOSURE, 0.25)  # Disable auto-exposure
-            self.cap.set(cv2.CAP_PROP_EXPOSURE, -6)  # Reduce exposure (typical range: -13 to -1)
-            print("📸 Camera exposure reduced for better image quality")
-            
-            self.cap.set(cv2.CAP_PROP_FRAME_WIDTH, 640)
-            self.cap.set(cv2.CAP_PROP_FRAME_HEIGHT, 480)
-            
-            # Quick warm up test
-            ret, _ = self.cap.read()
-            if not ret:
-                print("❌ Error: Could not read from camera during warmup")
-                self.cap.release()
-                self.cap = None
-                has_camera = False
-                return False
+            # Read frames published by a separate capture process (CAMERA_BUS)
+            bus = open_bus_from_env()
+            if bus is not None:
+                self.cap = bus
+                has_camera = True
+                return True
+        
+        # Reuse the standby device, else the cached one, else probe the rest in parallel
+        self.cap = self.camera_manager.open()
+        if self.cap is None:
+            print("⚠️ No camera detected - enabling web-only mode")
+            has_camera = False
+            return False
+        
+        # Optionally record the live session for later replay (CAMERA_RECORD)
+        self.cap = record_from_env(self.cap)
                 
         print("✅ Camera initialized successfully")
         has_camera = True
         return True
     
+    def _add_empty_sample(self, frame):
+        """Feed a frame known to show an empty plate to the empty-plate model and burst selector"""
+        self.empty_plate_model.add_empty_sample(frame)
+        self.burst_selector.set_reference(frame)
+    
+    def select_best_frame(self):
+        """Copy the best frame of the latest burst into a classification slot; returns (frame, burst info)"""
+        burst = [frame for _, _, frame in self.capture_ring.get_recent(self.burst_selector.burst_size)]
+        if not burst:
+            return None, None
+        index, burst_info = self.burst_selector.select(burst)
+        return self.classification_slots.copy_into_next(burst[index]), burst_info
+    
     def detect_motion(self, frame):
         """Detect motion in the current frame"""
-        # Apply background subtraction
-        fg_mask = self.background_subtractor.apply(frame)
+        # Apply background subtraction into the reused mask buffer
+        self.fg_mask = self.background_subtractor.apply(frame, self.fg_mask)
+        if self.fg_mask_scratch is None or self.fg_mask_scratch.shape != self.fg_mask.shape:
+            self.fg_mask_scratch = np.empty_like(self.fg_mask)
         
-        # Remove noise using morphological operations
-        kernel = cv2.getStructuringElement(cv2.MORPH_ELLIPSE, (5, 5))
-        fg_mask = cv2.morphologyEx(fg_mask, cv2.MORPH_OPEN, kernel)
-        fg_mask = cv2.morphologyEx(fg_mask, cv2.MORPH_CLOSE, kernel)
+        # Remove noise using morphological operations (ping-pong between the two mask buffers)
+        cv2.morphologyEx(self.fg_mask, cv2.MORPH_OPEN, self.motion_kernel, dst=self.fg_mask_scratch)
+        cv2.morphologyEx(self.fg_mask_scratch, cv2.MORPH_CLOSE, self.motion_kernel, dst=self.fg_mask)
+        fg_mask = self.fg_mask
         
         # Find contours
         contours, _ = cv2.findContours(fg_mask, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
         
-        # Check if any contour is large enough to be considered motion
-        for contour in contours:
-            if cv2.contourArea(contour) > self.motion_threshold:
-                return True, contours
-                
-        return False, contours
-    
-    def capture_and_resize(self, frame):
-        """Capture and resize frame to 640x480"""
-        # Ensure frame is 640x480
-        resized_frame = cv2.resize(frame, (640, 480))
-        return resized_frame
-    
-    def frame_to_base64(self, frame):
-        """Convert frame to base64 encoded JPEG"""
-        # Encode frame as JPEG with lower quality for faster processing
-        _, buffer = cv2.imencode('.jpg', frame, [cv2.IMWRITE_JPEG_QUALITY, 50])
-        
-        # Convert to base64
-        image_base64 = base64.b64encode(buffer).decode('utf-8')
-        return image_base64
+        # Largest contour against the learned threshold; idle frames refine the noise statistics
+        max_area = max((cv2.contourArea(contour) for contour in contours), default=0)
+        fg_ratio = cv2.countNonZero(fg_mask) / fg_mask.size
+        idle = self.motion_detection_enabled and not self.classification_in_progress
+        motion_detected = self.motion_thresholds.observe(max_area, fg_ratio, idle, idle and not self.is_in_cooldown())
+        self.last_motion_area = max_area
+        
+        if self.motion_thresholds.var_threshold != self.background_subtractor.getVarThreshold():
+            self.background_subtractor.setVarThreshold(self.motion_thresholds.var_threshold)
+        
+        return motion_detected, contours
     
-    def classify_object(self, frame):
-        """Classify object in frame using Gemini AI"""
+    def classify_object(self, frame, trace=None):
+        """Classify object in frame using Gemini AI; trace gets encoded/rate_limited/model_response marks"""
         try:
             start_time = time.time()
             
-            # Resize and encode frame
-            resized_frame = self.capture_and_resize(frame)
-            image_base64 = self.frame_to_base64(resized_frame)
+            # Answer locally when the plate still matches its empty baseline. Local hits are
+            # not fed back: only Gemini-confirmed and post-sort empties refresh the baseline,
+            # so a missed small item can't drift it
+            plate_empty, plate_scores = self.empty_plate_model.check(frame)
+            if plate_empty:
+                return {
+                    'classification': 'no_object',
+                    'raw_response': 'local_empty_plate',
+                    'processing_time': (time.time() - start_time) * 1000,
+                    'source': 'empty_plate',
+                    'plate_scores': plate_scores
+                }
             
-            # Classification prompt
-            prompt = """You are a visual classification system.
-
-If there is a motion detection, then analyze the image and determine whether there is a physical object resting on the brown plate.
-
-The brown plate is the background and must NEVER be classified.
-
-Always determine if the plate is completely empty.
-
-If the plate is completely empty, no motion detection, and no physical object is resting on it, return exactly: no_object
-
-If motion detection took place, then analyze the image and determine if there is a physical object resting on the brown plate.
-
-Ignore:
-The brown plate
-The brown plate is not the object and should not be classified
-The brown plate is the background
-Shadows
-Reflections
-Printed images
-Logos or labels
-Designs on the plate
-if there is nothing on the plate, the place is empty and should be classified as no_object.
-Classify only real, physical objects based on material and structure.
-
-Allowed categories (return exactly one lowercase word):
--no_object : plate is completely empty
--can: aluminum or metal beverage can (even crushed)
--plastic: plastic bottle or rigid plastic container, a crushed water bottle, or any object made primarily of plastic
--paper: paper, newspaper, napkin
-- other: any object not listed above (food, fabric, electronics, etc.)
-
-Strict output rules:
--Return exactly ONE lowercase word
--No punctuation
--No explanation
--No extra text
--No quotes"""
-            
-            # Create model and generate content
-            model = genai.GenerativeModel('gemini-2.5-flash')
-            
-            # Convert base64 to bytes
-            image_bytes = base64.b64decode(image_base64)
-            
-            # Create image part
-            image_part = {
-                "mime_type": "image/jpeg",
-                "data": image_bytes
-            }
+            # Answer from the label index when the nearest labelled frames agree
+            embedding = self.label_index.embed(frame)
+            indexed_label, neighbors = self.label_index.query(embedding)
+            if indexed_label is not None:
+                return {
+                    'classification': indexed_label,
+                    'raw_response': 'local_label_index',
+                    'processing_time': (time.time() - start_time) * 1000,
+                    'source': 'label_index',
+                    'plate_scores': plate_scores,
+                    'neighbors': neighbors
+                }
             
-            # Generate content
-            response = model.generate_content([prompt, image_part])
+            # Crop to the plate and encode straight to JPEG bytes within the upload budget
+            image_bytes, upload_info = self.upload_preparer.prepare(frame)
+            if trace:
+                trace.mark('encoded')
+            
+            # Schema-constrained call: one allowed label plus a confidence, retried when
+            # the answer is unparseable or unsure. The SDK sends and waits in one call, so
+            # model_response covers upload, model time and any retries
+            labeled = self.labeler.classify(image_bytes, trace)
+            if trace:
+                trace.mark('model_response')
+            self.gemini_call_count += labeled['attempts']
             
             processing_time = (time.time() - start_time) * 1000
-            classification_text = response.text.strip().lower()
+            self.upload_preparer.record_call(upload_info, processing_time)
             
-            # Validate response
-            valid_categories = ['can', 'plastic', 'paper', 'other', 'no_object']
+            if labeled['status'] == 'unparseable':
+                return {
+                    'classification': 'error',
+                    'error': 'Unparseable model response',
+                    'raw_response': labeled['raw_response'],
+                    'processing_time': processing_time,
+                    'attempts': labeled['attempts']
+                }
             
-            if classification_text in valid_categories:
-                result_classification = classification_text
-            else:
-                # Try to extract valid category
-                for category in valid_categories:
-                    if category in classification_text:
-                        result_classification = category
-                        break
+            result = {
+                'classification': labeled['label'],
+                'confidence': labeled['confidence'],
+                'raw_response': labeled['raw_response'],
+                'processing_time': processing_time,
+                'source': 'gemini',
+                'attempts': labeled['attempts'],
+                'plate_scores': plate_scores,
+                'upload': upload_info
+            }
+            
+            if labeled['status'] == 'low_confidence':
+                # Still unsure after the retry: take the label index's majority if it is clear
+                # enough, else publish the guess as tentative so nothing is sorted on it. The
+                # index holds no empty plates, so an unsure no_object stays no_object.
+                ranked = sorted((neighbors.get('votes') or {}).items(), key=lambda vote: -vote[1])
+                top_votes = ranked[0][1] if ranked else 0
+                runner_up = ranked[1][1] if len(ranked) > 1 else 0
+                if labeled['label'] != 'no_object' and top_votes >= self.fallback_min_votes and \
+                        top_votes - runner_up >= self.fallback_min_margin:
+                    result['classification'] = ranked[0][0]
+                    result['source'] = 'label_index_fallback'
                 else:
-                    result_classification = 'no_object'
+                    result['source'] = 'gemini_low_confidence'
+                    result['tentative'] = True
+                return result
             
-            return {
-                'classification': result_classification,
-                'raw_response': classification_text,
-                'processing_time': processing_time
-            }
+            # Gemini confirmed an empty plate, so this frame refines the empty baseline
+            if labeled['label'] == 'no_object':
+                self._add_empty_sample(frame)
+            elif labeled['label'] in self.label_index_categories:
+                # Only confident Gemini answers are indexed, never local guesses
+                self.label_index.add(embedding, labeled['label'])
+            
+            return result
             
         except Exception as e:
             processing_time = (time.time() - start_time) * 1000 if 'start_time' in locals() else 0
@@ -244,214 +367,414 @@ Strict output rules:
                 'processing_time': processing_time
             }
     
+    def _generate_classification(self, image_bytes, trace=None):
+        """One rate-limited Gemini call; every attempt draws from the budget shared by all bins"""
+        if not self.rate_limiter.acquire(timeout=5.0):
+            raise RuntimeError("Gemini rate limit reached")
+        # Stamped when the first request is about to be sent, after the token wait
+        if trace and not any(stage == 'rate_limited' for stage, _ in trace.marks):
+            trace.mark('rate_limited')
+        return generate_classification(image_bytes)
+    
+    def _owns_task(self, task):
+        """Check if a task on the shared executor belongs to this bin"""
+        return task.context.get('bin_id') == self.bin_id
+    
+    @property
+    def classification_in_progress(self):
+        """Check if a classification is queued or running for this bin"""
+        return self.classification_executor.is_busy(self._owns_task)
+    
     def is_in_cooldown(self):
         """Check if we're still in cooldown period"""
         return (time.time() - self.last_classification_time) < self.cooldown_period
     
     def start_camera_streaming(self):
-        """Start camera in a separate thread for streaming"""
+        """Start the capture, analysis and render stages in separate threads"""
+        # Refuses while the last session's worker is still finishing a sort
+        if not self.robot_actuator.start():
+            return False
         if not self.initialize_camera():
             return False
             
         self.running = True
-        self.camera_thread = threading.Thread(target=self._camera_loop, daemon=True)
-        self.camera_thread.start()
+        self.capture_ring.clear()
+        self.render_ring.clear()
+        self.frame_scheduler.reset()
+        self.classification_executor.start()
+        self.capture_archive.start()
+        self.pipeline_threads = [
+            threading.Thread(target=self._capture_loop, daemon=True),
+            threading.Thread(target=self._analysis_loop, daemon=True),
+            threading.Thread(target=self._render_loop, daemon=True)
+        ]
+        for thread in self.pipeline_threads:
+            thread.start()
+        self.event_stream.publish('system', {'running': True})
         print("📹 Camera streaming started")
         return True
     
     def stop_camera_streaming(self):
         """Stop camera streaming"""
         self.running = False
-        if self.camera_thread:
-            self.camera_thread.join()
-        if self.cap:
-            self.cap.release()
+        for thread in self.pipeline_threads:
+            thread.join()
+        self.pipeline_threads = []
+        self.camera_manager.release(self.cap, standby=True)
+        self.cap = None
+        # Other bins may still be using the shared pool: only drop this bin's tasks
+        self.classification_executor.cancel_where(self._owns_task, 'stopped')
+        self.robot_actuator.stop()
+        self.capture_archive.stop()
+        self.label_index.save()
+        self.plate_state = None
+        self.event_stream.publish('system', {'running': False})
         print("📹 Camera streaming stopped")
     
-    def _camera_loop(self):
-        """Main camera loop running in separate thread"""
-        frame_count = 0
-        
+    def _capture_loop(self):
+        """Capture stage: read frames as fast as the camera delivers them"""
         while self.running and self.cap and self.cap.isOpened():
-            ret, frame = self.cap.read()
+            if hasattr(self.cap, 'read_view'):
+                # Frame bus: later stages only read the frame or copy it into their
+                # own slots, so use the shared-memory slot directly
+                ret, frame = self.cap.read_view()
+            else:
+                # Read straight into the next preallocated slot
+                slot_index, buffer = self.capture_slots.next()
+                ret, frame = self.cap.read(image=buffer)
+                if ret:
+                    self.capture_slots.store(slot_index, frame)
             if not ret:
                 print("⚠️ Error reading frame")
                 time.sleep(0.1)
                 continue
+            
+            # Timestamp at capture so later stages can tell how stale a frame is
+            read_done = time.time()
+            self.capture_ring.put(frame, read_done)
+            self.capture_stats.record(time.time() - read_done)
+            
+            # Replayed sessions pace themselves (recorded timing or as fast as possible)
+            if not getattr(self.cap, 'paces_itself', False):
+                self.frame_scheduler.wait()
+    
+    def _analysis_loop(self):
+        """Analysis stage: motion detection and classification triggers on the newest frame"""
+        frame_count = 0
+        last_sequence = 0
+        
+        while self.running:
+            entry = self.capture_ring.get_latest(last_sequence, timeout=0.5)
+            if entry is None:
+                continue
+            last_sequence, captured_at, frame = entry
+            start_time = time.time()
                 
             frame_count += 1
+            self.latest_raw_frame = frame
+            
+            # Seed the empty-plate baseline from the first frames after startup
+            if frame_count <= self.empty_plate_seed_frames:
+                self._add_empty_sample(frame)
             
             # Detect motion
             motion_detected, contours = self.detect_motion(frame)
             
-            # Create display frame with overlays
-            display_frame = self._create_display_frame(frame.copy(), motion_detected, contours, frame_count)
+            # Anything happening on the plate keeps the camera at full rate
+            if motion_detected or self.classification_in_progress or not self.motion_detection_enabled:
+                self.frame_scheduler.trigger()
             
-            # Store latest frame for streaming
-            self.latest_frame = display_frame
+            # A new motion episode means the plate changed: results for older frames are stale
+            # (the arm's own movement does not count)
+            if motion_detected and not self.motion_active and self.motion_detection_enabled:
+                self.plate_generation += 1
+                generation = self.plate_generation
+                if self.classification_executor.cancel_where(
+                        lambda task: self._owns_task(task) and task.context['plate_generation'] < generation,
+                        'plate changed'):
+                    print("🔄 Plate changed - cancelled stale classification")
+                    self.last_classification_time = 0  # Classify the new item without waiting out the cooldown
+            self.motion_active = motion_detected
+            
+            # Hand the result to the render stage
+            self.render_ring.put((frame, motion_detected, contours, frame_count))
+            
+            # Push plate state changes to event stream subscribers
+            self._update_plate_state(motion_detected)
             
             # Handle motion detection and classification
             if motion_detected and not self.is_in_cooldown() and not self.classification_in_progress and self.motion_detection_enabled:
                 print(f"🎯 Motion detected! Capturing frame #{frame_count}")
-                self._start_classification_thread(frame.copy())
+                trace = self.latency_tracker.start()
+                trace.mark('capture', captured_at)
+                trace.mark('motion_trigger')
+                best_frame, burst_info = self.select_best_frame()
+                trace.mark('frame_selected')
+                self._submit_classification(best_frame, burst_info, trace, trigger_area=self.last_motion_area)
+            
+            self.analysis_stats.record(time.time() - start_time)
+    
+    def _render_loop(self):
+        """Render stage: draw overlays and publish frames for streaming"""
+        last_sequence = 0
+        
+        while self.running:
+            entry = self.render_ring.get_latest(last_sequence, timeout=0.5)
+            if entry is None:
+                continue
+            last_sequence, _, (frame, motion_detected, contours, frame_count) = entry
+            
+            # Nobody is watching: skip overlay rendering and encoding entirely
+            if not self.frame_hub.has_subscribers():
+                continue
+            start_time = time.time()
+            
+            # Create display frame with overlays in the next display slot (the hub may still be encoding the last one)
+            display_frame = self._create_display_frame(frame, motion_detected, contours, frame_count,
+                                                       out=self.display_slots.next_like(frame))
+            
+            # Store latest frame for streaming
+            self.latest_frame = display_frame
+            self.frame_hub.publish(display_frame)
             
-            time.sleep(0.033)  # ~30 FPS
+            self.render_stats.record(time.time() - start_time)
+    
+    def get_summary(self):
+        """Get a short per-bin summary for the bin list"""
+        return {
+            'id': self.bin_id,
+            'running': self.running,
+            'plate_state': self.plate_state,
+            'classification_in_progress': self.classification_in_progress,
+            'latest_classification': self.latest_classification_result,
+            'camera_index': self.camera_manager.device_index,
+            'robot_url': self.robot_driver.base_url,
+            'gemini_calls': self.gemini_call_count
+        }
+    
+    def get_pipeline_stats(self):
+        """Get fps and queue depth for each pipeline stage"""
+        return {
+            'buffers': {
+                'capture': self.capture_slots.get_stats(),
+                'display': self.display_slots.get_stats()
+            },
+            'overlay_cache': self.overlay_cache.stats,
+            'capture': self.capture_stats.get_stats(),
+            'analysis': self.analysis_stats.get_stats(self.capture_ring),
+            'render': self.render_stats.get_stats(self.render_ring)
+        }
     
-    def _create_display_frame(self, frame, motion_detected, contours, frame_count):
-        """Create frame with all visual overlays"""
-        display_frame = frame.copy()
+    def _update_plate_state(self, motion_detected):
+        """Publish a plate event when the plate state changes"""
+        if self.classification_in_progress:
+            state = 'classifying'
+        elif not self.motion_detection_enabled:
+            state = 'sorting'
+        elif motion_detected:
+            state = 'motion'
+        elif self.is_in_cooldown():
+            state = 'cooldown'
+        else:
+            state = 'idle'
+        
+        if state != self.plate_state:
+            self.plate_state = state
+            self.event_stream.publish('plate', {'state': state})
+    
+    def set_navigation_trigger(self, trigger):
+        """Store a navigation trigger for pollers and push it to event stream subscribers"""
+        with self.navigation_lock:
+            self.navigation_trigger = trigger
+        self.event_stream.publish('navigation', trigger)
+    
+    def consume_navigation_trigger(self):
+        """Atomically read and clear the pending navigation trigger"""
+        with self.navigation_lock:
+            trigger = self.navigation_trigger
+            self.navigation_trigger = None
+            return trigger
+    
+    def _create_display_frame(self, frame, motion_detected, contours, frame_count, out=None):
+        """Create frame with all visual overlays, drawing into out when given"""
+        if out is None:
+            display_frame = frame.copy()
+        else:
+            np.copyto(out, frame)
+            display_frame = out
         
         if motion_detected:
             # Draw motion contours
             cv2.drawContours(display_frame, contours, -1, (0, 255, 0), 2)
-            cv2.putText(display_frame, "MOTION DETECTED", (10, 30), 
-                       cv2.FONT_HERSHEY_SIMPLEX, 1, (0, 255, 0), 2)
+            self.overlay_cache.put_text(display_frame, "MOTION DETECTED", (10, 30), 
+                                       cv2.FONT_HERSHEY_SIMPLEX, 1, (0, 255, 0), 2)
             
             if self.classification_in_progress:
-                cv2.putText(display_frame, "CLASSIFYING...", (10, 70), 
-                           cv2.FONT_HERSHEY_SIMPLEX, 0.7, (0, 255, 255), 2)
+                self.overlay_cache.put_text(display_frame, "CLASSIFYING...", (10, 70), 
+                                           cv2.FONT_HERSHEY_SIMPLEX, 0.7, (0, 255, 255), 2)
             elif self.is_in_cooldown():
                 remaining_cooldown = self.cooldown_period - (time.time() - self.last_classification_time)
-                cv2.putText(display_frame, f"COOLDOWN: {remaining_cooldown:.1f}s", (10, 70), 
-                           cv2.FONT_HERSHEY_SIMPLEX, 0.7, (255, 165, 0), 2)
+                self.overlay_cache.put_text(display_frame, f"COOLDOWN: {remaining_cooldown:.1f}s", (10, 70), 
+                                           cv2.FONT_HERSHEY_SIMPLEX, 0.7, (255, 165, 0), 2)
         
         # Display latest classification result
         if self.latest_classification_result:
             result = self.latest_classification_result
             if result['classification'] != 'error':
-                cv2.putText(display_frame, f"CLASSIFIED: {result['classification'].upper()}", 
-                           (10, 100), cv2.FONT_HERSHEY_SIMPLEX, 0.6, (255, 255, 0), 1)
-                cv2.putText(display_frame, f"Time: {result['processing_time']:.0f}ms", 
-                           (10, 120), cv2.FONT_HERSHEY_SIMPLEX, 0.5, (255, 255, 0), 1)
+                self.overlay_cache.put_text(display_frame, f"CLASSIFIED: {result['classification'].upper()}", 
+                                           (10, 100), cv2.FONT_HERSHEY_SIMPLEX, 0.6, (255, 255, 0), 1)
+                self.overlay_cache.put_text(display_frame, f"Time: {result['processing_time']:.0f}ms", 
+                                           (10, 120), cv2.FONT_HERSHEY_SIMPLEX, 0.5, (255, 255, 0), 1)
             else:
-                cv2.putText(display_frame, "CLASSIFICATION FAILED", 
-                           (10, 100), cv2.FONT_HERSHEY_SIMPLEX, 0.6, (0, 0, 255), 1)
+                self.overlay_cache.put_text(display_frame, "CLASSIFICATION FAILED", 
+                                           (10, 100), cv2.FONT_HERSHEY_SIMPLEX, 0.6, (0, 0, 255), 1)
         
         # Add status text
         status_text = "READY" if not motion_detected else "MOTION"
         api_status = " | API: BUSY" if self.classification_in_progress else " | API: READY"
         motion_status = " | MOTION: DISABLED" if not self.motion_detection_enabled else ""
-        cv2.putText(display_frame, f"Status: {status_text}{api_status}{motion_status}", (10, display_frame.shape[0] - 20), 
-                   cv2.FONT_HERSHEY_SIMPLEX, 0.5, (255, 255, 255), 1)
+        self.overlay_cache.put_text(display_frame, f"Status: {status_text}{api_status}{motion_status}", (10, display_frame.shape[0] - 20), 
+                                   cv2.FONT_HERSHEY_SIMPLEX, 0.5, (255, 255, 255), 1)
         
         return display_frame
     
-    def _start_classification_thread(self, frame):
-        """Start classification in a separate thread"""
-        if not self.classification_in_progress:
-            self.classification_in_progress = True
-            self.last_classification_time = time.time()
-            
-            classification_thread = threading.Thread(
-                target=self._classify_in_thread, 
-                args=(frame,), 
-                daemon=True
-            )
-            classification_thread.start()
+    def _submit_classification(self, frame, burst_info=None, trace=None, trigger_area=None):
+        """Queue a frame on the classification executor; returns the task, or None if the queue is full"""
+        task = self.classification_executor.submit(
+            frame, run_task=self._run_classification_task, bin_id=self.bin_id,
+            burst_info=burst_info, trace=trace, plate_generation=self.plate_generation,
+            trigger_area=trigger_area
+        )
+        if task is None:
+            print("⚠️ Classification queue full - skipping trigger")
+            if trace:
+                trace.finish('rejected')
+            return None
+        
+        self.last_classification_time = time.time()
+        return task
     
-    def _classify_in_thread(self, frame):
-        """Run classification in separate thread"""
+    def _run_classification_task(self, task):
+        """Classify a task's frame on an executor worker and act on the result unless it went stale"""
+        burst_info = task.context.get('burst_info')
+        trace = task.context.get('trace')
+        sort_queued = False
+        outcome = 'error'
         try:
-            result = self.classify_object(frame)
-            self.latest_classification_result = result
+            result = self.classify_object(task.frame, trace)
+            outcome = result.get('source', result['classification'])
+            if trace and self.capture_archive.enabled:
+                # The classification slot is reused, so the archive gets its own copy
+                trace.attach(frame=task.frame.copy(), result=result)
+            
+            # The plate changed or the deadline passed while Gemini was answering
+            if task.is_stale():
+                outcome = task.state
+                print(f"🗑️ Discarding {task.state} classification result: {result['classification']}")
+                return
+            
+            if burst_info is not None:
+                result['burst'] = burst_info
+            # Tentative guesses are shown but kept out of latest_classification, which the UI tallies
+            if result.get('tentative'):
+                self.latest_tentative_result = result
+            else:
+                self.latest_classification_result = result
+            self.event_stream.publish_classification(result)
             
             # Print results
             timestamp = datetime.now().strftime("%H:%M:%S")
             if result['classification'] != 'error':
                 classification = result['classification'].lower()
                 
-                if classification == 'no_object':
+                if result.get('tentative'):
+                    # Too unsure to move the arm or thank anyone; the UI still sees the guess
+                    print(f"🤔 [{timestamp}] Unsure classification: {classification.upper()} "
+                          f"(confidence {result['confidence']:.2f}) - no action taken")
+                elif classification == 'no_object':
                     print(f"📭 [{timestamp}] No object detected on plate - no action needed")
+                    # Motion that found an empty plate was noise; manual triggers have no area
+                    if task.context.get('trigger_area') is not None:
+                        self.motion_thresholds.record_false_trigger(task.context['trigger_area'])
                 else:
                     print(f"✅ [{timestamp}] Classification: {classification.upper()}")
                     print(f"   Processing time: {result['processing_time']:.0f}ms")
                     
                     # Trigger navigation to ThankYou page immediately after classification
-                    self.navigation_trigger = {
+                    self.set_navigation_trigger({
                         'action': 'show_thankyou',
                         'timestamp': time.time(),
                         'classified_item': classification
-                    }
+                    })
                     print(f"🎉 Navigation trigger set: ThankYou page for {classification}")
                     
-                    # Call robot movement API for detected classifications
+                    # Hand the sort to the actuation worker so this thread is free immediately
                     if classification in self.robot_movements:
-                        print(f"🔍 {classification.capitalize()} detected! Triggering robot movement...")
-                        # Disable motion detection during robot operation
-                        self.motion_detection_enabled = False
-                        print("🚫 Motion detection disabled during robot operation")
-                        
-                        robot_success = self.call_robot_movement_api(classification)
-                        if robot_success:
-                            print(f"🎯 Robot movement for {classification} completed successfully")
-                        else:
-                            print(f"⚠️ Robot movement for {classification} failed, but classification completed")
-                        
-                        # Re-enable motion detection after additional 2 seconds
-                        print("⏱️ Waiting additional 2 seconds before re-enabling motion detection...")
-                        time.sleep(2)
-                        self.motion_detection_enabled = True
-                        print("✅ Motion detection re-enabled")
+                        print(f"🔍 {classification.capitalize()} detected! Queueing robot movement...")
+                        sort_queued = self.call_robot_movement_api(classification, trace)
                         
             else:
                 print(f"❌ [{timestamp}] Classification failed: {result.get('error', 'Unknown error')}")
                 
         finally:
-            self.classification_in_progress = False
+            # Queued sorts are finished by the actuator once the arm is back at neutral
+            if trace and not sort_queued:
+                trace.finish(outcome)
     
-    def call_robot_movement_api(self, classification):
-        """Call robot movement API for detected classification"""
-        try:
-            if classification not in self.robot_movements:
-                print(f"⚠️ No robot movement configured for: {classification}")
-                return False
-                
-            movement = self.robot_movements[classification]
-            api_url = f"{self.robot_base_url}?spin={movement['spin']}&pivot={movement['pivot']}"
-            
-            print(f"🤖 Calling robot movement API for {classification}: {api_url}")
-            response = requests.get(
-                api_url,
-                timeout=self.robot_api_timeout
-            )
-            
-            if response.status_code == 200:
-                print(f"✅ Robot movement API call for {classification} successful")
-                
-                # Wait 2 seconds before resetting to neutral position
-                print("⏱️ Waiting 2 seconds before reset...")
-                time.sleep(2)
-                
-                # Reset robot to neutral position after movement
-                reset_url = f"{self.robot_base_url}?spin=0&pivot=0"
-                print(f"🔄 Resetting robot to neutral position: {reset_url}")
-                
-                try:
-                    reset_response = requests.get(reset_url, timeout=self.robot_api_timeout)
-                    if reset_response.status_code == 200:
-                        print("✅ Robot reset to neutral position successful")
-                    else:
-                        print(f"⚠️ Robot reset failed with status code: {reset_response.status_code}")
-                except Exception as reset_error:
-                    print(f"⚠️ Robot reset failed: {str(reset_error)}")
-                
-                return True
-            else:
-                print(f"⚠️ Robot API returned status code: {response.status_code}")
-                return False
-                
-        except requests.exceptions.Timeout:
-            print(f"❌ Robot API call for {classification} timed out")
-            return False
-        except requests.exceptions.ConnectionError:
-            print(f"❌ Could not connect to robot API for {classification}")
-            return False
-        except Exception as e:
-            print(f"❌ Robot API call for {classification} failed: {str(e)}")
+    def _archive_item(self, trace, entry):
+        """Hand a finished item to the capture archive (called when its trace finishes)"""
+        frame = trace.attachments.get('frame')
+        result = trace.attachments.get('result')
+        if frame is None or result is None:
+            return
+        self.capture_archive.submit(frame, {
+            'bin': self.bin_id,
+            'item': entry['item'],
+            'captured_at': entry['started_at'],
+            'label': result['classification'],
+            'source': result.get('source'),
+            'raw_response': result.get('raw_response'),
+            'processing_time_ms': round(result.get('processing_time', 0), 1),
+            'outcome': entry['outcome'],
+            'stages_ms': entry['stages_ms']
+        })
+    
+    def call_robot_movement_api(self, classification, trace=None):
+        """Queue robot movement for detected classification"""
+        if classification not in self.robot_movements:
+            print(f"⚠️ No robot movement configured for: {classification}")
             return False
+        
+        movement = self.robot_movements[classification]
+        return self.robot_actuator.enqueue(classification, movement['spin'], movement['pivot'], trace)
+    
+    def _on_robot_busy(self):
+        """Disable motion triggers while the arm is moving through the camera view"""
+        self.motion_detection_enabled = False
+        print("🚫 Motion detection disabled during robot operation")
+    
+    def _on_robot_idle(self):
+        """Re-enable motion triggers once the arm is back at neutral"""
+        # Item has been sorted off the plate, so the current view is an empty baseline
+        if self.latest_raw_frame is not None:
+            self._add_empty_sample(self.latest_raw_frame)
+        self.motion_detection_enabled = True
+        print("✅ Motion detection re-enabled")
+
+# Bins served by this process (BINS_CONFIG), sharing one classifier pool and rate limiter
+bin_registry = BinRegistry()
+for bin_config in bin_registry.configs:
+    bin_registry.add(SmartTrashBinAPI(bin_config, bin_registry.classification_executor, bin_registry.rate_limiter))
 
-# Global instance of the trash bin system
-trash_bin = SmartTrashBinAPI()
+# The unprefixed routes serve the first bin
+trash_bin = bin_registry.default
+
+def get_bin(bin_id):
+    """Look up the bin for a route; /bins/<bin_id>/... routes name it, the rest use the first bin"""
+    selected = bin_registry.get(bin_id)
+    if selected is None:
+        abort(404, description=f"Unknown bin: {bin_id}")
+    return selected
 
 @app.route('/')
 def index():
@@ -523,33 +846,29 @@ def index():
                     });
             }
             
-            // Auto-refresh status every 2 seconds
-            setInterval(getStatus, 2000);
+            // Refresh status when the server pushes an event instead of polling
+            const events = new EventSource('/events');
+            ['classification', 'classification_tentative', 'plate', 'system', 'resync'].forEach(type =>
+                events.addEventListener(type, getStatus));
+            getStatus();
         </script>
     </body>
     </html>
     ''')
 
 @app.route('/video_feed')
-def video_feed():
+@app.route('/bins/<bin_id>/video_feed')
+def video_feed(bin_id=None):
     """Video streaming endpoint"""
-    def generate_frames():
-        while trash_bin.running:
-            if trash_bin.latest_frame is not None:
-                # Encode frame as JPEG
-                ret, buffer = cv2.imencode('.jpg', trash_bin.latest_frame, 
-                                         [cv2.IMWRITE_JPEG_QUALITY, 85])
-                if ret:
-                    frame_bytes = buffer.tobytes()
-                    yield (b'--frame\r\n'
-                           b'Content-Type: image/jpeg\r\n\r\n' + frame_bytes + b'\r\n')
-            time.sleep(0.033)  # ~30 FPS
-    
-    return Response(generate_frames(), mimetype='multipart/x-mixed-replace; boundary=frame')
+    trash_bin = get_bin(bin_id)
+    return Response(trash_bin.frame_hub.stream(lambda: trash_bin.running),
+                    mimetype='multipart/x-mixed-replace; boundary=frame')
 
 @app.route('/start', methods=['GET', 'POST'])
-def start_system():
+@app.route('/bins/<bin_id>/start', methods=['GET', 'POST'])
+def start_system(bin_id=None):
     """Start the camera system"""
+    trash_bin = get_bin(bin_id)
     try:
         if trash_bin.running:
             return jsonify({
@@ -579,8 +898,10 @@ def start_system():
         })
 
 @app.route('/stop', methods=['GET', 'POST'])
-def stop_system():
+@app.route('/bins/<bin_id>/stop', methods=['GET', 'POST'])
+def stop_system(bin_id=None):
     """Stop the camera system"""
+    trash_bin = get_bin(bin_id)
     try:
         trash_bin.stop_camera_streaming()
         return jsonify({
@@ -596,19 +917,52 @@ def stop_system():
         })
 
 @app.route('/status')
-def get_status():
+@app.route('/bins/<bin_id>/status')
+def get_status(bin_id=None):
     """Get current system status"""
+    trash_bin = get_bin(bin_id)
     return jsonify({
+        'bin': trash_bin.bin_id,
         'running': trash_bin.running,
         'classification_in_progress': trash_bin.classification_in_progress,
+        'classification_executor': trash_bin.classification_executor.get_stats(),
         'in_cooldown': trash_bin.is_in_cooldown(),
         'latest_classification': trash_bin.latest_classification_result,
+        'latest_tentative_classification': trash_bin.latest_tentative_result,
+        'empty_plate': trash_bin.empty_plate_model.get_stats(),
+        'motion_thresholds': trash_bin.motion_thresholds.get_stats(),
+        'burst_selector': trash_bin.burst_selector.get_stats(),
+        'uploads': trash_bin.upload_preparer.get_stats(),
+        'label_index': trash_bin.label_index.get_stats(),
+        'latency': trash_bin.latency_tracker.get_summary(),
+        'archive': trash_bin.capture_archive.get_stats(),
+        'gemini_calls': trash_bin.gemini_call_count,
+        'structured_output': trash_bin.labeler.get_stats(),
+        'rate_limiter': trash_bin.rate_limiter.get_stats(),
+        'robot': trash_bin.robot_actuator.get_status(),
+        'robot_driver': trash_bin.robot_driver.get_stats(),
+        'plate_state': trash_bin.plate_state,
+        'events': trash_bin.event_stream.get_stats(),
+        'video_feed': trash_bin.frame_hub.get_stats(),
+        'pipeline': trash_bin.get_pipeline_stats(),
+        'frame_scheduler': trash_bin.frame_scheduler.get_stats(),
+        'camera': trash_bin.camera_manager.get_stats(),
+        'frame_bus': trash_bin.cap.get_stats() if hasattr(trash_bin.cap, 'read_view') else None,
         'timestamp': datetime.now().strftime('%Y-%m-%d %H:%M:%S')
     })
 
+@app.route('/metrics')
+@app.route('/bins/<bin_id>/metrics')
+def get_metrics(bin_id=None):
+    """Get per-stage latency histograms and recent item traces"""
+    trash_bin = get_bin(bin_id)
+    return jsonify({**trash_bin.latency_tracker.get_metrics(), 'structured_output': trash_bin.labeler.get_stats()})
+
 @app.route('/classify', methods=['POST'])
-def trigger_classification():
+@app.route('/bins/<bin_id>/classify', methods=['POST'])
+def trigger_classification(bin_id=None):
     """Manually trigger classification (for testing)"""
+    trash_bin = get_bin(bin_id)
     try:
         if not trash_bin.running:
             return jsonify({
@@ -629,8 +983,11 @@ def trigger_classification():
                 'message': f'In cooldown period. {remaining:.1f}s remaining'
             })
         
-        if trash_bin.latest_frame is not None:
-            trash_bin._start_classification_thread(trash_bin.latest_frame.copy())
+        if trash_bin.latest_raw_frame is not None:
+            trace = trash_bin.latency_tracker.start()
+            best_frame, burst_info = trash_bin.select_best_frame()
+            trace.mark('frame_selected')
+            trash_bin._submit_classification(best_frame, burst_info, trace)
             return jsonify({
                 'status': 'success',
                 'message': 'Classification triggered'
@@ -647,13 +1004,32 @@ def trigger_classification():
             'message': f'Error triggering classification: {str(e)}'
         })
 
+@app.route('/events')
+@app.route('/bins/<bin_id>/events')
+def events(bin_id=None):
+    """Server-Sent Events stream of classification, plate and navigation events"""
+    trash_bin = get_bin(bin_id)
+    # Browsers send Last-Event-ID on reconnect; ?since= lets other clients resume explicitly
+    since = request.headers.get('Last-Event-ID') or request.args.get('since') or 0
+    try:
+        since = int(since)
+    except ValueError:
+        since = 0
+    
+    return Response(
+        trash_bin.event_stream.stream(since),
+        mimetype='text/event-stream',
+        headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'}
+    )
+
 @app.route('/navigation_trigger')
-def get_navigation_trigger():
+@app.route('/bins/<bin_id>/navigation_trigger')
+def get_navigation_trigger(bin_id=None):
     """Check for navigation triggers and consume them"""
+    trash_bin = get_bin(bin_id)
     try:
-        if trash_bin.navigation_trigger is not None:
-            trigger = trash_bin.navigation_trigger
-            trash_bin.navigation_trigger = None  # Reset trigger after reading
+        trigger = trash_bin.consume_navigation_trigger()
+        if trigger is not None:
             return jsonify({
                 'trigger': True,
                 'action': trigger['action'],
@@ -670,6 +1046,14 @@ def get_navigation_trigger():
             'error': f'Error checking navigation trigger: {str(e)}'
         })
 
+@app.route('/bins')
+def list_bins():
+    """List the bins with the shared classifier pool and rate limiter"""
+    return jsonify({
+        **bin_registry.get_stats(),
+        'timestamp': datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+    })
+
 if __name__ == "__main__":
     print("🚀 Starting Smart Trash Bin Flask API...")
     print("=" * 60)
@@ -679,17 +1063,23 @@ if __name__ == "__main__":
     print("   POST /start         - Start camera system")
     print("   POST /stop          - Stop camera system")
     print("   GET  /status        - Get system status")
+    print("   GET  /metrics       - Per-stage latency histograms and item traces")
     print("   POST /classify      - Manual classification trigger")
     print("   GET  /navigation_trigger - Check for navigation events")
+    print("   GET  /events        - Event stream (SSE, resume with ?since=SEQ)")
+    print("   GET  /bins          - List bins, shared classifier pool and rate limiter")
+    print("   ...  /bins/<id>/... - Any route above for one bin (unprefixed = first bin)")
+    print(f"🗑️ Bins: {', '.join(bin_registry.bins)}")
     print("=" * 60)
     print("📱 Frontend Integration:")
     print("   Video stream URL: http://localhost:5000/video_feed")
     print("   Status API URL: http://localhost:5000/status")
+    print("   Event stream URL: http://localhost:5000/events")
     print("=" * 60)
     
     try:
         app.run(host='0.0.0.0', port=5000, debug=False, threaded=True)
     except KeyboardInterrupt:
         print("\n🛑 Shutting down...")
-        trash_bin.stop_camera_streaming()
+        bin_registry.shutdown()
         print("👋 Goodbye!")
@@ -0,0 +1,166 @@
+"""
+Empty-plate reference model
+Keeps a running median background of the plate ROI and decides locally whether
+the plate is empty, so shadows, lighting changes and passing hands do not cost
+a Gemini call. Besides the global SSIM and colour histogram, the plate only
+counts as empty when no local patch differs from the baseline: the low tail of
+the SSIM map and the fraction of changed pixels catch a small item that barely
+moves the global scores.
+"""
+
+import threading
+from collections import deque
+
+import cv2
+import numpy as np
+
+
+class EmptyPlateModel:
+    def __init__(self, roi=None, history=15, sample_size=(160, 120),
+                 ssim_threshold=0.80, hist_threshold=0.90, local_ssim_threshold=0.5,
+                 diff_threshold=30, max_changed_fraction=0.001, min_samples=3):
+        """Initialize the model; roi is (x, y, w, h) in frame pixels or None for the full frame"""
+        self.roi = roi
+        self.sample_size = sample_size
+        self.ssim_threshold = ssim_threshold
+        self.hist_threshold = hist_threshold
+        self.local_ssim_threshold = local_ssim_threshold  # Floor for the 1st percentile of the SSIM map
+        self.diff_threshold = diff_threshold  # Grey levels a pixel must move to count as changed
+        self.max_changed_fraction = max_changed_fraction
+        self.min_samples = min_samples
+
+        self.samples = deque(maxlen=history)
+        self.background = None  # Median grayscale sample
+        self.background_color = None  # Median colour sample, for items that only differ in hue
+        self.background_hist = None
+        self.lock = threading.Lock()
+
+        # Statistics for monitoring how many API calls were answered locally
+        self.stats = {
+            'checks': 0,
+            'local_empty': 0,
+            'escalated': 0,
+            'samples_added': 0
+        }
+
+    def _crop(self, frame):
+        """Crop the plate ROI out of a full frame"""
+        if self.roi is None:
+            return frame
+        x, y, w, h = self.roi
+        return frame[y:y + h, x:x + w]
+
+    def _prepare(self, frame):
+        """Downscale the plate ROI to a small colour sample, its grayscale and an H-S histogram"""
+        roi = cv2.resize(self._crop(frame), self.sample_size, interpolation=cv2.INTER_AREA)
+        gray = cv2.cvtColor(roi, cv2.COLOR_BGR2GRAY)
+
+        hsv = cv2.cvtColor(roi, cv2.COLOR_BGR2HSV)
+        hist = cv2.calcHist([hsv], [0, 1], None, [30, 32], [0, 180, 0, 256])
+        cv2.normalize(hist, hist, 0, 1, cv2.NORM_MINMAX)
+        return roi, gray, hist
+
+    def _ssim(self, a, b):
+        """Structural similarity map of two grayscale samples (Gaussian-window SSIM)"""
+        a = a.astype(np.float32)
+        b = b.astype(np.float32)
+
+        c1 = (0.01 * 255) ** 2
+        c2 = (0.03 * 255) ** 2
+
+        mu_a = cv2.GaussianBlur(a, (7, 7), 1.5)
+        mu_b = cv2.GaussianBlur(b, (7, 7), 1.5)
+        mu_a_sq = mu_a * mu_a
+        mu_b_sq = mu_b * mu_b
+        mu_ab = mu_a * mu_b
+
+        sigma_a_sq = cv2.GaussianBlur(a * a, (7, 7), 1.5) - mu_a_sq
+        sigma_b_sq = cv2.GaussianBlur(b * b, (7, 7), 1.5) - mu_b_sq
+        sigma_ab = cv2.GaussianBlur(a * b, (7, 7), 1.5) - mu_ab
+
+        ssim_map = ((2 * mu_ab + c1) * (2 * sigma_ab + c2)) / \
+                   ((mu_a_sq + mu_b_sq + c1) * (sigma_a_sq + sigma_b_sq + c2))
+        return ssim_map
+
+    def add_empty_sample(self, frame):
+        """Add a frame known to show an empty plate and rebuild the median background"""
+        color, _, hist = self._prepare(frame)
+
+        with self.lock:
+            self.samples.append(color)
+            self.background_color = np.median(np.stack(self.samples), axis=0).astype(np.uint8)
+            self.background = cv2.cvtColor(self.background_color, cv2.COLOR_BGR2GRAY)
+
+            if self.background_hist is None:
+                self.background_hist = hist
+            else:
+                # Exponential blend keeps the colour histogram tracking slow lighting drift
+                self.background_hist = cv2.addWeighted(self.background_hist, 0.8, hist, 0.2, 0)
+
+            self.stats['samples_added'] += 1
+
+    def is_ready(self):
+        """Check if enough empty samples have been collected to make decisions"""
+        with self.lock:
+            return len(self.samples) >= self.min_samples
+
+    def compare(self, frame):
+        """Compare a frame to the empty baseline and return similarity scores"""
+        color, gray, hist = self._prepare(frame)
+
+        with self.lock:
+            if len(self.samples) < self.min_samples:
+                return None
+            background = self.background
+            background_color = self.background_color
+            background_hist = self.background_hist
+
+        # Match overall brightness to the baseline so global lighting changes are ignored
+        gray_mean = float(gray.mean())
+        if gray_mean > 0:
+            gain = float(background.mean()) / gray_mean
+            gray = cv2.convertScaleAbs(gray, alpha=gain)
+            color = cv2.convertScaleAbs(color, alpha=gain)
+
+        ssim_map = self._ssim(gray, background)
+        # Largest per-channel change, lightly blurred so sensor noise on single pixels doesn't count
+        diff = cv2.absdiff(cv2.GaussianBlur(color, (3, 3), 0), cv2.GaussianBlur(background_color, (3, 3), 0))
+        diff = diff.max(axis=2)
+        return {
+            'ssim': float(ssim_map.mean()),
+            'ssim_p1': float(np.percentile(ssim_map, 1)),
+            'changed_fraction': float(np.count_nonzero(diff > self.diff_threshold)) / diff.size,
+            'hist_correlation': float(cv2.compareHist(hist, background_hist, cv2.HISTCMP_CORREL))
+        }
+
+    def check(self, frame):
+        """Decide whether the plate is empty; returns (is_empty, scores)"""
+        scores = self.compare(frame)
+        if scores is None:
+            with self.lock:
+                self.stats['checks'] += 1
+                self.stats['escalated'] += 1
+            return False, None
+
+        is_empty = (scores['ssim'] >= self.ssim_threshold and
+                    scores['hist_correlation'] >= self.hist_threshold and
+                    scores['ssim_p1'] >= self.local_ssim_threshold and
+                    scores['changed_fraction'] <= self.max_changed_fraction)
+
+        # Checks run on several classification workers at once
+        with self.lock:
+            self.stats['checks'] += 1
+            self.stats['local_empty' if is_empty else 'escalated'] += 1
+
+        return is_empty, scores
+
+    def get_stats(self):
+        """Get model statistics for the status endpoint"""
+        with self.lock:
+            sample_count = len(self.samples)
+            stats = dict(self.stats)
+        return {
+            **stats,
+            'samples': sample_count,
+            'ready': sample_count >= self.min_samples
+        }
@@ -0,0 +1,103 @@
+"""
+Push event stream
+Sequence-numbered events (classification results, plate state, navigation)
+served as Server-Sent Events, with a short history so clients can resume from
+the last sequence number they saw.
+"""
+
+import json
+import threading
+import time
+from collections import deque
+
+
+class EventStream:
+    def __init__(self, history=256, heartbeat_interval=15.0):
+        """Initialize the stream with a bounded replay history"""
+        self.history = deque(maxlen=history)
+        self.heartbeat_interval = heartbeat_interval
+        self.sequence = 0
+        self.condition = threading.Condition()
+        self.subscribers = 0
+
+    def publish(self, event_type, data):
+        """Publish an event to all subscribers; returns its sequence number"""
+        with self.condition:
+            self.sequence += 1
+            self.history.append({
+                'seq': self.sequence,
+                'type': event_type,
+                'timestamp': time.time(),
+                'data': data
+            })
+            self.condition.notify_all()
+            return self.sequence
+
+    def publish_classification(self, result):
+        """Publish a classification result; tentative ones (nothing was sorted on them)
+        go out as 'classification_tentative' so clients don't count them"""
+        event_type = 'classification_tentative' if result.get('tentative') else 'classification'
+        return self.publish(event_type, result)
+
+    def events_since(self, since):
+        """Get buffered events newer than a sequence number
+
+        Returns (events, complete) where complete is False when events after since
+        were already evicted from the history, or since is ahead of this server (it
+        restarted), and the client must resync from /status.
+        """
+        with self.condition:
+            if since > self.sequence:
+                return list(self.history), False
+            events = [event for event in self.history if event['seq'] > since]
+            complete = not events or events[0]['seq'] == since + 1
+            return events, complete
+
+    def wait_for_events(self, since, timeout):
+        """Block until an event newer than since is published or the timeout expires"""
+        with self.condition:
+            self.condition.wait_for(lambda: self.sequence > since, timeout=timeout)
+            return self.sequence
+
+    def format_sse(self, event):
+        """Format an event as a Server-Sent Events message"""
+        payload = json.dumps({**event['data'], 'seq': event['seq'], 'timestamp': event['timestamp']})
+        return f"id: {event['seq']}\nevent: {event['type']}\ndata: {payload}\n\n"
+
+    def stream(self, since=0, is_active=lambda: True):
+        """Generate SSE messages starting after the given sequence number"""
+        with self.condition:
+            self.subscribers += 1
+        try:
+            # Tell the browser how quickly to reconnect after a dropped connection
+            yield "retry: 1000\n\n"
+
+            last_seq = since
+            while is_active():
+                events, complete = self.events_since(last_seq)
+                if not complete:
+                    # Missed events are gone; replay what is still buffered after the resync marker
+                    current_seq = self.sequence
+                    yield f"event: resync\ndata: {json.dumps({'seq': current_seq})}\n\n"
+                    if not events:
+                        last_seq = current_seq
+
+                for event in events:
+                    yield self.format_sse(event)
+                    last_seq = event['seq']
+
+                if not events and self.wait_for_events(last_seq, self.heartbeat_interval) <= last_seq:
+                    # Comment line keeps proxies and the browser from timing out an idle stream
+                    yield ": heartbeat\n\n"
+        finally:
+            with self.condition:
+                self.subscribers -= 1
+
+    def get_stats(self):
+        """Get stream statistics for the status endpoint"""
+        with self.condition:
+            return {
+                'sequence': self.sequence,
+                'buffered': len(self.history),
+                'subscribers': self.subscribers
+            }
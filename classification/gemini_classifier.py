@@ -0,0 +1,71 @@
+"""
+Gemini classification call
+The material prompt and the schema-constrained model call shared by the live
+classifier and the batch CLI. Callers configure the genai API key.
+"""
+
+import os
+
+import google.generativeai as genai
+
+from structured_labels import StructuredLabeler, StubModel, response_schema
+
+MODEL_NAME = 'gemini-2.5-flash'
+VALID_CATEGORIES = ['can', 'plastic', 'paper', 'other', 'no_object']
+
+CLASSIFICATION_PROMPT = """You are a visual classification system.
+
+If there is a motion detection, then analyze the image and determine whether there is a physical object resting on the brown plate.
+
+The brown plate is the background and must NEVER be classified.
+
+Always determine if the plate is completely empty.
+
+If the plate is completely empty, no motion detection, and no physical object is resting on it, return exactly: no_object
+
+If motion detection took place, then analyze the image and determine if there is a physical object resting on the brown plate.
+
+Ignore:
+The brown plate
+The brown plate is not the object and should not be classified
+The brown plate is the background
+Shadows
+Reflections
+Printed images
+Logos or labels
+Designs on the plate
+if there is nothing on the plate, the place is empty and should be classified as no_object.
+Classify only real, physical objects based on material and structure.
+
+Allowed categories:
+-no_object : plate is completely empty
+-can: aluminum or metal beverage can (even crushed)
+-plastic: plastic bottle or rigid plastic container, a crushed water bottle, or any object made primarily of plastic
+-paper: paper, newspaper, napkin
+- other: any object not listed above (food, fabric, electronics, etc.)
+
+Output:
+-label: exactly one of the categories above
+-confidence: how certain you are of the label, from 0.0 to 1.0"""
+
+
+def generate_classification(image_bytes):
+    """Send JPEG bytes with the classification prompt; returns the JSON response text"""
+    model = genai.GenerativeModel(MODEL_NAME, generation_config=genai.GenerationConfig(
+        response_mime_type='application/json',
+        response_schema=response_schema(VALID_CATEGORIES)
+    ))
+    image_part = {
+        "mime_type": "image/jpeg",
+        "data": image_bytes
+    }
+    response = model.generate_content([CLASSIFICATION_PROMPT, image_part])
+    return response.text
+
+
+def make_labeler(generate=None, min_confidence=0.6, max_attempts=2):
+    """Labeler over generate (default generate_classification), or over StubModel when CLASSIFIER_STUB is set"""
+    if os.getenv("CLASSIFIER_STUB"):
+        print("🧪 CLASSIFIER_STUB set - using the offline stub model")
+        generate = StubModel(VALID_CATEGORIES)
+    return StructuredLabeler(generate or generate_classification, VALID_CATEGORIES, min_confidence, max_attempts)
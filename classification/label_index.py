@@ -0,0 +1,176 @@
+"""
+Nearest-neighbour label index
+Stores cheap colour/structure embeddings of plate frames that Gemini has
+already labelled in a compact NumPy matrix, answers new items locally when
+their nearest neighbours agree, and persists the index to disk.
+"""
+
+import os
+import threading
+from collections import Counter
+
+import cv2
+import numpy as np
+
+DEFAULT_INDEX_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'label_index.npz')
+
+
+class LabelIndex:
+    def __init__(self, path=None, roi=None, k=5, min_votes=4, min_margin=3, max_distance=0.15,
+                 capacity=5000, save_every=10):
+        """Initialize the index; path defaults to LABEL_INDEX_PATH, roi is the plate (x, y, w, h) or None"""
+        self.path = path or os.getenv("LABEL_INDEX_PATH", DEFAULT_INDEX_PATH)
+        self.roi = roi
+        self.k = k
+        self.min_votes = min_votes
+        self.min_margin = min_margin
+        self.max_distance = max_distance
+        self.capacity = capacity
+        self.save_every = save_every
+
+        # Fixed-size matrix used as a ring: once full, the oldest entries are overwritten
+        self.dimensions = 16 * 8 + 16 * 16
+        self.features = np.zeros((capacity, self.dimensions), dtype=np.float32)
+        self.labels = np.empty(capacity, dtype=object)
+        self.count = 0
+        self.next_index = 0
+        self.unsaved = 0
+        self.lock = threading.Lock()
+
+        self.stats = {
+            'lookups': 0,
+            'hits': 0,
+            'misses': 0,
+            'inserts': 0,
+            'saves': 0
+        }
+        self.load()
+
+    def embed(self, frame):
+        """Embed the plate ROI as a unit vector: H-S histogram plus a coarse gradient map"""
+        if self.roi is not None:
+            x, y, w, h = self.roi
+            frame = frame[y:y + h, x:x + w]
+        small = cv2.resize(frame, (64, 48), interpolation=cv2.INTER_AREA)
+
+        hsv = cv2.cvtColor(small, cv2.COLOR_BGR2HSV)
+        hist = cv2.calcHist([hsv], [0, 1], None, [16, 8], [0, 180, 0, 256]).ravel()
+        hist /= np.linalg.norm(hist) + 1e-6
+
+        # Gradient magnitude captures shape and edges while ignoring overall brightness
+        gray = cv2.cvtColor(small, cv2.COLOR_BGR2GRAY).astype(np.float32)
+        gradient = cv2.magnitude(cv2.Sobel(gray, cv2.CV_32F, 1, 0), cv2.Sobel(gray, cv2.CV_32F, 0, 1))
+        gradient = cv2.resize(gradient, (16, 16), interpolation=cv2.INTER_AREA).ravel()
+        gradient /= np.linalg.norm(gradient) + 1e-6
+
+        embedding = np.concatenate([hist, gradient])
+        return embedding / np.sqrt(2.0)
+
+    def query(self, embedding):
+        """Vote among the k nearest neighbours; returns (label or None, info)"""
+        with self.lock:
+            self.stats['lookups'] += 1
+            count = self.count
+            if count < self.k:
+                self.stats['misses'] += 1
+                return None, {'neighbors': 0, 'index_size': count}
+
+            # Cosine distance against every stored embedding in one matrix product
+            distances = 1.0 - self.features[:count] @ embedding
+            nearest = np.argpartition(distances, self.k - 1)[:self.k]
+            nearest = nearest[np.argsort(distances[nearest])]
+            close = [i for i in nearest if distances[i] <= self.max_distance]
+            votes = Counter(self.labels[i] for i in close).most_common()
+
+            top_label, top_votes = votes[0] if votes else (None, 0)
+            runner_up = votes[1][1] if len(votes) > 1 else 0
+            info = {
+                'neighbors': len(close),
+                'votes': dict(votes),
+                'nearest_distance': round(float(distances[nearest[0]]), 4),
+                'index_size': count
+            }
+
+            if top_votes >= self.min_votes and top_votes - runner_up >= self.min_margin:
+                self.stats['hits'] += 1
+                return top_label, info
+            self.stats['misses'] += 1
+            return None, info
+
+    def add(self, embedding, label):
+        """Insert a labelled embedding, saving to disk every save_every inserts"""
+        with self.lock:
+            self.features[self.next_index] = embedding
+            self.labels[self.next_index] = label
+            self.next_index = (self.next_index + 1) % self.capacity
+            self.count = min(self.count + 1, self.capacity)
+            self.stats['inserts'] += 1
+            self.unsaved += 1
+            should_save = self.unsaved >= self.save_every
+
+        if should_save:
+            self.save()
+
+    def save(self):
+        """Write the index to disk atomically"""
+        with self.lock:
+            if self.unsaved == 0:
+                return
+            count = self.count
+            # Store in insertion order so a reload with a different capacity keeps the newest entries
+            order = np.roll(np.arange(count), -self.next_index) if count == self.capacity else np.arange(count)
+            features = self.features[order].copy()
+            labels = self.labels[order].astype(str)
+            self.unsaved = 0
+
+        temp_path = self.path + '.tmp.npz'
+        try:
+            # The ROI is stored so a reader cropping differently can refuse the embeddings
+            roi = np.array(self.roi if self.roi else [], dtype=np.int64)
+            np.savez_compressed(temp_path, features=features, labels=labels, roi=roi)
+            os.replace(temp_path, self.path)
+            self.stats['saves'] += 1
+        except OSError as e:
+            print(f"⚠️ Could not save label index: {e}")
+
+    def load(self):
+        """Load a previously saved index, keeping the newest entries that fit"""
+        if not os.path.exists(self.path):
+            return
+        try:
+            with np.load(self.path) as data:
+                features = data['features'][-self.capacity:]
+                labels = data['labels'][-self.capacity:]
+                stored_roi = tuple(int(v) for v in data['roi']) if 'roi' in data.files else None
+                legacy = 'roi' not in data.files  # Saved before the ROI was recorded: taken as it is
+        except (OSError, KeyError, ValueError) as e:
+            print(f"⚠️ Could not load label index: {e}")
+            return
+
+        roi = tuple(self.roi) if self.roi else ()
+        if not legacy and stored_roi != roi:
+            print(f"⚠️ Label index was built for plate ROI {stored_roi or None}, not {roi or None} - "
+                  f"starting fresh")
+            return
+
+        if features.ndim != 2 or features.shape[1] != self.dimensions:
+            print("⚠️ Label index has a different embedding layout - starting fresh")
+            return
+
+        with self.lock:
+            count = len(features)
+            self.features[:count] = features
+            self.labels[:count] = labels.tolist()
+            self.count = count
+            self.next_index = count % self.capacity
+        print(f"📚 Label index loaded: {count} labelled frames")
+
+    def get_stats(self):
+        """Get index statistics for the status endpoint"""
+        with self.lock:
+            labels = Counter(self.labels[i] for i in range(self.count))
+            return {
+                **self.stats,
+                'size': self.count,
+                'labels': dict(labels)
+            }
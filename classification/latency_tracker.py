@@ -0,0 +1,159 @@
+"""
+Per-item latency tracking
+Stamps each item with wall-clock marks as it moves from capture to robot
+reset, aggregates the time between marks into per-stage histograms, and
+appends one JSON line per finished item to a trace log.
+"""
+
+import itertools
+import json
+import os
+import threading
+import time
+from collections import deque
+
+DEFAULT_TRACE_LOG = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'item_traces.jsonl')
+
+# Stage order through the sorting pipeline; each stage is timed from the previous mark
+STAGES = ['capture', 'motion_trigger', 'frame_selected', 'encoded', 'rate_limited',
+          'model_response', 'robot_move', 'robot_reset']
+
+# Histogram bucket upper bounds in milliseconds
+BUCKETS_MS = [10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000, float('inf')]
+
+
+class ItemTrace:
+    def __init__(self, tracker, item_id):
+        """Trace of one item; marks are (stage, timestamp) in the order they happened"""
+        self.tracker = tracker
+        self.item_id = item_id
+        self.marks = []
+        self.attachments = {}  # Data kept with the item until it finishes (frame, result)
+        self.finished = False
+
+    def mark(self, stage, timestamp=None):
+        """Stamp a stage with the current time (or a timestamp taken earlier)"""
+        self.marks.append((stage, time.time() if timestamp is None else timestamp))
+
+    def attach(self, **items):
+        """Keep data with the trace for the tracker's finish callback"""
+        self.attachments.update(items)
+
+    def durations(self):
+        """Seconds spent reaching each mark from the previous one"""
+        return {stage: timestamp - self.marks[i - 1][1]
+                for i, (stage, timestamp) in enumerate(self.marks) if i > 0}
+
+    def finish(self, outcome):
+        """Close the trace and hand it to the tracker; later calls are ignored"""
+        if self.finished:
+            return
+        self.finished = True
+        self.tracker.record(self, outcome)
+
+
+class LatencyTracker:
+    def __init__(self, trace_log=None, history=200, on_finish=None):
+        """Initialize the tracker; trace_log defaults to ITEM_TRACE_LOG, '' disables the log file
+
+        on_finish(trace, entry) is called after each trace is recorded.
+        """
+        self.trace_log = trace_log if trace_log is not None else os.getenv("ITEM_TRACE_LOG", DEFAULT_TRACE_LOG)
+        self.on_finish = on_finish
+        self.ids = itertools.count(1)
+        self.lock = threading.Lock()
+
+        self.histograms = {}
+        self.samples = {}  # Recent durations per stage for percentiles
+        self.history = history
+        self.recent = deque(maxlen=20)
+        self.stats = {
+            'started': 0,
+            'finished': 0
+        }
+
+    def start(self):
+        """Begin tracing a new item"""
+        with self.lock:
+            self.stats['started'] += 1
+        return ItemTrace(self, next(self.ids))
+
+    def record(self, trace, outcome):
+        """Aggregate a finished trace into the histograms and append it to the trace log"""
+        durations = trace.durations()
+        total = trace.marks[-1][1] - trace.marks[0][1] if len(trace.marks) > 1 else 0.0
+        durations_ms = {stage: seconds * 1000 for stage, seconds in durations.items()}
+        durations_ms['total'] = total * 1000
+
+        entry = {
+            'item': trace.item_id,
+            'outcome': outcome,
+            'started_at': trace.marks[0][1] if trace.marks else None,
+            'marks': [stage for stage, _ in trace.marks],
+            'stages_ms': {stage: round(ms, 1) for stage, ms in durations_ms.items()}
+        }
+
+        with self.lock:
+            self.stats['finished'] += 1
+            for stage, ms in durations_ms.items():
+                histogram = self.histograms.setdefault(stage, {'count': 0, 'sum_ms': 0.0, 'buckets': [0] * len(BUCKETS_MS)})
+                histogram['count'] += 1
+                histogram['sum_ms'] += ms
+                histogram['buckets'][next(i for i, bound in enumerate(BUCKETS_MS) if ms <= bound)] += 1
+                self.samples.setdefault(stage, deque(maxlen=self.history)).append(ms)
+            self.recent.append(entry)
+
+            if self.trace_log:
+                try:
+                    with open(self.trace_log, 'a') as f:
+                        f.write(json.dumps(entry) + '\n')
+                except OSError as e:
+                    print(f"⚠️ Could not write item trace: {e}")
+
+        if self.on_finish:
+            self.on_finish(trace, entry)
+
+    def _percentile(self, values, fraction):
+        """Nearest-rank percentile of a list of values"""
+        ordered = sorted(values)
+        return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+    def get_summary(self):
+        """Per-stage count, mean, p50 and p95 in milliseconds"""
+        with self.lock:
+            summary = {}
+            for stage in STAGES + ['total']:
+                if stage not in self.histograms:
+                    continue
+                histogram = self.histograms[stage]
+                samples = list(self.samples[stage])
+                summary[stage] = {
+                    'count': histogram['count'],
+                    'avg_ms': round(histogram['sum_ms'] / histogram['count'], 1),
+                    'p50_ms': round(self._percentile(samples, 0.5), 1),
+                    'p95_ms': round(self._percentile(samples, 0.95), 1)
+                }
+            return summary
+
+    def get_metrics(self):
+        """Full histograms, summary and the most recent traces"""
+        with self.lock:
+            histograms = {
+                stage: {
+                    'count': histogram['count'],
+                    'sum_ms': round(histogram['sum_ms'], 1),
+                    'buckets': {('+Inf' if bound == float('inf') else str(bound)): count
+                                for bound, count in zip(BUCKETS_MS, histogram['buckets'])}
+                }
+                for stage, histogram in self.histograms.items()
+            }
+            recent = list(self.recent)
+            stats = dict(self.stats)
+
+        return {
+            **stats,
+            'stages': STAGES,
+            'summary': self.get_summary(),
+            'histograms': histograms,
+            'recent_traces': recent
+        }
@@ -0,0 +1,164 @@
+"""
+Adaptive motion thresholds
+Learns what an idle plate looks like to the motion detector - the largest
+foreground contour and the foreground ratio of frames with nothing happening,
+plus the contour areas of triggers that turned out to be an empty plate - and
+sets the contour-area trigger so only a target fraction of idle frames would
+fire. The background subtractor's variance threshold follows the idle
+foreground ratio, so flicker and shadows stop reaching the contour stage.
+
+Only frames well below the current trigger are sampled, samples expire after
+max_age, and the tail quantile always leaves min_tail samples above it, so a
+single outlier or an item resting on the plate can't ratchet the trigger up.
+Triggers that found an empty plate are kept apart from the idle noise and can
+raise the trigger by at most false_trigger_cap.
+"""
+
+import time
+from collections import deque
+
+
+class AdaptiveMotionThreshold:
+    def __init__(self, base_area=5000, min_area=1500, max_area=40000, target_false_rate=0.001, margin=2.0,
+                 window=1500, min_samples=150, min_tail=5, sample_below=0.6, max_age=900.0,
+                 min_false_triggers=3, false_trigger_cap=1.5, var_threshold=50, var_range=(16, 120),
+                 fg_ratio_range=(0.002, 0.02), adjust_every=5.0):
+        """Initialize the thresholds
+
+        base_area is the fixed threshold used until enough idle frames are seen
+        (and the reference for counting avoided calls); target_false_rate is the
+        fraction of idle frames allowed above the learned threshold, before the
+        safety margin is applied. margin * sample_below must stay above 1, or
+        the trigger would keep shrinking below the noise it can still sample.
+        """
+        self.base_area = base_area
+        self.min_area = min_area
+        self.max_area = max_area
+        self.target_false_rate = target_false_rate
+        self.margin = margin
+        self.min_samples = min_samples
+        self.min_tail = min_tail
+        self.sample_below = sample_below
+        self.max_age = max_age
+        self.min_false_triggers = min_false_triggers
+        self.false_trigger_cap = false_trigger_cap
+        self.var_range = var_range
+        self.fg_ratio_range = fg_ratio_range
+        self.adjust_every = adjust_every
+
+        self.area_threshold = base_area
+        self.var_threshold = var_threshold
+        self.areas = deque(maxlen=window)  # (time, largest contour area) of idle frames
+        self.fg_ratios = deque(maxlen=window)  # (time, foreground ratio) of idle frames
+        self.false_areas = deque(maxlen=20)  # (time, contour area) of triggers that found an empty plate
+        self.now = None
+        self.last_adjust = None
+        self.base_active = False  # Inside an episode that the fixed threshold would trigger on
+
+        self.stats = {
+            'idle_samples': 0,
+            'false_triggers': 0,
+            'api_calls_avoided': 0,
+            'extra_triggers': 0,
+            'adjustments': 0
+        }
+
+    def observe(self, max_area, fg_ratio, idle, ready, now=None):
+        """Feed one analyzed frame; returns True if it counts as motion
+
+        idle means nothing is on the way on or off the plate (no classification
+        or sort running); ready means a trigger now would start a classification.
+        """
+        now = time.monotonic() if now is None else now
+        self.now = now
+        motion = max_area > self.area_threshold
+        base_motion = max_area > self.base_area
+
+        if ready:
+            # Count motion episodes where the fixed threshold and the learned one disagree
+            if base_motion and not self.base_active:
+                if not motion:
+                    self.stats['api_calls_avoided'] += 1
+            elif motion and not base_motion:
+                self.stats['extra_triggers'] += 1
+        self.base_active = base_motion
+
+        # Frames near the trigger may be an item sitting still, not noise
+        if idle and max_area < self.sample_below * self.area_threshold:
+            self.areas.append((now, max_area))
+            self.fg_ratios.append((now, fg_ratio))
+            self.stats['idle_samples'] += 1
+
+        if self.last_adjust is None:
+            self.last_adjust = now
+        elif now - self.last_adjust >= self.adjust_every:
+            self.last_adjust = now
+            self.adjust()
+        return motion
+
+    def record_false_trigger(self, area):
+        """A trigger at this contour area found an empty plate"""
+        self.stats['false_triggers'] += 1
+        if area is not None:
+            self.false_areas.append((time.monotonic() if self.now is None else self.now, area))
+
+    def _quantile(self, values, fraction):
+        """Nearest-rank quantile"""
+        ordered = sorted(values)
+        return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+    def _expire(self, samples, now):
+        """Drop samples older than max_age"""
+        while samples and now - samples[0][0] > self.max_age:
+            samples.popleft()
+
+    def adjust(self):
+        """Recompute the thresholds from the idle statistics; returns True if they changed"""
+        if self.now is not None:
+            for samples in (self.areas, self.fg_ratios, self.false_areas):
+                self._expire(samples, self.now)
+        if len(self.areas) < self.min_samples:
+            return False
+
+        # Leave at least min_tail samples above the quantile, so one outlier doesn't set it
+        tail = max(self.target_false_rate, self.min_tail / len(self.areas))
+        noise_area = self._quantile([area for _, area in self.areas], 1 - tail)
+        area_threshold = noise_area * self.margin
+
+        # Repeated empty-plate triggers may lift the trigger over them, but only so far
+        if len(self.false_areas) >= self.min_false_triggers:
+            false_area = sorted(area for _, area in self.false_areas)[-self.min_false_triggers]
+            area_threshold = max(area_threshold, min(false_area * 1.1, area_threshold * self.false_trigger_cap))
+        area_threshold = int(min(self.max_area, max(self.min_area, area_threshold)))
+
+        # Step the subtractor's sensitivity toward the idle foreground ratio band
+        noise_ratio = self._quantile([ratio for _, ratio in self.fg_ratios], 0.95) if self.fg_ratios else 0.0
+        low_ratio, high_ratio = self.fg_ratio_range
+        var_threshold = self.var_threshold
+        if noise_ratio > high_ratio:
+            var_threshold = min(self.var_range[1], var_threshold * 1.25)
+        elif noise_ratio < low_ratio:
+            var_threshold = max(self.var_range[0], var_threshold * 0.9)
+
+        changed = abs(area_threshold - self.area_threshold) > 0.1 * self.area_threshold or \
+            round(var_threshold) != round(self.var_threshold)
+        if changed:
+            print(f"🎚️ Motion threshold {self.area_threshold} → {area_threshold} px, "
+                  f"variance {self.var_threshold:.0f} → {var_threshold:.0f} "
+                  f"({self.stats['api_calls_avoided']} API calls avoided so far)")
+            self.area_threshold = area_threshold
+            self.var_threshold = var_threshold
+            self.stats['adjustments'] += 1
+        return changed
+
+    def get_stats(self):
+        """Current thresholds and counters"""
+        return {
+            **self.stats,
+            'area_threshold': self.area_threshold,
+            'base_area': self.base_area,
+            'var_threshold': round(self.var_threshold, 1),
+            'idle_p99_area': round(self._quantile([area for _, area in self.areas], 0.99)) if self.areas else None,
+            'idle_p95_fg_ratio': round(self._quantile([ratio for _, ratio in self.fg_ratios], 0.95), 4)
+            if self.fg_ratios else None
+        }
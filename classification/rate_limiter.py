@@ -0,0 +1,67 @@
+"""
+Upstream rate limiter
+Token bucket shared by every bin in the process, so the combined Gemini call
+rate stays under the account quota however many bins are classifying.
+"""
+
+import os
+import threading
+import time
+
+
+class RateLimiter:
+    def __init__(self, rate_per_minute=None, burst=None):
+        """Initialize the bucket; rate_per_minute defaults to GEMINI_RATE_LIMIT (30), burst to a tenth of it"""
+        if rate_per_minute is None:
+            rate_per_minute = float(os.getenv("GEMINI_RATE_LIMIT", "30"))
+        self.rate = rate_per_minute / 60.0  # Tokens per second
+        self.capacity = burst if burst is not None else max(1, int(rate_per_minute // 10))
+        self.tokens = float(self.capacity)
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+        self.stats = {
+            'granted': 0,
+            'denied': 0,
+            'waited_ms': 0.0
+        }
+
+    def _refill(self, now):
+        """Add the tokens earned since the last update"""
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def acquire(self, timeout=None):
+        """Take one token, waiting up to timeout seconds (None waits indefinitely); returns True if granted"""
+        start = time.monotonic()
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                self._refill(now)
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    self.stats['granted'] += 1
+                    self.stats['waited_ms'] += (now - start) * 1000
+                    return True
+                wait = (1 - self.tokens) / self.rate if self.rate > 0 else 0.5
+                if timeout is not None:
+                    remaining = start + timeout - now
+                    if remaining <= 0:
+                        self.stats['denied'] += 1
+                        return False
+                    wait = min(wait, remaining)
+            time.sleep(min(wait, 0.5))
+
+    def get_stats(self):
+        """Get grant counts and the current bucket level"""
+        with self.lock:
+            self._refill(time.monotonic())
+            granted = self.stats['granted']
+            return {
+                **self.stats,
+                'waited_ms': round(self.stats['waited_ms'], 1),
+                'avg_wait_ms': round(self.stats['waited_ms'] / granted, 1) if granted else 0,
+                'rate_per_minute': round(self.rate * 60, 1),
+                'burst': self.capacity,
+                'tokens': round(self.tokens, 2)
+            }
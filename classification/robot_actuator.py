@@ -0,0 +1,303 @@
+"""
+Robot actuation scheduler
+Runs robot moves on a dedicated worker thread fed by a command queue, so the
+classification pipeline never blocks on HTTP calls or motor motion.
+"""
+
+import math
+import queue
+import threading
+import time
+from collections import deque
+
+# Motion parameters mirrored from code.ino
+LIMIT = 200       # Step clamp applied by differentialMove
+SPEED_HZ = 1000   # Max stepper speed (steps/s)
+ACCEL = 1000      # Stepper acceleration (steps/s^2)
+
+
+def motor_targets(spin, pivot):
+    """Compute the clamped motor A/B targets the firmware will move to"""
+    a_target = max(-LIMIT, min(LIMIT, spin + pivot))
+    b_target = max(-LIMIT, min(LIMIT, spin - pivot))
+    return a_target, b_target
+
+
+def travel_time(steps):
+    """Time for a trapezoidal (or triangular) move of the given number of steps"""
+    steps = abs(steps)
+    if steps == 0:
+        return 0.0
+
+    # Distance needed to accelerate up to full speed
+    accel_steps = SPEED_HZ * SPEED_HZ / (2 * ACCEL)
+    if steps <= 2 * accel_steps:
+        # Never reaches full speed: accelerate then decelerate
+        return 2 * math.sqrt(steps / ACCEL)
+    return 2 * SPEED_HZ / ACCEL + (steps - 2 * accel_steps) / SPEED_HZ
+
+
+def estimate_motion_time(from_position, to_position):
+    """Estimate how long both motors take to go between two (spin, pivot) positions"""
+    from_a, from_b = motor_targets(*from_position)
+    to_a, to_b = motor_targets(*to_position)
+    return max(travel_time(to_a - from_a), travel_time(to_b - from_b))
+
+
+class RobotActuator:
+    def __init__(self, send_command, send_sequence=None, max_pending=4, dwell_time=0.5,
+                 settle_time=0.3, motion_margin=0.2, on_busy=None, on_idle=None,
+                 confirm_move=None, confirm_timeout=2.0):
+        """Initialize the actuator
+
+        send_command(spin, pivot) must return True on success. The optional
+        send_sequence(spin, pivot, dwell) runs a whole move/dwell/return on the robot
+        and returns a dict with success, request_time and motion_time, or None if the
+        robot cannot run sequences. The optional confirm_move(max_wait) waits until
+        the robot reports a sent move finished and returns True, False if it was
+        dropped or didn't finish, or None if the robot cannot report its state.
+        """
+        self.send_command = send_command
+        self.send_sequence = send_sequence
+        self.confirm_move = confirm_move
+        self.confirm_timeout = confirm_timeout  # Slack on top of the estimate before a move counts as lost
+        self.dwell_time = dwell_time        # Hold at the bin so the item can drop
+        self.settle_time = settle_time      # Let the plate stop shaking after reset
+        self.motion_margin = motion_margin  # Extra slack on top of the motion estimate
+        self.on_busy = on_busy
+        self.on_idle = on_idle
+
+        self.command_queue = queue.Queue(maxsize=max_pending)
+        self.position = (0, 0)
+        self.busy = False
+        self.running = False
+        self.worker_thread = None
+        self.stop_event = None  # Each worker gets its own, so a stopped worker can't be revived
+        self.restart_timeout = 15.0  # Longest start() waits for a stopped worker's last sort
+        self.lock = threading.Lock()
+
+        # Per-sort phase timings, most recent last
+        self.timings = deque(maxlen=50)
+        self.stats = {
+            'enqueued': 0,
+            'completed': 0,
+            'failed': 0,
+            'dropped': 0,
+            'cancelled': 0
+        }
+
+    def start(self):
+        """Start the actuation worker thread; returns False if a stopped worker is still mid-sort"""
+        if self.running:
+            return True
+        if self.worker_thread and self.worker_thread.is_alive():
+            # Two workers must never drive the arm: let the old one finish its sort first
+            self.worker_thread.join(timeout=self.restart_timeout)
+            if self.worker_thread.is_alive():
+                print("⚠️ Previous robot worker is still finishing a sort - not starting another")
+                return False
+        self.running = True
+        self.stop_event = threading.Event()
+        self.worker_thread = threading.Thread(target=self._worker_loop, args=(self.stop_event,), daemon=True)
+        self.worker_thread.start()
+        print("🤖 Robot actuation worker started")
+        return True
+
+    def stop(self, timeout=5.0):
+        """Stop the worker after the current command finishes and cancel queued sorts"""
+        self.running = False
+        if self.stop_event:
+            self.stop_event.set()
+        if self.worker_thread:
+            self.worker_thread.join(timeout=timeout)
+        cancelled = self._cancel_pending()
+        if cancelled:
+            print(f"🤖 Cancelled {cancelled} queued robot sort(s)")
+        print("🤖 Robot actuation worker stopped")
+
+    def _cancel_pending(self):
+        """Drop queued commands, finishing their item traces; returns how many were dropped"""
+        cancelled = 0
+        while True:
+            try:
+                command = self.command_queue.get_nowait()
+            except queue.Empty:
+                break
+            if command.get('trace'):
+                command['trace'].finish('robot_cancelled')
+            self.command_queue.task_done()
+            cancelled += 1
+        self.stats['cancelled'] += cancelled
+        return cancelled
+
+    def enqueue(self, classification, spin, pivot, trace=None):
+        """Queue a sort for the worker; returns False if the queue is full
+
+        An optional item trace gets robot_move / robot_reset marks and is
+        finished when the sort is done.
+        """
+        command = {
+            'classification': classification,
+            'spin': spin,
+            'pivot': pivot,
+            'enqueued_at': time.time(),
+            'trace': trace
+        }
+        try:
+            self.command_queue.put_nowait(command)
+        except queue.Full:
+            self.stats['dropped'] += 1
+            print(f"⚠️ Robot command queue full - dropping {classification}")
+            return False
+
+        self.stats['enqueued'] += 1
+        return True
+
+    def is_busy(self):
+        """Check if the arm is moving or has commands pending"""
+        with self.lock:
+            return self.busy or not self.command_queue.empty()
+
+    def _set_busy(self, busy):
+        """Update busy state and notify the pipeline"""
+        with self.lock:
+            self.busy = busy
+        callback = self.on_busy if busy else self.on_idle
+        if callback:
+            callback()
+
+    def _run_phase(self, spin, pivot):
+        """Send one move and wait for the motors to finish; returns (success, request_s, motion_s)
+
+        With confirm_move the robot's own report ends the wait. Without it (or when
+        the robot has no status endpoint) the wait is open loop: the estimated travel
+        time plus a margin, and a move the firmware silently dropped still counts.
+        """
+        request_start = time.time()
+        success = self.send_command(spin, pivot)
+        request_time = time.time() - request_start
+
+        if not success:
+            return False, request_time, 0.0
+
+        motion_time = estimate_motion_time(self.position, (spin, pivot))
+        if self.confirm_move:
+            motion_start = time.time()
+            confirmed = self.confirm_move(motion_time + self.motion_margin + self.confirm_timeout)
+            if confirmed is not None:
+                if confirmed:
+                    self.position = (spin, pivot)
+                return confirmed, request_time, time.time() - motion_start
+
+        # Open loop: sleep for the estimated trapezoid travel time
+        time.sleep(motion_time + self.motion_margin)
+        self.position = (spin, pivot)
+        return True, request_time, motion_time + self.motion_margin
+
+    def _execute(self, command):
+        """Run the movement and reset phases for one sort"""
+        classification = command['classification']
+        started_at = time.time()
+        timing = {
+            'classification': classification,
+            'queue_wait': started_at - command['enqueued_at']
+        }
+
+        print(f"🤖 Moving robot for {classification}: spin={command['spin']} pivot={command['pivot']}")
+
+        trace = command.get('trace')
+
+        # Single round trip: the robot reports when it is back at neutral
+        if self.send_sequence:
+            sequence = self.send_sequence(command['spin'], command['pivot'], self.dwell_time)
+            if sequence is not None:
+                timing['sequence_request'] = sequence['request_time']
+                timing['sequence_motion'] = sequence['motion_time']
+                if sequence['success']:
+                    if trace:
+                        # The robot only reports completion, so arrival at the bin is estimated
+                        trace.mark('robot_move', started_at + sequence['request_time'] +
+                                   estimate_motion_time(self.position, (command['spin'], command['pivot'])))
+                        trace.mark('robot_reset')
+                    self.position = (0, 0)
+                    time.sleep(self.settle_time)
+                    return self._finish(timing, started_at, True)
+
+                # The arm may have stopped anywhere on the way, so send it back to neutral
+                print(f"⚠️ Robot sort sequence for {classification} failed - resetting to neutral")
+                self.position = (command['spin'], command['pivot'])
+                reset, timing['reset_request'], timing['reset_motion'] = self._run_phase(0, 0)
+                if reset:
+                    time.sleep(self.settle_time)
+                else:
+                    print("⚠️ Robot reset to neutral position failed")
+                return self._finish(timing, started_at, False)
+
+        moved, timing['move_request'], timing['move_motion'] = self._run_phase(command['spin'], command['pivot'])
+        if moved and trace:
+            trace.mark('robot_move')
+
+        if moved:
+            dwell_start = time.time()
+            time.sleep(self.dwell_time)
+            timing['dwell'] = time.time() - dwell_start
+        else:
+            print(f"⚠️ Robot movement for {classification} failed")
+
+        # Always return to neutral, even if the move itself failed
+        reset, timing['reset_request'], timing['reset_motion'] = self._run_phase(0, 0)
+        if reset:
+            if trace:
+                trace.mark('robot_reset')
+            time.sleep(self.settle_time)
+        else:
+            print("⚠️ Robot reset to neutral position failed")
+
+        return self._finish(timing, started_at, moved and reset)
+
+    def _finish(self, timing, started_at, success):
+        """Record the timing of a finished sort"""
+        classification = timing['classification']
+        timing['total'] = time.time() - started_at
+        timing['success'] = success
+        self.timings.append(timing)
+
+        if timing['success']:
+            self.stats['completed'] += 1
+            print(f"🎯 Robot sort for {classification} completed in {timing['total']:.2f}s")
+        else:
+            self.stats['failed'] += 1
+        return timing
+
+    def _worker_loop(self, stop_event):
+        """Consume robot commands until this worker's stop event is set"""
+        while not stop_event.is_set():
+            try:
+                command = self.command_queue.get(timeout=0.2)
+            except queue.Empty:
+                continue
+
+            self._set_busy(True)
+            outcome = 'robot_failed'
+            try:
+                if self._execute(command)['success']:
+                    outcome = 'sorted'
+            except Exception as e:
+                self.stats['failed'] += 1
+                print(f"❌ Robot actuation error: {e}")
+            finally:
+                if command.get('trace'):
+                    command['trace'].finish(outcome)
+                self.command_queue.task_done()
+                if self.command_queue.empty():
+                    self._set_busy(False)
+
+    def get_status(self):
+        """Get actuator state and recent phase timings"""
+        return {
+            'busy': self.is_busy(),
+            'pending': self.command_queue.qsize(),
+            'position': {'spin': self.position[0], 'pivot': self.position[1]},
+            'stats': dict(self.stats),
+            'recent_timings': list(self.timings)[-10:]
+        }
@@ -0,0 +1,195 @@
+"""
+Robot HTTP driver
+Talks to the ESP32 sorter firmware (code.ino) over a persistent keep-alive
+session and retries commands the firmware rejects as "Too fast" (HTTP 429).
+Sorts use the firmware /sort sequence (move, dwell, return) when available, and
+back off and retry while the firmware is still finishing one (409 "Busy").
+Separate /move commands are confirmed by polling /status until the motors stop.
+"""
+
+import os
+import threading
+import time
+
+import requests
+from requests.adapters import HTTPAdapter
+
+DEFAULT_ROBOT_BASE_URL = "http://10.250.167.161"
+
+
+class RobotDriver:
+    def __init__(self, base_url=None, timeout=5.0, max_retries=3, retry_delay=0.025,
+                 busy_retries=5, busy_delay=0.1):
+        """Initialize the driver; base_url defaults to the ROBOT_BASE_URL environment variable"""
+        self.base_url = (base_url or os.getenv("ROBOT_BASE_URL", DEFAULT_ROBOT_BASE_URL)).rstrip('/')
+        self.timeout = timeout
+        self.max_retries = max_retries  # Extra attempts after a 429 response
+        self.retry_delay = retry_delay  # Firmware CMD_INTERVAL_MS is 20ms
+        self.busy_retries = busy_retries  # Extra /sort attempts while a previous sequence runs
+        self.busy_delay = busy_delay  # First backoff after a 409, doubled each time
+
+        # One keep-alive connection is enough: the firmware serves one client at a time
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=1, max_retries=0)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+        self.lock = threading.Lock()
+        self.supports_sequences = None  # Unknown until the first /sort attempt
+        self.supports_status = None  # Unknown until the first /status poll
+
+        self.stats = {
+            'requests': 0,
+            'retries_429': 0,
+            'retries_busy': 0,
+            'failures': 0,
+            'total_latency_ms': 0.0
+        }
+
+    def _get(self, path, params):
+        """Send a GET to the robot, retrying on 429; returns the response or None"""
+        url = f"{self.base_url}{path}"
+
+        with self.lock:
+            for attempt in range(self.max_retries + 1):
+                start_time = time.time()
+                try:
+                    response = self.session.get(url, params=params, timeout=self.timeout)
+                except requests.exceptions.Timeout:
+                    print(f"❌ Robot API call timed out: {url}")
+                    self.stats['failures'] += 1
+                    return None
+                except requests.exceptions.ConnectionError:
+                    print(f"❌ Could not connect to robot API: {url}")
+                    self.stats['failures'] += 1
+                    return None
+                finally:
+                    self.stats['requests'] += 1
+                    self.stats['total_latency_ms'] += (time.time() - start_time) * 1000
+
+                if response.status_code != 429:
+                    return response
+
+                # Firmware rejected the command for arriving inside CMD_INTERVAL_MS
+                self.stats['retries_429'] += 1
+                if attempt < self.max_retries:
+                    time.sleep(self.retry_delay * (attempt + 1))
+
+        print(f"⚠️ Robot kept rejecting commands as too fast: {url}")
+        self.stats['failures'] += 1
+        return None
+
+    def move(self, spin, pivot):
+        """Send a single /move command; returns True when the robot accepted it"""
+        response = self._get('/move', {'spin': spin, 'pivot': pivot})
+        if response is None:
+            return False
+        if response.status_code != 200:
+            print(f"⚠️ Robot API returned status code: {response.status_code}")
+            self.stats['failures'] += 1
+            return False
+        return True
+
+    def get_robot_status(self):
+        """Read the firmware sort state; returns a dict or None"""
+        response = self._get('/status', None)
+        if response is not None and response.status_code == 404:
+            self.supports_status = False
+        if response is None or response.status_code != 200:
+            return None
+        try:
+            status = response.json()
+        except ValueError:
+            return None
+        self.supports_status = True
+        return status
+
+    def wait_for_move(self, max_wait=5.0, poll_interval=0.02):
+        """Poll /status after a /move until the motors stop
+
+        Returns True once the arm is at rest, False when a firmware sort sequence
+        owns the motors (the firmware acknowledges /move but drops it) or the motors
+        don't stop within max_wait, and None when the firmware has no /status to
+        confirm with.
+        """
+        deadline = time.time() + max_wait
+        while self.supports_status is not False:
+            status = self.get_robot_status()
+            if status is not None:
+                if status.get('state', 'idle') != 'idle':
+                    print(f"⚠️ Robot ignored the move: a sort sequence is {status['state']}")
+                    self.stats['failures'] += 1
+                    return False
+                if not status.get('running'):
+                    return True
+            if time.time() >= deadline:
+                print(f"⚠️ Robot did not confirm the move within {max_wait:.1f}s")
+                self.stats['failures'] += 1
+                return False
+            time.sleep(poll_interval)
+
+        return None
+
+    def sort(self, spin, pivot, dwell, poll_interval=0.02, max_wait=10.0):
+        """Run a move/dwell/return sequence in one command and wait until the arm is back
+
+        Returns a dict with success, request_time and motion_time, or None when the
+        firmware has no /sort endpoint and the caller should fall back to two /move calls.
+        """
+        if self.supports_sequences is False:
+            return None
+
+        request_start = time.time()
+        for attempt in range(self.busy_retries + 1):
+            response = self._get('/sort', {'spin': spin, 'pivot': pivot, 'dwell': int(dwell * 1000)})
+            if response is None or response.status_code != 409 or attempt == self.busy_retries:
+                break
+            # The previous sequence is still returning to neutral
+            self.stats['retries_busy'] += 1
+            time.sleep(self.busy_delay * 2 ** attempt)
+        request_time = time.time() - request_start
+
+        if response is None:
+            return {'success': False, 'request_time': request_time, 'motion_time': 0.0}
+        if response.status_code == 404:
+            print("⚠️ Robot firmware has no /sort endpoint - using separate move and reset commands")
+            self.supports_sequences = False
+            return None
+        if response.status_code != 200:
+            print(f"⚠️ Robot sort returned status code: {response.status_code}")
+            self.stats['failures'] += 1
+            return {'success': False, 'request_time': request_time, 'motion_time': 0.0}
+
+        self.supports_sequences = True
+        try:
+            sort_id = int(response.text.strip())
+        except ValueError:
+            print(f"⚠️ Robot sort returned an unexpected body: {response.text[:40]!r}")
+            self.stats['failures'] += 1
+            return {'success': False, 'request_time': request_time, 'motion_time': 0.0}
+
+        # Poll the firmware until it reports this sequence has returned to neutral
+        motion_start = time.time()
+        while time.time() - motion_start < max_wait:
+            status = self.get_robot_status()
+            if status and status.get('completed', 0) >= sort_id:
+                return {'success': True, 'request_time': request_time,
+                        'motion_time': time.time() - motion_start}
+            time.sleep(poll_interval)
+
+        print(f"⚠️ Robot sort {sort_id} did not complete within {max_wait:.0f}s")
+        self.stats['failures'] += 1
+        return {'success': False, 'request_time': request_time, 'motion_time': time.time() - motion_start}
+
+    def close(self):
+        """Close the keep-alive session"""
+        self.session.close()
+
+    def get_stats(self):
+        """Get request statistics for the status endpoint"""
+        requests_sent = self.stats['requests']
+        return {
+            'base_url': self.base_url,
+            'supports_sequences': self.supports_sequences,
+            **self.stats,
+            'avg_latency_ms': self.stats['total_latency_ms'] / requests_sent if requests_sent else 0
+        }
@@ -0,0 +1,283 @@
+#!/usr/bin/env python3
+"""
+Local ESP32 sorter simulator
+Mimics the /move, /sort and /status endpoints of code.ino (CMD_INTERVAL_MS
+rejection, argument checks, clamping, "ignore while running" and the
+move/dwell/return sort sequence) so sort-cycle latency can be measured
+without hardware.
+
+Usage:
+    python robot_simulator.py                  # Serve on http://127.0.0.1:8080
+    python robot_simulator.py --benchmark 10   # Run 10 sort cycles against a local simulator
+    python robot_simulator.py --benchmark 10 --legacy   # Same, with separate /move + reset calls
+"""
+
+import argparse
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+from robot_actuator import motor_targets, travel_time
+
+CMD_INTERVAL_MS = 20
+MAX_DWELL_MS = 5000
+
+
+class SimulatedMotor:
+    def __init__(self):
+        """Initialize a motor resting at position 0"""
+        self.position = 0
+        self.busy_until = 0.0
+
+    def is_running(self, now):
+        """Check if the motor is still travelling to its target"""
+        return now < self.busy_until
+
+    def move_to(self, target, now):
+        """Start a move to an absolute target"""
+        self.busy_until = now + travel_time(target - self.position)
+        self.position = target
+
+
+class RobotSimulator:
+    def __init__(self):
+        """Initialize simulator state mirroring the firmware globals"""
+        self.motor_a = SimulatedMotor()
+        self.motor_b = SimulatedMotor()
+        self.last_cmd_time = None
+        self.lock = threading.Lock()  # The ESP32 WebServer handles one request at a time
+
+        # Sort sequence state machine (updateSortSequence in the firmware)
+        self.sort_state = 'idle'
+        self.sort_dwell = 0.0
+        self.dwell_start_time = 0.0
+        self.last_sort_id = 0
+        self.completed_sort_id = 0
+
+        self.stats = {
+            'accepted': 0,
+            'ignored_while_running': 0,
+            'rejected_too_fast': 0,
+            'bad_request': 0,
+            'sorts_started': 0,
+            'rejected_busy': 0
+        }
+
+    def is_running(self, now=None):
+        """Check if either motor is moving"""
+        now = time.time() if now is None else now
+        return self.motor_a.is_running(now) or self.motor_b.is_running(now)
+
+    def differential_move(self, spin, pivot, now):
+        """Start a differential move unless the motors are still running"""
+        if self.is_running(now):
+            self.stats['ignored_while_running'] += 1
+            return
+
+        a_target, b_target = motor_targets(spin, pivot)
+        self.motor_a.move_to(a_target, now)
+        self.motor_b.move_to(b_target, now)
+        self.stats['accepted'] += 1
+
+    def update_sort_sequence(self, now):
+        """Advance the sort state machine the way loop() would have by now"""
+        if self.sort_state == 'moving':
+            move_end = max(self.motor_a.busy_until, self.motor_b.busy_until)
+            if now >= move_end:
+                self.dwell_start_time = move_end
+                self.sort_state = 'dwell'
+
+        if self.sort_state == 'dwell':
+            dwell_end = self.dwell_start_time + self.sort_dwell
+            if now >= dwell_end:
+                self.differential_move(0, 0, dwell_end)
+                self.sort_state = 'returning'
+
+        if self.sort_state == 'returning' and not self.is_running(now):
+            self.completed_sort_id = self.last_sort_id
+            self.sort_state = 'idle'
+
+    def _accept_command(self, now):
+        """Apply the CMD_INTERVAL_MS rate limit; returns False for spammy commands"""
+        if self.last_cmd_time is not None and (now - self.last_cmd_time) * 1000 < CMD_INTERVAL_MS:
+            self.stats['rejected_too_fast'] += 1
+            return False
+        self.last_cmd_time = now
+        return True
+
+    def handle_move(self, params):
+        """Handle /move and return (status_code, body)"""
+        with self.lock:
+            now = time.time()
+            self.update_sort_sequence(now)
+
+            # Reject spammy commands
+            if not self._accept_command(now):
+                return 429, "Too fast\n"
+
+            if 'spin' not in params or 'pivot' not in params:
+                self.stats['bad_request'] += 1
+                return 400, "Use /move?spin=NUM&pivot=NUM"
+
+            # A running sort sequence owns the motors until it returns to neutral
+            if self.sort_state == 'idle':
+                self.differential_move(to_int(params['spin'][0]), to_int(params['pivot'][0]), now)
+            else:
+                self.stats['ignored_while_running'] += 1
+            return 200, "OK\n"
+
+    def handle_sort(self, params):
+        """Handle /sort and return (status_code, body)"""
+        with self.lock:
+            now = time.time()
+            self.update_sort_sequence(now)
+
+            if not self._accept_command(now):
+                return 429, "Too fast\n"
+
+            if 'spin' not in params or 'pivot' not in params:
+                self.stats['bad_request'] += 1
+                return 400, "Use /sort?spin=NUM&pivot=NUM&dwell=MS"
+
+            if self.sort_state != 'idle' or self.is_running(now):
+                self.stats['rejected_busy'] += 1
+                return 409, "Busy\n"
+
+            dwell_ms = to_int(params['dwell'][0]) if 'dwell' in params else 0
+            self.sort_dwell = max(0, min(MAX_DWELL_MS, dwell_ms)) / 1000
+            self.last_sort_id += 1
+
+            self.differential_move(to_int(params['spin'][0]), to_int(params['pivot'][0]), now)
+            self.sort_state = 'moving'
+            self.stats['sorts_started'] += 1
+            return 200, f"{self.last_sort_id}\n"
+
+    def handle_status(self):
+        """Handle /status and return (status_code, body)"""
+        with self.lock:
+            now = time.time()
+            self.update_sort_sequence(now)
+            return 200, json.dumps({
+                'state': self.sort_state,
+                'active': self.last_sort_id,
+                'completed': self.completed_sort_id,
+                'running': self.is_running(now)
+            })
+
+
+def to_int(value):
+    """Parse an integer the way Arduino String.toInt() does (invalid -> 0)"""
+    try:
+        return int(float(value))
+    except ValueError:
+        return 0
+
+
+def make_handler(simulator):
+    """Build a request handler bound to a simulator instance"""
+    class RobotRequestHandler(BaseHTTPRequestHandler):
+        protocol_version = 'HTTP/1.1'  # Keep-alive, like a pooled client expects
+
+        def do_GET(self):
+            url = urlparse(self.path)
+            content_type = 'text/plain'
+            if url.path == '/move':
+                status, body = simulator.handle_move(parse_qs(url.query))
+            elif url.path == '/sort':
+                status, body = simulator.handle_sort(parse_qs(url.query))
+            elif url.path == '/status':
+                status, body = simulator.handle_status()
+                content_type = 'application/json'
+            else:
+                status, body = 404, "Not found\n"
+
+            payload = body.encode('utf-8')
+            self.send_response(status)
+            self.send_header('Content-Type', content_type)
+            self.send_header('Content-Length', str(len(payload)))
+            self.end_headers()
+            self.wfile.write(payload)
+
+        def log_message(self, format, *args):
+            pass
+
+    return RobotRequestHandler
+
+
+def start_simulator(host='127.0.0.1', port=0):
+    """Start a simulator server in a background thread; returns (server, simulator, base_url)"""
+    simulator = RobotSimulator()
+    server = ThreadingHTTPServer((host, port), make_handler(simulator))
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base_url = f"http://{host}:{server.server_address[1]}"
+    return server, simulator, base_url
+
+
+def run_benchmark(cycles, use_sequences=True):
+    """Run sort cycles through RobotDriver + RobotActuator against a local simulator"""
+    from robot_actuator import RobotActuator
+    from robot_driver import RobotDriver
+
+    server, simulator, base_url = start_simulator()
+    driver = RobotDriver(base_url)
+    actuator = RobotActuator(driver.move, send_sequence=driver.sort if use_sequences else None,
+                             confirm_move=driver.wait_for_move)
+    movements = [('plastic', 65, -40), ('can', 65, 40), ('paper', -65, -40), ('other', -65, 40)]
+
+    mode = "/sort sequences" if use_sequences else "separate /move + reset"
+    print(f"🤖 Benchmarking {cycles} sort cycles ({mode}) against {base_url}")
+    actuator.start()
+    start_time = time.time()
+    for i in range(cycles):
+        classification, spin, pivot = movements[i % len(movements)]
+        while not actuator.enqueue(classification, spin, pivot):
+            time.sleep(0.05)
+    while actuator.is_busy():
+        time.sleep(0.01)
+    elapsed = time.time() - start_time
+    actuator.stop()
+    driver.close()
+    server.shutdown()
+
+    totals = [timing['total'] for timing in actuator.timings]
+    requests_ms = [(timing.get('sequence_request', 0) + timing.get('move_request', 0) +
+                    timing.get('reset_request', 0)) * 1000 for timing in actuator.timings]
+    print("=" * 50)
+    print(f"   Cycles:            {len(totals)}")
+    print(f"   Wall time:         {elapsed:.2f}s")
+    print(f"   Avg sort cycle:    {sum(totals) / len(totals):.3f}s")
+    print(f"   Max sort cycle:    {max(totals):.3f}s")
+    print(f"   Avg command HTTP:  {sum(requests_ms) / len(requests_ms):.1f}ms")
+    print(f"   Driver stats:      {driver.get_stats()}")
+    print(f"   Simulator stats:   {simulator.stats}")
+
+
+def main():
+    """Main function"""
+    parser = argparse.ArgumentParser(description="ESP32 sorter simulator")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8080)
+    parser.add_argument('--benchmark', type=int, metavar='CYCLES',
+                        help='Run sort cycles against an in-process simulator and exit')
+    parser.add_argument('--legacy', action='store_true',
+                        help='Benchmark separate /move + reset commands instead of /sort')
+    args = parser.parse_args()
+
+    if args.benchmark:
+        run_benchmark(args.benchmark, use_sequences=not args.legacy)
+        return
+
+    simulator = RobotSimulator()
+    server = ThreadingHTTPServer((args.host, args.port), make_handler(simulator))
+    print(f"🤖 Robot simulator listening on http://{args.host}:{args.port} (/move, /sort, /status)")
+    print(f"   Set ROBOT_BASE_URL=http://{args.host}:{args.port} to point the classifier at it")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print(f"\n🛑 Simulator stopped - {simulator.stats}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,141 @@
+"""
+Structured classification responses
+Builds the JSON response schema that constrains the model to one allowed
+label plus a confidence, parses and validates the answer without guessing
+from free text, retries unparseable or low-confidence answers, and counts
+every outcome. StubModel stands in for the model offline (CLASSIFIER_STUB=1)
+and cycles through answers that reach every branch.
+
+Used by the camera classifier, the batch CLI and backend/app.py; it has no
+dependencies so each can import it.
+"""
+
+import itertools
+import json
+import threading
+
+# Parse failure kinds, counted separately in the stats
+PARSE_ERRORS = ('invalid_json', 'unknown_label', 'bad_confidence')
+
+
+def response_schema(labels):
+    """JSON schema for {"label": one of labels, "confidence": 0..1}"""
+    return {
+        'type': 'object',
+        'properties': {
+            'label': {'type': 'string', 'enum': list(labels)},
+            'confidence': {'type': 'number'}
+        },
+        'required': ['label', 'confidence']
+    }
+
+
+def parse_label_response(text, labels):
+    """Parse a schema-constrained answer; returns {'label', 'confidence', 'error'} with error None on success"""
+    try:
+        data = json.loads(text)
+    except (TypeError, ValueError):
+        return {'label': None, 'confidence': None, 'error': 'invalid_json'}
+    if not isinstance(data, dict):
+        return {'label': None, 'confidence': None, 'error': 'invalid_json'}
+
+    label = data.get('label')
+    if not isinstance(label, str) or label.strip().lower() not in labels:
+        return {'label': None, 'confidence': None, 'error': 'unknown_label'}
+
+    confidence = data.get('confidence')
+    if isinstance(confidence, bool) or not isinstance(confidence, (int, float)) or not 0 <= confidence <= 1:
+        return {'label': label.strip().lower(), 'confidence': None, 'error': 'bad_confidence'}
+    return {'label': label.strip().lower(), 'confidence': float(confidence), 'error': None}
+
+
+class StructuredLabeler:
+    def __init__(self, generate, labels, min_confidence=0.6, max_attempts=2):
+        """Initialize the labeler; generate(*args) returns the model's response text"""
+        self.generate = generate
+        self.labels = list(labels)
+        self.min_confidence = min_confidence
+        self.max_attempts = max_attempts
+        self.lock = threading.Lock()
+
+        self.stats = {
+            'requests': 0,
+            'model_calls': 0,
+            'accepted': 0,
+            'low_confidence': 0,
+            'unparseable': 0,
+            'retries': 0,
+            'parse_failures': {error: 0 for error in PARSE_ERRORS}
+        }
+
+    def classify(self, *args):
+        """Ask the model up to max_attempts times; returns label, confidence, status and attempts
+
+        status is 'accepted' (confidence at or above min_confidence),
+        'low_confidence' (best parsed answer stayed below it) or 'unparseable'.
+        """
+        best = None
+        text = None
+        attempts = 0
+        for attempts in range(1, self.max_attempts + 1):
+            text = self.generate(*args)
+            parsed = parse_label_response(text, self.labels)
+            with self.lock:
+                self.stats['model_calls'] += 1
+                if attempts > 1:
+                    self.stats['retries'] += 1
+                if parsed['error']:
+                    self.stats['parse_failures'][parsed['error']] += 1
+            if parsed['error']:
+                continue
+            if best is None or parsed['confidence'] > best['confidence']:
+                best = parsed
+            if parsed['confidence'] >= self.min_confidence:
+                break
+
+        if best is None:
+            status = 'unparseable'
+        elif best['confidence'] >= self.min_confidence:
+            status = 'accepted'
+        else:
+            status = 'low_confidence'
+        with self.lock:
+            self.stats['requests'] += 1
+            self.stats[status] += 1
+
+        return {
+            'label': best['label'] if best else None,
+            'confidence': best['confidence'] if best else None,
+            'status': status,
+            'attempts': attempts,
+            'raw_response': text
+        }
+
+    def get_stats(self):
+        """Outcome counts, including parse failures by kind"""
+        with self.lock:
+            return {**self.stats, 'parse_failures': dict(self.stats['parse_failures']),
+                    'min_confidence': self.min_confidence}
+
+
+class StubModel:
+    def __init__(self, labels, responses=None):
+        """Offline stand-in for the model; responses (texts) are returned in a cycle
+
+        The default cycle gives a confident answer, a low-confidence one, a free-text
+        answer, an unknown label and an out-of-range confidence.
+        """
+        labels = list(labels)
+        self.responses = responses or [
+            json.dumps({'label': labels[0], 'confidence': 0.92}),
+            json.dumps({'label': labels[1 % len(labels)], 'confidence': 0.35}),
+            labels[0],
+            json.dumps({'label': 'unknown', 'confidence': 0.9}),
+            json.dumps({'label': labels[0], 'confidence': 7})
+        ]
+        self.cycle = itertools.cycle(self.responses)
+        self.lock = threading.Lock()
+
+    def __call__(self, *args):
+        with self.lock:
+            return next(self.cycle)
@@ -0,0 +1,148 @@
+"""
+Gemini upload preparation
+Crops frames to the plate bounding box (plus a margin), downscales oversized
+crops and picks the highest JPEG quality that fits a byte budget (shrinking the
+image further when even the lowest quality doesn't fit), returning raw
+JPEG bytes ready for the model. Records size, encode time and end-to-end
+latency per call.
+"""
+
+import threading
+import time
+from collections import deque
+
+import cv2
+import numpy as np
+
+
+class UploadPreparer:
+    def __init__(self, roi=None, margin=0.15, byte_budget=40000, min_quality=30, max_quality=85,
+                 max_size=(640, 480), max_encodes=4, max_shrinks=3, history=50):
+        """Initialize the preparer; roi is the plate (x, y, w, h) in frame pixels or None for the full frame"""
+        self.roi = roi
+        self.margin = margin
+        self.byte_budget = byte_budget
+        self.min_quality = min_quality
+        self.max_quality = max_quality
+        self.max_size = max_size
+        self.max_encodes = max_encodes
+        self.max_shrinks = max_shrinks  # Downscales tried when even min_quality is over budget
+
+        # Start each search from the quality that fit last time; scenes change slowly
+        self.last_quality = (min_quality + max_quality) // 2
+        self.resize_buffer = None
+
+        self.lock = threading.Lock()
+        self.encode_lock = threading.Lock()  # Classification workers share the resize buffer
+        self.calls = deque(maxlen=history)
+        self.stats = {
+            'prepared': 0,
+            'over_budget': 0,
+            'bytes_total': 0
+        }
+
+    def crop(self, frame):
+        """Crop the plate ROI grown by the margin, clipped to the frame"""
+        if self.roi is None:
+            return frame
+        frame_height, frame_width = frame.shape[:2]
+        x, y, w, h = self.roi
+        pad_x, pad_y = int(w * self.margin), int(h * self.margin)
+        x0, y0 = max(0, x - pad_x), max(0, y - pad_y)
+        x1, y1 = min(frame_width, x + w + pad_x), min(frame_height, y + h + pad_y)
+        return frame[y0:y1, x0:x1]
+
+    def _fit(self, image):
+        """Downscale image to fit max_size, keeping the aspect ratio"""
+        height, width = image.shape[:2]
+        max_width, max_height = self.max_size
+        scale = min(max_width / width, max_height / height)
+        if scale >= 1:
+            return image
+
+        size = (max(1, int(width * scale)), max(1, int(height * scale)))
+        if self.resize_buffer is None or self.resize_buffer.shape[:2] != (size[1], size[0]):
+            self.resize_buffer = np.empty((size[1], size[0], image.shape[2]), dtype=image.dtype)
+        return cv2.resize(image, size, dst=self.resize_buffer, interpolation=cv2.INTER_AREA)
+
+    def _encode(self, image, quality):
+        """Encode image as JPEG at quality and return the raw bytes"""
+        _, buffer = cv2.imencode('.jpg', image, [cv2.IMWRITE_JPEG_QUALITY, quality])
+        return buffer.tobytes()
+
+    def prepare(self, frame):
+        """Crop, downscale and encode a frame within the byte budget; returns (jpeg bytes, info)"""
+        with self.encode_lock:
+            return self._prepare(frame)
+
+    def _prepare(self, frame):
+        """Crop, downscale and encode a frame; callers hold encode_lock"""
+        start_time = time.perf_counter()
+        image = self._fit(self.crop(frame))
+
+        # Binary search for the highest quality under budget, seeded with the last pick
+        low, high = self.min_quality, self.max_quality
+        quality = min(max(self.last_quality, low), high)
+        best = None
+        encodes = 0
+        while low <= high and encodes < self.max_encodes:
+            data = self._encode(image, quality)
+            encodes += 1
+            if len(data) <= self.byte_budget:
+                best = (quality, data)
+                low = quality + 1
+            else:
+                high = quality - 1
+            quality = (low + high) // 2
+
+        if best is None:
+            # Nothing fit within the allowed encodes: fall back to the lowest quality, and
+            # shrink the image while even that is over budget (noisy scenes compress badly)
+            data = self._encode(image, self.min_quality)
+            encodes += 1
+            for _ in range(self.max_shrinks):
+                if len(data) <= self.byte_budget:
+                    break
+                scale = 0.9 * (self.byte_budget / len(data)) ** 0.5
+                size = (max(1, int(image.shape[1] * scale)), max(1, int(image.shape[0] * scale)))
+                image = cv2.resize(image, size, interpolation=cv2.INTER_AREA)
+                data = self._encode(image, self.min_quality)
+                encodes += 1
+            best = (self.min_quality, data)
+        quality, data = best
+        self.last_quality = quality
+
+        info = {
+            'upload_bytes': len(data),
+            'quality': quality,
+            'width': image.shape[1],
+            'height': image.shape[0],
+            'encodes': encodes,
+            'encode_ms': round((time.perf_counter() - start_time) * 1000, 2)
+        }
+
+        with self.lock:
+            self.stats['prepared'] += 1
+            self.stats['bytes_total'] += len(data)
+            if len(data) > self.byte_budget:
+                self.stats['over_budget'] += 1
+        return data, info
+
+    def record_call(self, info, latency_ms):
+        """Record one model call with its upload info and end-to-end latency"""
+        with self.lock:
+            self.calls.append({**info, 'latency_ms': round(latency_ms, 1)})
+
+    def get_stats(self):
+        """Get upload size, encode time and latency statistics"""
+        with self.lock:
+            calls = list(self.calls)
+            stats = dict(self.stats)
+
+        summary = {**stats, 'byte_budget': self.byte_budget, 'last_quality': self.last_quality}
+        if calls:
+            summary['avg_upload_bytes'] = round(sum(c['upload_bytes'] for c in calls) / len(calls))
+            summary['avg_encode_ms'] = round(sum(c['encode_ms'] for c in calls) / len(calls), 2)
+            summary['avg_latency_ms'] = round(sum(c['latency_ms'] for c in calls) / len(calls), 1)
+            summary['last_call'] = calls[-1]
+        return summary
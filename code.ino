@@ -28,6 +28,22 @@ FastAccelStepper *motorB = nullptr;
 const uint32_t SPEED_HZ = 1000;
 const uint32_t ACCEL    = 1000;
 
+const uint32_t MAX_DWELL_MS = 5000;
+
+// Composite sort sequence: move to bin, dwell, return to neutral
+enum SortState {
+  SORT_IDLE,
+  SORT_MOVING,
+  SORT_DWELL,
+  SORT_RETURNING
+};
+
+SortState sortState = SORT_IDLE;
+uint32_t sortDwellMs = 0;
+uint32_t dwellStartTime = 0;
+uint32_t lastSortId = 0;
+uint32_t completedSortId = 0;
+
 int32_t clamp(int32_t val, int32_t minVal, int32_t maxVal) {
   if (val < minVal) {
     return minVal;
@@ -74,11 +90,103 @@ void handleMove() {
   int32_t spin  = server.arg("spin").toInt();
   int32_t pivot = server.arg("pivot").toInt();
 
-  differentialMove(spin, pivot);
+  // A running sort sequence owns the motors until it returns to neutral
+  if (sortState == SORT_IDLE) {
+    differentialMove(spin, pivot);
+  }
 
   server.send(200, "text/plain", "OK\n");
 }
 
+bool motorsRunning() {
+  return motorA->isRunning() || motorB->isRunning();
+}
+
+const char *sortStateName() {
+  switch (sortState) {
+    case SORT_MOVING:    return "moving";
+    case SORT_DWELL:     return "dwell";
+    case SORT_RETURNING: return "returning";
+    default:             return "idle";
+  }
+}
+
+void handleSort() {
+  uint32_t now = millis();
+
+  // Reject spammy commands
+  if (now - lastCmdTime < CMD_INTERVAL_MS) {
+    server.send(429, "text/plain", "Too fast\n");
+    return;
+  }
+  lastCmdTime = now;
+
+  if (!server.hasArg("spin") || !server.hasArg("pivot")) {
+    server.send(400, "text/plain",
+      "Use /sort?spin=NUM&pivot=NUM&dwell=MS");
+    return;
+  }
+
+  if (sortState != SORT_IDLE || motorsRunning()) {
+    server.send(409, "text/plain", "Busy\n");
+    return;
+  }
+
+  int32_t spin  = server.arg("spin").toInt();
+  int32_t pivot = server.arg("pivot").toInt();
+  int32_t dwell = server.hasArg("dwell") ? server.arg("dwell").toInt() : 0;
+
+  sortDwellMs = (uint32_t)clamp(dwell, 0, MAX_DWELL_MS);
+  lastSortId++;
+
+  differentialMove(spin, pivot);
+  sortState = SORT_MOVING;
+
+  server.send(200, "text/plain", String(lastSortId) + "\n");
+}
+
+void handleStatus() {
+  String body = "{\"state\":\"";
+  body += sortStateName();
+  body += "\",\"active\":";
+  body += lastSortId;
+  body += ",\"completed\":";
+  body += completedSortId;
+  body += ",\"running\":";
+  body += motorsRunning() ? "true" : "false";
+  body += "}";
+
+  server.send(200, "application/json", body);
+}
+
+void updateSortSequence() {
+  switch (sortState) {
+    case SORT_MOVING:
+      if (!motorsRunning()) {
+        dwellStartTime = millis();
+        sortState = SORT_DWELL;
+      }
+      break;
+
+    case SORT_DWELL:
+      if (millis() - dwellStartTime >= sortDwellMs) {
+        differentialMove(0, 0);
+        sortState = SORT_RETURNING;
+      }
+      break;
+
+    case SORT_RETURNING:
+      if (!motorsRunning()) {
+        completedSortId = lastSortId;
+        sortState = SORT_IDLE;
+      }
+      break;
+
+    default:
+      break;
+  }
+}
+
 void setup() {
   Serial.begin(115200);
 
@@ -97,6 +205,8 @@ void setup() {
   Serial.println(WiFi.localIP());
 
   server.on("/move", handleMove);
+  server.on("/sort", handleSort);
+  server.on("/status", handleStatus);
   server.begin();
 
   engine.init();
@@ -135,4 +245,5 @@ void setup() {
 
 void loop() {
   server.handleClient();
+  updateSortSequence();
 }
\ No newline at end of file
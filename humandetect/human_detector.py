@@ -6,21 +6,29 @@ Detects humans, calculates center coordinates, and draws circles at center posit
 
 import cv2
 import numpy as np
-from ultralytics import YOLO
 import sys
+import os
+
+# Shared camera utilities live at the repository root
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from camera.camera_manager import CameraManager
+from yolo_server import detector_from_env
 
 class HumanDetector:
     def __init__(self):
         """Initialize the human detector with YOLOv8 model"""
         try:
-            # Initialize YOLOv8 model (downloads automatically if not present)
-            print("🔄 Loading YOLOv8 model...")
-            self.model = YOLO('yolov8n.pt')  # Using nano model for speed
-            print("✅ YOLOv8 model loaded successfully")
+            # YOLOv8 nano from the shared inference server (YOLO_SERVER), else loaded in process
+            self.detector = detector_from_env('yolov8n.pt')
             
             # Person class ID in COCO dataset
             self.person_class_id = 0
             
+            # Camera selection is cached between runs
+            self.camera_manager = CameraManager('human_detector', settings={
+                cv2.CAP_PROP_BUFFERSIZE: 1  # Reduce buffer for real-time
+            })
+            
         except Exception as e:
             print(f"❌ Error loading YOLO model: {e}")
             sys.exit(1)
@@ -29,26 +37,11 @@ class HumanDetector:
         """Initialize webcam"""
         print("📷 Initializing camera...")
         
-        # Try different camera indices
-        for camera_index in range(5):
-            print(f"🔍 Trying camera index {camera_index}...")
-            self.cap = cv2.VideoCapture(camera_index)
-            
-            if self.cap.isOpened():
-                ret, _ = self.cap.read()
-                if ret:
-                    print(f"✅ Camera {camera_index} opened successfully!")
-                    break
-                else:
-                    self.cap.release()
-        else:
+        # Try the last working camera first, then probe the others in parallel
+        self.cap = self.camera_manager.open()
+        if self.cap is None:
             print("❌ Error: No camera available")
             return False
-            
-        # Set camera resolution for better performance
-        self.cap.set(cv2.CAP_PROP_FRAME_WIDTH, 640)
-        self.cap.set(cv2.CAP_PROP_FRAME_HEIGHT, 480)
-        self.cap.set(cv2.CAP_PROP_BUFFERSIZE, 1)  # Reduce buffer for real-time
         
         print("✅ Camera initialized successfully")
         return True
@@ -67,29 +60,25 @@ class HumanDetector:
     
     def detect_humans(self, frame):
         """Detect humans in frame and return largest bounding box"""
-        # Run YOLOv8 inference
-        results = self.model(frame, verbose=False)
+        # Run YOLOv8 inference (on the shared server when one is configured)
+        try:
+            detections = self.detector.detect(frame)
+        except (ConnectionError, RuntimeError) as e:
+            # Server restarting or its queue full: skip this frame, the client reconnects on the next
+            print(f"⚠️ Detection skipped: {e}")
+            return None
         
         person_detections = []
         
-        # Process detections
-        for result in results:
-            boxes = result.boxes
-            if boxes is not None:
-                for box in boxes:
-                    # Get class ID and confidence
-                    class_id = int(box.cls[0])
-                    confidence = float(box.conf[0])
-                    
-                    # Filter for person class with minimum confidence
-                    if class_id == self.person_class_id and confidence > 0.5:
-                        # Get bounding box coordinates
-                        x1, y1, x2, y2 = box.xyxy[0].cpu().numpy().astype(int)
-                        person_detections.append({
-                            'bbox': [x1, y1, x2, y2],
-                            'confidence': confidence,
-                            'area': self.calculate_bbox_area([x1, y1, x2, y2])
-                        })
+        # Filter for person class with minimum confidence
+        for detection in detections:
+            if detection['class_id'] == self.person_class_id and detection['confidence'] > 0.5:
+                bbox = detection['bbox']
+                person_detections.append({
+                    'bbox': bbox,
+                    'confidence': detection['confidence'],
+                    'area': self.calculate_bbox_area(bbox)
+                })
         
         # Return largest detection (closest person) if any found
         if person_detections:
@@ -175,7 +164,7 @@ class HumanDetector:
         
         finally:
             # Cleanup
-            self.cap.release()
+            self.camera_manager.close()
             cv2.destroyAllWindows()
             print("✅ Resources cleaned up successfully")
 
@@ -6,7 +6,7 @@ Provides video streaming and real-time human coordinates for React frontend
 
 import cv2
 import numpy as np
-from ultralytics import YOLO
+import os
 import sys
 import threading
 import time
@@ -16,6 +16,17 @@ import queue
 import json
 from datetime import datetime
 
+# Shared camera utilities live at the repository root
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from camera.frame_hub import FrameHub
+from camera.frame_scheduler import FrameScheduler
+from camera.frame_buffers import FrameSlots
+from camera.overlay_cache import OverlayCache
+from camera.frame_source import open_replay_from_env, record_from_env
+from camera.frame_bus import open_bus_from_env
+from camera.camera_manager import CameraManager
+from yolo_server import detector_from_env
+
 # Initialize Flask app
 app = Flask(__name__)
 CORS(app)  # Enable CORS for frontend integration
@@ -24,22 +35,30 @@ class HumanDetectorAPI:
     def __init__(self):
         """Initialize the human detector API with YOLOv8 model"""
         try:
-            # Initialize YOLOv8 model
-            print("🔄 Loading YOLOv8 model...")
-            self.model = YOLO('yolov8n.pt')  # Using nano model for speed
-            print("✅ YOLOv8 model loaded successfully")
+            # YOLOv8 nano from the shared inference server (YOLO_SERVER), else loaded in process
+            self.detector = detector_from_env('yolov8n.pt')
             
             # Person class ID in COCO dataset
             self.person_class_id = 0
             
             # API state variables
             self.cap = None
+            # Remembers the working camera and keeps it open for a minute after /stop
+            self.camera_manager = CameraManager('human_detector_api', settings={
+                cv2.CAP_PROP_BUFFERSIZE: 1  # Reduce buffer for real-time
+            })
             self.running = False
             self.detection_thread = None
             self.latest_frame = None
             self.latest_coordinates = {'x': None, 'y': None, 'detected': False}
             self.frame_lock = threading.Lock()
+            self.frame_hub = FrameHub(quality=85)  # Encodes each frame once for all /video_feed clients
+            self.capture_slots = FrameSlots(4)  # Frames are read and annotated in place, then handed off by reference
             self.coord_lock = threading.Lock()
+            self.overlay_cache = OverlayCache()  # Status texts are rasterised once and blended from sprites
+            
+            # Paces the loop from a monotonic deadline; idles at a low rate when nobody is around
+            self.frame_scheduler = FrameScheduler(active_fps=30, idle_fps=2, idle_after=15.0)
             
         except Exception as e:
             print(f"❌ Error loading YOLO model: {e}")
@@ -49,26 +68,26 @@ class HumanDetectorAPI:
         """Initialize webcam"""
         print("📷 Initializing camera...")
         
-        # Try different camera indices
-        for camera_index in range(5):
-            print(f"🔍 Trying camera index {camera_index}...")
-            self.cap = cv2.VideoCapture(camera_index)
-            
-            if self.cap.isOpened():
-                ret, _ = self.cap.read()
-                if ret:
-                    print(f"✅ Camera {camera_index} opened successfully!")
-                    break
-                else:
-                    self.cap.release()
-        else:
+        # Replay a recorded session instead of probing for a webcam (CAMERA_REPLAY)
+        replay = open_replay_from_env()
+        if replay is not None:
+            self.cap = replay
+            return True
+        
+        # Read frames published by a separate capture process (CAMERA_BUS)
+        bus = open_bus_from_env()
+        if bus is not None:
+            self.cap = bus
+            return True
+        
+        # Reuse the standby device, else the cached one, else probe the rest in parallel
+        self.cap = self.camera_manager.open()
+        if self.cap is None:
             print("❌ Error: No camera available")
             return False
-            
-        # Set camera resolution for better performance
-        self.cap.set(cv2.CAP_PROP_FRAME_WIDTH, 640)
-        self.cap.set(cv2.CAP_PROP_FRAME_HEIGHT, 480)
-        self.cap.set(cv2.CAP_PROP_BUFFERSIZE, 1)  # Reduce buffer for real-time
+        
+        # Optionally record the live session for later replay (CAMERA_RECORD)
+        self.cap = record_from_env(self.cap)
         
         print("✅ Camera initialized successfully")
         return True
@@ -88,29 +107,20 @@ class HumanDetectorAPI:
     def detect_humans(self, frame):
         """Detect humans in frame and return largest bounding box"""
         try:
-            # Run YOLOv8 inference
-            results = self.model(frame, verbose=False)
+            # Run YOLOv8 inference (on the shared server when one is configured)
+            detections = self.detector.detect(frame)
             
             person_detections = []
             
-            # Process detections
-            for result in results:
-                boxes = result.boxes
-                if boxes is not None:
-                    for box in boxes:
-                        # Get class ID and confidence
-                        class_id = int(box.cls[0])
-                        confidence = float(box.conf[0])
-                        
-                        # Filter for person class with minimum confidence
-                        if class_id == self.person_class_id and confidence > 0.5:
-                            # Get bounding box coordinates
-                            x1, y1, x2, y2 = box.xyxy[0].cpu().numpy().astype(int)
-                            person_detections.append({
-                                'bbox': [x1, y1, x2, y2],
-                                'confidence': confidence,
-                                'area': self.calculate_bbox_area([x1, y1, x2, y2])
-                            })
+            # Filter for person class with minimum confidence
+            for detection in detections:
+                if detection['class_id'] == self.person_class_id and detection['confidence'] > 0.5:
+                    bbox = detection['bbox']
+                    person_detections.append({
+                        'bbox': bbox,
+                        'confidence': detection['confidence'],
+                        'area': self.calculate_bbox_area(bbox)
+                    })
             
             # Return largest detection (closest person) if any found
             if person_detections:
@@ -156,7 +166,15 @@ class HumanDetectorAPI:
         print("🚀 Starting detection loop...")
         
         while self.running and self.cap and self.cap.isOpened():
-            ret, frame = self.cap.read()
+            if hasattr(self.cap, 'read_view'):
+                # Frame bus: run YOLO on the shared-memory slot without copying
+                ret, frame = self.cap.read_view()
+            else:
+                # Read straight into the next preallocated slot
+                slot_index, buffer = self.capture_slots.next()
+                ret, frame = self.cap.read(image=buffer)
+                if ret:
+                    self.capture_slots.store(slot_index, frame)
             if not ret:
                 print("❌ Error: Could not read from camera")
                 time.sleep(0.1)
@@ -165,10 +183,20 @@ class HumanDetectorAPI:
             # Detect humans in current frame
             detection = self.detect_humans(frame)
             
+            # Overlays are only worth drawing when a /video_feed client is watching
+            render = self.frame_hub.has_subscribers()
+            if render and not frame.flags.writeable:
+                # Bus frames are shared with other consumers: draw on a private copy
+                frame = self.capture_slots.copy_into_next(frame)
+            
             # Update coordinates
             with self.coord_lock:
                 if detection:
-                    center_x, center_y = self.draw_detection(frame, detection)
+                    self.frame_scheduler.trigger()
+                    if render:
+                        center_x, center_y = self.draw_detection(frame, detection)
+                    else:
+                        center_x, center_y = self.calculate_center(detection['bbox'])
                     self.latest_coordinates = {
                         'x': center_x,
                         'y': center_y,
@@ -178,8 +206,9 @@ class HumanDetectorAPI:
                     }
                 else:
                     # No person detected
-                    cv2.putText(frame, "No person detected", (10, 30), 
-                               cv2.FONT_HERSHEY_SIMPLEX, 0.7, (0, 0, 255), 2)
+                    if render:
+                        self.overlay_cache.put_text(frame, "No person detected", (10, 30), 
+                                                    cv2.FONT_HERSHEY_SIMPLEX, 0.7, (0, 0, 255), 2)
                     self.latest_coordinates = {
                         'x': None,
                         'y': None,
@@ -189,17 +218,21 @@ class HumanDetectorAPI:
                     }
             
             # Add status info
-            cv2.putText(frame, "Human Detector API - Running", (10, frame.shape[0] - 30), 
-                       cv2.FONT_HERSHEY_SIMPLEX, 0.5, (255, 255, 255), 1)
-            cv2.putText(frame, f"Frame: {frame.shape[1]}x{frame.shape[0]}", (10, frame.shape[0] - 10), 
-                       cv2.FONT_HERSHEY_SIMPLEX, 0.4, (255, 255, 255), 1)
+            if render:
+                self.overlay_cache.put_text(frame, "Human Detector API - Running", (10, frame.shape[0] - 30), 
+                                            cv2.FONT_HERSHEY_SIMPLEX, 0.5, (255, 255, 255), 1)
+                self.overlay_cache.put_text(frame, f"Frame: {frame.shape[1]}x{frame.shape[0]}", (10, frame.shape[0] - 10), 
+                                            cv2.FONT_HERSHEY_SIMPLEX, 0.4, (255, 255, 255), 1)
             
-            # Store latest frame
+            # Store latest frame; the slot is not rewritten until three more frames are read
             with self.frame_lock:
-                self.latest_frame = frame.copy()
+                self.latest_frame = frame
+            self.frame_hub.publish(frame)
             
-            # Small delay for performance
-            time.sleep(0.033)  # ~30 FPS
+            # Wait for the next frame deadline (full rate while someone is in view);
+            # replayed sessions pace themselves
+            if not getattr(self.cap, 'paces_itself', False):
+                self.frame_scheduler.wait()
     
     def start_detection(self):
         """Start the detection system"""
@@ -210,6 +243,7 @@ class HumanDetectorAPI:
             return False, "Failed to initialize camera"
         
         self.running = True
+        self.frame_scheduler.reset()
         self.detection_thread = threading.Thread(target=self.detection_loop, daemon=True)
         self.detection_thread.start()
         
@@ -226,8 +260,8 @@ class HumanDetectorAPI:
         if self.detection_thread:
             self.detection_thread.join(timeout=2)
         
-        if self.cap:
-            self.cap.release()
+        self.camera_manager.release(self.cap, standby=True)
+        self.cap = None
         
         print("🛑 Human detection stopped")
         return True, "Detection stopped successfully"
@@ -311,20 +345,8 @@ def index():
 @app.route('/video_feed')
 def video_feed():
     """Video streaming endpoint"""
-    def generate_frames():
-        while detector.running:
-            with detector.frame_lock:
-                if detector.latest_frame is not None:
-                    # Encode frame as JPEG
-                    ret, buffer = cv2.imencode('.jpg', detector.latest_frame, 
-                                             [cv2.IMWRITE_JPEG_QUALITY, 85])
-                    if ret:
-                        frame_bytes = buffer.tobytes()
-                        yield (b'--frame\r\n'
-                               b'Content-Type: image/jpeg\r\n\r\n' + frame_bytes + b'\r\n')
-            time.sleep(0.033)  # ~30 FPS
-    
-    return Response(generate_frames(), mimetype='multipart/x-mixed-replace; boundary=frame')
+    return Response(detector.frame_hub.stream(lambda: detector.running),
+                    mimetype='multipart/x-mixed-replace; boundary=frame')
 
 @app.route('/coordinates', methods=['GET'])
 def get_coordinates():
@@ -373,6 +395,12 @@ def get_status():
         return jsonify({
             'running': detector.running,
             'latest_coordinates': detector.latest_coordinates,
+            'video_feed': detector.frame_hub.get_stats(),
+            'frame_scheduler': detector.frame_scheduler.get_stats(),
+            'camera': detector.camera_manager.get_stats(),
+            'frame_bus': detector.cap.get_stats() if hasattr(detector.cap, 'read_view') else None,
+            'overlay_cache': detector.overlay_cache.stats,
+            'detector': detector.detector.get_stats(),
             'timestamp': datetime.now().strftime('%Y-%m-%d %H:%M:%S')
         })
 
@@ -397,4 +425,5 @@ if __name__ == "__main__":
     except KeyboardInterrupt:
         print("\n🛑 Shutting down...")
         detector.stop_detection()
+        detector.camera_manager.close()
         print("👋 Goodbye!")
\ No newline at end of file
@@ -0,0 +1,181 @@
+"""
+Dynamic inference batching
+Collects requests from every caller into one queue and hands them to the model
+in batches: a batch closes when it holds max_batch requests or when its oldest
+request has waited max_wait, so a lone caller is never held back and busy
+periods share one model call. Records queue wait, inference and total latency
+per request and the batch size distribution. Pure Python, so the batching can
+be exercised without a model.
+"""
+
+import queue
+import threading
+import time
+from collections import deque
+
+
+def percentile(values, fraction):
+    """Nearest-rank percentile, None when there are no values"""
+    if not values:
+        return None
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+class BatchRequest:
+    def __init__(self, payload):
+        """One queued request; wait() returns its result once its batch has run"""
+        self.payload = payload
+        self.submitted = time.perf_counter()
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+        self.timings = {}
+
+    def wait(self, timeout=None):
+        """Block until the request's batch has run; returns the result or raises the batch's error"""
+        if not self.done.wait(timeout):
+            raise TimeoutError("inference request timed out")
+        if self.error is not None:
+            raise self.error
+        return self.result
+
+
+class DynamicBatcher:
+    def __init__(self, infer_batch, max_batch=8, max_wait=0.005, max_queue=64, window=1000, expect_more=None):
+        """Initialize the batcher
+
+        infer_batch(payloads) returns one result per payload, in order.
+        expect_more() says whether lingering for more requests can pay off
+        (e.g. more than one caller is connected); by default it always can.
+        """
+        self.infer_batch = infer_batch
+        self.max_batch = max_batch
+        self.max_wait = max_wait
+        self.expect_more = expect_more or (lambda: True)
+
+        self.pending = queue.Queue(maxsize=max_queue)
+        self.thread = None
+        self.lock = threading.Lock()
+
+        # Latency samples in milliseconds over the last window requests
+        self.queue_ms = deque(maxlen=window)
+        self.infer_ms = deque(maxlen=window)
+        self.total_ms = deque(maxlen=window)
+
+        self.stats = {
+            'requests': 0,
+            'rejected': 0,
+            'batches': 0,
+            'errors': 0,
+            'batch_sizes': {}
+        }
+
+    def start(self):
+        """Start the batching thread"""
+        if self.thread and self.thread.is_alive():
+            return
+        self.thread = threading.Thread(target=self._batch_loop, daemon=True)
+        self.thread.start()
+
+    def stop(self, timeout=5.0):
+        """Run what is queued, then stop the batching thread"""
+        if not self.thread:
+            return
+        self.pending.put(None)
+        self.thread.join(timeout)
+        self.thread = None
+
+    def submit(self, payload):
+        """Queue a request; returns it, or None when the queue is full"""
+        request = BatchRequest(payload)
+        try:
+            self.pending.put_nowait(request)
+        except queue.Full:
+            with self.lock:
+                self.stats['rejected'] += 1
+            return None
+        return request
+
+    def _collect(self):
+        """Wait for a request, then gather more until the batch is full or its oldest request is due"""
+        first = self.pending.get()
+        if first is None:
+            return None
+        batch = [first]
+        deadline = first.submitted + self.max_wait
+        while len(batch) < self.max_batch:
+            try:
+                # Take whatever is already queued; only linger when another caller may add to the batch
+                remaining = deadline - time.perf_counter()
+                if remaining > 0 and self.expect_more():
+                    request = self.pending.get(timeout=remaining)
+                else:
+                    request = self.pending.get_nowait()
+            except queue.Empty:
+                break
+            if request is None:
+                self.pending.put(None)  # Stop after this batch
+                break
+            batch.append(request)
+        return batch
+
+    def _batch_loop(self):
+        """Run batches until stopped"""
+        while True:
+            batch = self._collect()
+            if batch is None:
+                break
+            self._run(batch)
+
+    def _run(self, batch):
+        """Run one batch and complete its requests"""
+        start_time = time.perf_counter()
+        try:
+            results = self.infer_batch([request.payload for request in batch])
+            error = None
+        except Exception as e:
+            results = [None] * len(batch)
+            error = e
+        end_time = time.perf_counter()
+        infer_ms = (end_time - start_time) * 1000
+
+        with self.lock:
+            self.stats['batches'] += 1
+            self.stats['requests'] += len(batch)
+            self.stats['batch_sizes'][len(batch)] = self.stats['batch_sizes'].get(len(batch), 0) + 1
+            if error is not None:
+                self.stats['errors'] += 1
+            for request in batch:
+                request.timings = {
+                    'queue_ms': round((start_time - request.submitted) * 1000, 2),
+                    'infer_ms': round(infer_ms, 2),
+                    'total_ms': round((end_time - request.submitted) * 1000, 2),
+                    'batch_size': len(batch)
+                }
+                self.queue_ms.append(request.timings['queue_ms'])
+                self.infer_ms.append(request.timings['infer_ms'])
+                self.total_ms.append(request.timings['total_ms'])
+
+        for request, result in zip(batch, results):
+            request.result = result
+            request.error = error
+            request.done.set()
+
+    def get_stats(self):
+        """Counters, batch sizes and p50/p95 latencies"""
+        with self.lock:
+            batches = self.stats['batches']
+            return {
+                **self.stats,
+                'batch_sizes': dict(self.stats['batch_sizes']),
+                'avg_batch_size': round(self.stats['requests'] / batches, 2) if batches else None,
+                'queued': self.pending.qsize(),
+                'max_batch': self.max_batch,
+                'max_wait_ms': self.max_wait * 1000,
+                'latency_ms': {
+                    name: {'p50': percentile(samples, 0.5), 'p95': percentile(samples, 0.95)}
+                    for name, samples in (('queue', self.queue_ms), ('infer', self.infer_ms),
+                                          ('total', self.total_ms))
+                }
+            }
@@ -7,7 +7,7 @@ Includes eye movement display and intelligent greeting timing.
 
 import cv2
 import numpy as np
-from ultralytics import YOLO
+import os
 import sys
 import time
 import threading
@@ -16,18 +16,28 @@ import json
 from datetime import datetime, timedelta
 import pygame
 
+# Shared camera utilities live at the repository root
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from camera.overlay_cache import OverlayCache, OverlayLayer
+from camera.camera_manager import CameraManager
+from camera.frame_bus import open_bus_from_env
+from yolo_server import detector_from_env
+
 class SmartHumanDetector:
-    def __init__(self):
+    def __init__(self, show_window=True):
         """Initialize the smart human detector with AI greeting capabilities"""
         try:
-            # Initialize YOLOv8 model
-            print("🔄 Loading YOLOv8 model...")
-            self.model = YOLO('yolov8n.pt')  # Using nano model for speed
-            print("✅ YOLOv8 model loaded successfully")
+            # YOLOv8 nano from the shared inference server (YOLO_SERVER), else loaded in process
+            self.detector = detector_from_env('yolov8n.pt')
             
             # Person class ID in COCO dataset
             self.person_class_id = 0
             
+            # Camera selection is cached between runs
+            self.camera_manager = CameraManager('smart_human_detector', settings={
+                cv2.CAP_PROP_BUFFERSIZE: 1  # Reduce buffer for real-time
+            })
+            
             # Detection and greeting state
             self.detection_start_time = None
             self.last_greeting_time = None
@@ -39,6 +49,11 @@ class SmartHumanDetector:
             self.eye_offset_x = 0
             self.eye_offset_y = 0
             
+            # Overlays are only drawn when a preview window is open
+            self.show_window = show_window
+            self.overlay_cache = OverlayCache()
+            self.eye_sockets = None
+            
             # API endpoints
             self.elevenlabs_url = "http://127.0.0.1:5000/tts"
             self.gemini_url = "http://127.0.0.1:5000/gemini"  # Assuming similar endpoint
@@ -54,26 +69,16 @@ class SmartHumanDetector:
         """Initialize webcam"""
         print("📷 Initializing camera...")
         
-        # Try different camera indices
-        for camera_index in range(5):
-            print(f"🔍 Trying camera index {camera_index}...")
-            self.cap = cv2.VideoCapture(camera_index)
-            
-            if self.cap.isOpened():
-                ret, _ = self.cap.read()
-                if ret:
-                    print(f"✅ Camera {camera_index} opened successfully!")
-                    break
-                else:
-                    self.cap.release()
-        else:
+        # Share frames with the other services when a capture process owns the camera (CAMERA_BUS)
+        self.cap = open_bus_from_env()
+        if self.cap is not None:
+            return True
+        
+        # Try the last working camera first, then probe the others in parallel
+        self.cap = self.camera_manager.open()
+        if self.cap is None:
             print("❌ Error: No camera available")
             return False
-            
-        # Set camera resolution for better performance
-        self.cap.set(cv2.CAP_PROP_FRAME_WIDTH, 640)
-        self.cap.set(cv2.CAP_PROP_FRAME_HEIGHT, 480)
-        self.cap.set(cv2.CAP_PROP_BUFFERSIZE, 1)
         
         print("✅ Camera initialized successfully")
         return True
@@ -103,6 +108,23 @@ class SmartHumanDetector:
         vertical_percent = center_y / camera_height
         self.eye_offset_y = (vertical_percent - 0.5) * 45
     
+    def _eye_sockets_layer(self, eye_width, eye_height, eye_spacing):
+        """Pre-render both eye sockets once as a single sprite"""
+        pad = 3
+        width = 2 * eye_width + eye_spacing + 2 * pad
+        height = eye_height + 2 * pad
+        image = np.zeros((height, width, 3), dtype=np.uint8)
+        alpha = np.zeros((height, width), dtype=np.uint8)
+        
+        for center_x in [pad + eye_width // 2, pad + eye_width + eye_spacing + eye_width // 2]:
+            center = (center_x, pad + eye_height // 2)
+            for target, fill, border in [(image, (26, 32, 44), (45, 55, 72)), (alpha, 255, 255)]:
+                cv2.ellipse(target, center, (eye_width//2, eye_height//2), 0, 0, 360, fill, -1)
+                cv2.ellipse(target, center, (eye_width//2, eye_height//2), 0, 0, 360, border, 3)
+        
+        # Offset from the left eye centre to the sprite's top-left corner
+        return OverlayLayer(image, alpha, (-(pad + eye_width // 2), -(pad + eye_height // 2)))
+    
     def draw_eyes_display(self, frame):
         """Draw animated eyes on the frame (similar to eyes.jsx)"""
         # Eye socket dimensions (scaled down for video overlay)
@@ -115,10 +137,11 @@ class SmartHumanDetector:
         right_eye_center = (frame_width - 200, 100)
         left_eye_center = (frame_width - 200 - eye_spacing - eye_width, 100)
         
-        # Draw eye sockets (dark background)
-        for eye_center in [left_eye_center, right_eye_center]:
-            cv2.ellipse(frame, eye_center, (eye_width//2, eye_height//2), 0, 0, 360, (26, 32, 44), -1)
-            cv2.ellipse(frame, eye_center, (eye_width//2, eye_height//2), 0, 0, 360, (45, 55, 72), 3)
+        # Blend the pre-rendered eye sockets (dark background)
+        if self.eye_sockets is None:
+            self.eye_sockets = self._eye_sockets_layer(eye_width, eye_height, eye_spacing)
+        offset_x, offset_y = self.eye_sockets.origin
+        self.eye_sockets.apply(frame, (left_eye_center[0] + offset_x, left_eye_center[1] + offset_y))
         
         # Draw pupils with movement
         pupil_width = 56  # 140px -> 56px scaled down
@@ -138,29 +161,20 @@ class SmartHumanDetector:
     def human_detection(self, frame):
         """Detect humans in frame and return largest detection"""
         try:
-            # Run YOLOv8 inference
-            results = self.model(frame, verbose=False)
+            # Run YOLOv8 inference (on the shared server when one is configured)
+            detections = self.detector.detect(frame)
             
             person_detections = []
             
-            # Process detections
-            for result in results:
-                boxes = result.boxes
-                if boxes is not None:
-                    for box in boxes:
-                        # Get class ID and confidence
-                        class_id = int(box.cls[0])
-                        confidence = float(box.conf[0])
-                        
-                        # Filter for person class with minimum confidence
-                        if class_id == self.person_class_id and confidence > 0.5:
-                            # Get bounding box coordinates
-                            x1, y1, x2, y2 = box.xyxy[0].cpu().numpy().astype(int)
-                            person_detections.append({
-                                'bbox': [x1, y1, x2, y2],
-                                'confidence': confidence,
-                                'area': self.calculate_bbox_area([x1, y1, x2, y2])
-                            })
+            # Filter for person class with minimum confidence
+            for detection in detections:
+                if detection['class_id'] == self.person_class_id and detection['confidence'] > 0.5:
+                    bbox = detection['bbox']
+                    person_detections.append({
+                        'bbox': bbox,
+                        'confidence': detection['confidence'],
+                        'area': self.calculate_bbox_area(bbox)
+                    })
             
             # Return largest detection (closest person) if any found
             if person_detections:
@@ -326,8 +340,8 @@ class SmartHumanDetector:
             self.eye_offset_x = 0
             self.eye_offset_y = 0
             
-            cv2.putText(frame, "No person detected", (10, 30), 
-                       cv2.FONT_HERSHEY_SIMPLEX, 0.7, (0, 0, 255), 2)
+            self.overlay_cache.put_text(frame, "No person detected", (10, 30), 
+                                        cv2.FONT_HERSHEY_SIMPLEX, 0.7, (0, 0, 255), 2)
             return None, None
     
     def draw_status_info(self, frame):
@@ -351,8 +365,8 @@ class SmartHumanDetector:
             status_text = "Waiting for human..."
             color = (128, 128, 128)  # Gray
         
-        cv2.putText(frame, status_text, (10, 60), 
-                   cv2.FONT_HERSHEY_SIMPLEX, 0.6, color, 2)
+        self.overlay_cache.put_text(frame, status_text, (10, 60), 
+                                    cv2.FONT_HERSHEY_SIMPLEX, 0.6, color, 2)
         
         # Cooldown status
         if self.last_greeting_time:
@@ -360,8 +374,8 @@ class SmartHumanDetector:
             if time_since_greeting < self.greeting_cooldown:
                 cooldown_remaining = self.greeting_cooldown - time_since_greeting
                 cooldown_text = f"Cooldown: {cooldown_remaining:.1f}s"
-                cv2.putText(frame, cooldown_text, (10, 90), 
-                           cv2.FONT_HERSHEY_SIMPLEX, 0.6, (255, 0, 255), 2)
+                self.overlay_cache.put_text(frame, cooldown_text, (10, 90), 
+                                            cv2.FONT_HERSHEY_SIMPLEX, 0.6, (255, 0, 255), 2)
     
     def run(self):
         """Main detection and greeting loop"""
@@ -401,6 +415,10 @@ class SmartHumanDetector:
                     )
                     greeting_thread.start()
                 
+                if not self.show_window:
+                    # Headless: nobody can see overlays, so skip drawing and the preview
+                    continue
+                
                 # Draw detection information and update eyes
                 self.draw_detection_info(frame, detection)
                 
@@ -411,9 +429,9 @@ class SmartHumanDetector:
                 self.draw_status_info(frame)
                 
                 # Add instructions
-                cv2.putText(frame, "Press 'q' to quit, 'g' for manual greeting", 
-                           (10, frame.shape[0] - 10), 
-                           cv2.FONT_HERSHEY_SIMPLEX, 0.4, (255, 255, 255), 1)
+                self.overlay_cache.put_text(frame, "Press 'q' to quit, 'g' for manual greeting", 
+                                            (10, frame.shape[0] - 10), 
+                                            cv2.FONT_HERSHEY_SIMPLEX, 0.4, (255, 255, 255), 1)
                 
                 # Display frame
                 cv2.imshow('Smart Human Detection with AI Greeting', frame)
@@ -435,7 +453,8 @@ class SmartHumanDetector:
         
         finally:
             # Cleanup
-            self.cap.release()
+            self.camera_manager.release(self.cap, standby=False)
+            self.camera_manager.close()
             cv2.destroyAllWindows()
             pygame.mixer.quit()
             print("✅ Resources cleaned up successfully")
@@ -465,7 +484,7 @@ def main():
     print("=" * 60)
     
     # Create and run detector
-    detector = SmartHumanDetector()
+    detector = SmartHumanDetector(show_window='--headless' not in sys.argv)
     detector.run()
 
 if __name__ == "__main__":
@@ -0,0 +1,307 @@
+#!/usr/bin/env python3
+"""
+Shared YOLO inference server
+Loads and warms up yolov8n once and serves detections to every human-detection
+front end over a local socket. Frames from concurrent callers are queued and
+run through the model in batches (see inference_batcher.py), and the server
+keeps queue, inference and end-to-end latency metrics.
+
+Front ends get their detector from detector_from_env(): with YOLO_SERVER set
+(a socket path, or host:port) they call the server, otherwise - or when it
+can't be reached - they load the model in process as before.
+
+Messages are JSON headers plus raw frame bytes, never pickles. A host:port
+address is only served with a YOLO_SERVER_KEY set on both sides; the Unix
+socket is created owner-only.
+
+Usage:
+    python yolo_server.py [--address /tmp/yolo_server.sock] [--max-batch 8] [--max-wait-ms 5]
+    python yolo_server.py --stats
+"""
+
+import argparse
+import json
+import os
+import threading
+import time
+from multiprocessing.connection import AuthenticationError, Client, Listener
+
+import numpy as np
+
+from inference_batcher import DynamicBatcher
+
+DEFAULT_MODEL = 'yolov8n.pt'
+DEFAULT_ADDRESS = '/tmp/yolo_server.sock'
+LOCAL_AUTHKEY = b'trashbin-yolo'  # Unix socket only; the socket file's permissions do the real gating
+
+
+def authkey_for(address):
+    """Connection key: YOLO_SERVER_KEY, required for TCP addresses"""
+    key = os.getenv("YOLO_SERVER_KEY")
+    if key:
+        return key.encode()
+    if isinstance(address, tuple):
+        raise ValueError("YOLO_SERVER_KEY must be set to use a host:port YOLO server")
+    return LOCAL_AUTHKEY
+
+
+def send_message(conn, message):
+    """Send one JSON message"""
+    conn.send_bytes(json.dumps(message).encode())
+
+
+def recv_message(conn):
+    """Receive one JSON message"""
+    return json.loads(conn.recv_bytes())
+
+
+def parse_address(address):
+    """'host:port' becomes a TCP address, anything else a Unix socket path"""
+    if ':' in address and not address.startswith('/'):
+        host, port = address.rsplit(':', 1)
+        return host, int(port)
+    return address
+
+
+def boxes_to_detections(result):
+    """Plain detections from one YOLO result: class_id, confidence and integer xyxy bbox"""
+    if result.boxes is None:
+        return []
+    boxes = result.boxes
+    xyxy = boxes.xyxy.cpu().numpy().astype(int)
+    class_ids = boxes.cls.cpu().numpy().astype(int)
+    confidences = boxes.conf.cpu().numpy()
+    return [{'class_id': int(class_id), 'confidence': float(confidence), 'bbox': [int(v) for v in bbox]}
+            for bbox, class_id, confidence in zip(xyxy, class_ids, confidences)]
+
+
+class LocalDetector:
+    def __init__(self, model_path=DEFAULT_MODEL):
+        """In-process model, used when no server is configured or reachable"""
+        from ultralytics import YOLO  # torch is only imported by processes that run the model
+        self.model = YOLO(model_path)
+        self.stats = {'requests': 0, 'avg_latency_ms': 0.0}
+
+    def detect(self, frame):
+        """Detections for one frame"""
+        start_time = time.perf_counter()
+        detections = boxes_to_detections(self.model(frame, verbose=False)[0])
+        latency_ms = (time.perf_counter() - start_time) * 1000
+        self.stats['requests'] += 1
+        self.stats['avg_latency_ms'] = round(0.9 * self.stats['avg_latency_ms'] + 0.1 * latency_ms, 2)
+        return detections
+
+    def get_stats(self):
+        return {'mode': 'local', **self.stats}
+
+
+class YoloClient:
+    def __init__(self, address=None, timeout=10.0):
+        """Client for the shared server; one request in flight per client"""
+        self.address = parse_address(address or os.getenv("YOLO_SERVER") or DEFAULT_ADDRESS)
+        self.timeout = timeout
+        self.conn = None
+        self.lock = threading.Lock()
+        self.stats = {'requests': 0, 'errors': 0, 'connects': 0, 'avg_round_trip_ms': 0.0,
+                      'avg_server_ms': 0.0}
+
+    def connect(self):
+        """Open the connection; raises OSError or AuthenticationError when the server isn't there"""
+        self.conn = Client(self.address, authkey=authkey_for(self.address))
+        self.stats['connects'] += 1
+
+    def close(self):
+        if self.conn is not None:
+            self.conn.close()
+            self.conn = None
+
+    def _call(self, header, data=None):
+        """Send one request and wait for its reply; reconnects on the next call after a failure"""
+        with self.lock:
+            try:
+                if self.conn is None:
+                    self.connect()
+                send_message(self.conn, header)
+                if data is not None:
+                    self.conn.send_bytes(data)
+                if not self.conn.poll(self.timeout):
+                    raise TimeoutError("YOLO server did not answer")
+                reply = recv_message(self.conn)
+            except (OSError, EOFError, AuthenticationError, ValueError) as e:
+                self.stats['errors'] += 1
+                self.close()
+                raise ConnectionError(f"YOLO server unavailable: {e}") from e
+        if 'error' in reply:
+            self.stats['errors'] += 1
+            raise RuntimeError(reply['error'])
+        return reply
+
+    def detect(self, frame):
+        """Detections for one frame, computed by the server"""
+        frame = np.ascontiguousarray(frame)  # Raw bytes go over the socket, no pickling of the array
+        start_time = time.perf_counter()
+        reply = self._call({'op': 'detect', 'shape': list(frame.shape), 'dtype': frame.dtype.str}, frame)
+        round_trip_ms = (time.perf_counter() - start_time) * 1000
+
+        # Exponential moving averages keep the stats cheap
+        self.stats['requests'] += 1
+        self.stats['avg_round_trip_ms'] = round(0.9 * self.stats['avg_round_trip_ms'] + 0.1 * round_trip_ms, 2)
+        self.stats['avg_server_ms'] = round(
+            0.9 * self.stats['avg_server_ms'] + 0.1 * reply['timings']['total_ms'], 2)
+        return reply['detections']
+
+    def server_stats(self):
+        """The server's batching and latency metrics"""
+        return self._call({'op': 'stats'})['stats']
+
+    def get_stats(self):
+        return {'mode': 'server', 'address': str(self.address), **self.stats}
+
+
+def detector_from_env(model_path=DEFAULT_MODEL):
+    """The shared server's client when YOLO_SERVER is set and answering, else an in-process model"""
+    address = os.getenv("YOLO_SERVER")
+    if address:
+        client = YoloClient(address)
+        try:
+            client.connect()
+            print(f"🔗 Using the shared YOLO server at {address}")
+            return client
+        except (OSError, AuthenticationError, ValueError) as e:
+            print(f"⚠️ YOLO server at {address} unavailable ({e}) - loading the model in process")
+
+    print("🔄 Loading YOLOv8 model...")
+    detector = LocalDetector(model_path)
+    print("✅ YOLOv8 model loaded successfully")
+    return detector
+
+
+class YoloInferenceServer:
+    def __init__(self, address=None, model_path=DEFAULT_MODEL, max_batch=8, max_wait=0.005, max_queue=64):
+        """Load the model once and batch requests from every connected front end"""
+        from ultralytics import YOLO
+        self.address = parse_address(address or os.getenv("YOLO_SERVER") or DEFAULT_ADDRESS)
+        self.authkey = authkey_for(self.address)  # Refuses TCP without a shared key
+        print(f"🔄 Loading {model_path}...")
+        self.model = YOLO(model_path)
+        self.clients = 0
+        self.lock = threading.Lock()
+        self.started_at = time.time()
+
+        # Lingering for a fuller batch only pays off when someone else may send a frame
+        self.batcher = DynamicBatcher(self._infer, max_batch=max_batch, max_wait=max_wait,
+                                      max_queue=max_queue, expect_more=lambda: self.clients > 1)
+
+    def _infer(self, frames):
+        """One model call for the whole batch"""
+        return [boxes_to_detections(result) for result in self.model(frames, verbose=False)]
+
+    def warmup(self):
+        """Run a blank frame so the first real request doesn't pay for initialisation"""
+        start_time = time.perf_counter()
+        self.model(np.zeros((480, 640, 3), dtype=np.uint8), verbose=False)
+        print(f"✅ Model warmed up in {(time.perf_counter() - start_time) * 1000:.0f}ms")
+
+    def serve_forever(self):
+        """Accept front ends until interrupted"""
+        if isinstance(self.address, str) and os.path.exists(self.address):
+            os.remove(self.address)  # Stale socket from a previous run
+        if isinstance(self.address, str):
+            # Owner-only socket: only this user's front ends can connect
+            old_umask = os.umask(0o177)
+            try:
+                listener = Listener(self.address, authkey=self.authkey)
+            finally:
+                os.umask(old_umask)
+        else:
+            listener = Listener(self.address, authkey=self.authkey)
+        self.warmup()
+        self.batcher.start()
+        print(f"🚀 YOLO server listening on {self.address} (batches of up to {self.batcher.max_batch}, "
+              f"{self.batcher.max_wait * 1000:.0f}ms linger)")
+        try:
+            while True:
+                try:
+                    conn = listener.accept()
+                except AuthenticationError:
+                    print("⚠️ Rejected a client with the wrong YOLO_SERVER_KEY")
+                    continue
+                threading.Thread(target=self._serve_client, args=(conn,), daemon=True).start()
+        except KeyboardInterrupt:
+            print("\n🛑 Shutting down...")
+        finally:
+            listener.close()
+            self.batcher.stop()
+
+    def _serve_client(self, conn):
+        """Answer one front end's requests until it disconnects"""
+        with self.lock:
+            self.clients += 1
+        try:
+            while True:
+                header = recv_message(conn)
+                op = header.get('op') if isinstance(header, dict) else None
+                if op == 'detect':
+                    data = conn.recv_bytes()
+                    try:
+                        # Read-only view over the received bytes; the model doesn't write to its input
+                        frame = np.frombuffer(data, dtype=np.dtype(header['dtype'])).reshape(header['shape'])
+                    except (KeyError, TypeError, ValueError) as e:
+                        send_message(conn, {'error': f"Bad frame: {e}"})
+                        continue
+                    request = self.batcher.submit(frame)
+                    if request is None:
+                        send_message(conn, {'error': 'YOLO server queue full'})
+                        continue
+                    try:
+                        detections = request.wait(timeout=10.0)
+                    except Exception as e:
+                        send_message(conn, {'error': f"Inference failed: {e}"})
+                        continue
+                    send_message(conn, {'detections': detections, 'timings': request.timings})
+                elif op == 'stats':
+                    send_message(conn, {'stats': self.get_stats()})
+                else:
+                    send_message(conn, {'error': f"Unknown request {op!r}"})
+        except (EOFError, OSError, ValueError):
+            pass  # Front end went away or sent something that isn't a message
+        finally:
+            with self.lock:
+                self.clients -= 1
+            conn.close()
+
+    def get_stats(self):
+        """Batching and latency metrics plus connected clients"""
+        return {
+            **self.batcher.get_stats(),
+            'clients': self.clients,
+            'uptime_s': round(time.time() - self.started_at, 1)
+        }
+
+
+def main():
+    """Main function"""
+    parser = argparse.ArgumentParser(description="Serve YOLO detections to the human-detection front ends")
+    parser.add_argument('--address', default=os.getenv("YOLO_SERVER", DEFAULT_ADDRESS),
+                        help='Unix socket path or host:port')
+    parser.add_argument('--model', default=DEFAULT_MODEL)
+    parser.add_argument('--max-batch', type=int, default=8)
+    parser.add_argument('--max-wait-ms', type=float, default=5.0, help='Longest a frame waits for its batch to fill')
+    parser.add_argument('--stats', action='store_true', help="Print a running server's metrics and exit")
+    args = parser.parse_args()
+
+    if args.stats:
+        print(json.dumps(YoloClient(args.address).server_stats(), indent=2))
+        return
+
+    try:
+        server = YoloInferenceServer(args.address, args.model, max_batch=args.max_batch,
+                                     max_wait=args.max_wait_ms / 1000)
+    except ValueError as e:
+        print(f"❌ {e}")
+        return
+    server.serve_forever()
+
+
+if __name__ == "__main__":
+    main()
@@ -35,6 +35,39 @@ export default function TrashTracker({ onNavigate }) {
     return key;
   };
 
+  // Count a new classification once, whether it arrived by event or by status fetch
+  const processClassification = (classificationData) => {
+    // Low-confidence guesses were not sorted, so they don't count
+    if (classificationData?.tentative) return;
+
+    if (classificationData &&
+      classificationData.classification &&
+      classificationData.classification !== 'error' &&
+      classificationData.classification !== 'no_object') {
+
+      const classificationKey = getClassificationKey(classificationData);
+
+      if (classificationKey && classificationKey !== lastProcessedRef.current) {
+        console.log('🎯 New classification detected:', classificationData.classification);
+        lastProcessedRef.current = classificationKey;
+
+        // Update counts based on classification
+        const classification = classificationData.classification.toLowerCase();
+        if (classification === 'paper') {
+          incrementCount('paper');
+        } else if (classification === 'can') {
+          incrementCount('cans');
+        } else if (classification === 'plastic') {
+          incrementCount('plasticBottles');
+        } else {
+          incrementCount('trash'); // 'other' and unknown types
+        }
+
+        console.log('📊 Counter updated for:', classification);
+      }
+    }
+  };
+
   // Fetch camera system status
   const fetchCameraStatus = async () => {
     try {
@@ -50,32 +83,8 @@ export default function TrashTracker({ onNavigate }) {
         });
 
         // Process new classifications and update counts
-        if (data.latest_classification &&
-          data.latest_classification.classification &&
-          data.latest_classification.classification !== 'error' &&
-          data.latest_classification.classification !== 'no_object') {
-
-          const classificationKey = getClassificationKey(data.latest_classification);
-
-          if (classificationKey && classificationKey !== lastProcessedRef.current) {
-            console.log('🎯 New classification detected:', data.latest_classification.classification);
-            lastProcessedRef.current = classificationKey;
-
-            // Update counts based on classification
-            const classification = data.latest_classification.classification.toLowerCase();
-            if (classification === 'paper') {
-              incrementCount('paper');
-            } else if (classification === 'can') {
-              incrementCount('cans');
-            } else if (classification === 'plastic') {
-              incrementCount('plasticBottles');
-            } else {
-              incrementCount('trash'); // 'other' and unknown types
-            }
-
-            console.log('📊 Counter updated for:', classification);
-          }
-        }
+        processClassification(data.latest_classification);
+        return data;
       } else {
         setCameraSystem(prev => ({ ...prev, systemStatus: 'error' }));
       }
@@ -83,21 +92,42 @@ export default function TrashTracker({ onNavigate }) {
       console.error('Error fetching camera status:', error);
       setCameraSystem(prev => ({ ...prev, systemStatus: 'disconnected' }));
     }
+    return null;
   };
 
-  // Check for navigation triggers (regular polling - fallback)
-  const checkNavigationTrigger = async () => {
-    // This is now a fallback check, main navigation happens after counter update
-    try {
-      const response = await fetch(`${CLASSIFICATION_API_URL}/navigation_trigger`);
-      if (response.ok) {
-        const data = await response.json();
-        if (data.trigger && data.action === 'show_thankyou') {
-          console.log(`🎉 Fallback navigation trigger: ${data.action} for ${data.classified_item}`);
-        }
-      }
-    } catch (error) {
-      console.error('Error in fallback navigation trigger check:', error);
+  // Handle events pushed by the classification service
+  const handleClassificationEvent = (event) => {
+    const data = JSON.parse(event.data);
+    setCameraSystem(prev => ({ ...prev, latestClassification: data, systemStatus: 'connected' }));
+    processClassification(data);
+  };
+
+  // Shown as the latest result but never counted
+  const handleTentativeEvent = (event) => {
+    const data = JSON.parse(event.data);
+    setCameraSystem(prev => ({ ...prev, latestClassification: data, systemStatus: 'connected' }));
+  };
+
+  const handlePlateEvent = (event) => {
+    const { state } = JSON.parse(event.data);
+    setCameraSystem(prev => ({
+      ...prev,
+      running: true,
+      classifying: state === 'classifying',
+      inCooldown: state === 'cooldown',
+      systemStatus: 'connected'
+    }));
+  };
+
+  const handleSystemEvent = (event) => {
+    const { running } = JSON.parse(event.data);
+    setCameraSystem(prev => ({ ...prev, running, systemStatus: 'connected' }));
+  };
+
+  const handleNavigationEvent = (event) => {
+    const data = JSON.parse(event.data);
+    if (data.action === 'show_thankyou') {
+      console.log(`🎉 Navigation event #${data.seq}: ${data.action} for ${data.classified_item}`);
     }
   };
 
@@ -131,11 +161,63 @@ export default function TrashTracker({ onNavigate }) {
     }
   };
 
-  // Poll camera status every 2 seconds (navigation happens after counter updates)
+  // Subscribe to the event stream; fall back to polling /status only while it is down
   useEffect(() => {
-    fetchCameraStatus(); // Initial fetch
-    const interval = setInterval(fetchCameraStatus, 2000); // Only poll status, navigation triggered after count
-    return () => clearInterval(interval);
+    let eventSource = null;
+    let fallbackInterval = null;
+    let cancelled = false;
+
+    const startFallbackPolling = () => {
+      if (!fallbackInterval) {
+        fallbackInterval = setInterval(fetchCameraStatus, 2000);
+      }
+    };
+
+    const stopFallbackPolling = () => {
+      if (fallbackInterval) {
+        clearInterval(fallbackInterval);
+        fallbackInterval = null;
+      }
+    };
+
+    const connect = async () => {
+      const status = await fetchCameraStatus(); // Initial fetch
+      if (cancelled) return;
+
+      if (typeof EventSource === 'undefined') {
+        startFallbackPolling();
+        return;
+      }
+
+      // Start after the events already reflected in the status snapshot
+      const since = status?.events?.sequence ?? 0;
+      eventSource = new EventSource(`${CLASSIFICATION_API_URL}/events?since=${since}`);
+      eventSource.addEventListener('classification', handleClassificationEvent);
+      eventSource.addEventListener('classification_tentative', handleTentativeEvent);
+      eventSource.addEventListener('plate', handlePlateEvent);
+      eventSource.addEventListener('system', handleSystemEvent);
+      eventSource.addEventListener('navigation', handleNavigationEvent);
+      eventSource.addEventListener('resync', fetchCameraStatus);
+      eventSource.onopen = () => {
+        // Reconnected after an outage: stop polling and refresh the snapshot once
+        if (fallbackInterval) {
+          stopFallbackPolling();
+          fetchCameraStatus();
+        }
+      };
+      eventSource.onerror = () => {
+        // The browser reconnects on its own with Last-Event-ID; poll meanwhile
+        setCameraSystem(prev => ({ ...prev, systemStatus: 'disconnected' }));
+        startFallbackPolling();
+      };
+    };
+
+    connect();
+    return () => {
+      cancelled = true;
+      stopFallbackPolling();
+      if (eventSource) eventSource.close();
+    };
   }, []);
 
   const incrementCount = (type) => {
@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+Batch classifier test
+Checks resume, the result cache and that the label index tier uses the bin's plate ROI
+"""
+
+import json
+import os
+import sys
+import tempfile
+sys.path.append('classification')
+
+import pytest
+
+np = pytest.importorskip('numpy')
+cv2 = pytest.importorskip('cv2')
+pytest.importorskip('google.generativeai')
+pytest.importorskip('dotenv')
+
+from batch_classify import BatchClassifier, ResultCache, load_completed, open_label_index
+from label_index import LabelIndex
+
+
+def test_load_completed_skips_failures():
+    print("🧪 Testing resume from an interrupted run")
+    print("=" * 45)
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'batch_results.jsonl')
+        with open(path, 'w') as f:
+            f.write(json.dumps({'image': 'a.jpg', 'classification': 'can'}) + '\n')
+            f.write(json.dumps({'image': 'b.jpg', 'classification': 'error'}) + '\n')
+            f.write('{"image": "c.jpg", "classif')  # Cut short by the interruption
+
+        completed = load_completed(path)
+        print(f"✅ Already done: {sorted(completed)}")
+        assert list(completed) == ['a.jpg']  # Failed and half-written images are retried
+        assert load_completed(os.path.join(directory, 'missing.jsonl')) == {}
+
+
+def test_cache_answers_repeat_images():
+    print("\n🧪 Testing the result cache")
+    print("=" * 45)
+
+    os.environ['CLASSIFIER_STUB'] = '1'  # First stub answer is a confident 'can'
+    with tempfile.TemporaryDirectory() as directory:
+        image = os.path.join(directory, 'item.jpg')
+        cv2.imwrite(image, np.full((120, 160, 3), 90, dtype=np.uint8))
+        cache_path = os.path.join(directory, 'cache.json')
+
+        classifier = BatchClassifier(ResultCache(cache_path, save_every=1))
+        first = classifier.classify(image)
+        second = classifier.classify(image)
+        print(f"✅ {first['source']} then {second['source']}")
+        assert (first['classification'], first['source']) == ('can', 'gemini')
+        assert (second['classification'], second['source']) == ('can', 'cache')
+
+        # The cache outlives the run
+        assert len(ResultCache(cache_path).entries) == 1
+    os.environ.pop('CLASSIFIER_STUB')
+
+
+def test_label_index_uses_bin_roi():
+    with tempfile.TemporaryDirectory() as directory:
+        config_path = os.path.join(directory, 'bins.json')
+        with open(config_path, 'w') as f:
+            json.dump([{'id': 'kitchen', 'camera': 0, 'plate_roi': [10, 10, 80, 60]},
+                       {'id': 'lobby', 'camera': 1}], f)
+        index_path = os.path.join(directory, 'label_index.npz')
+        os.environ['BINS_CONFIG'] = config_path
+        os.environ['LABEL_INDEX_PATH'] = index_path
+
+        # What the live service would have stored for the kitchen bin
+        live = LabelIndex(path=os.path.join(directory, 'label_index_kitchen.npz'), roi=(10, 10, 80, 60))
+        live.add(live.embed(np.full((120, 160, 3), 90, dtype=np.uint8)), 'can')
+        live.save()
+
+        batch = open_label_index('kitchen')
+        assert batch.roi == (10, 10, 80, 60) and batch.count == 1
+
+        # A reader cropping differently refuses the embeddings
+        assert LabelIndex(path=live.path).count == 0
+        try:
+            open_label_index('garage')
+            assert False, "an unknown bin should be rejected"
+        except ValueError as e:
+            print(f"✅ Rejected: {e}")
+        finally:
+            os.environ.pop('BINS_CONFIG')
+            os.environ.pop('LABEL_INDEX_PATH')
+
+
+if __name__ == "__main__":
+    test_load_completed_skips_failures()
+    test_cache_answers_repeat_images()
+    test_label_index_uses_bin_roi()
+    print("\n🎯 BATCH CLASSIFY TEST: PASSED!")
@@ -0,0 +1,188 @@
+#!/usr/bin/env python3
+"""
+Camera manager test
+Opens cameras from a fake VideoCapture factory to check the cached-index fast
+path, the parallel probe after a stale cache entry, and FOURCC / resolution
+negotiation falling back to what the device delivers
+"""
+
+import json
+import os
+import tempfile
+import threading
+
+import pytest
+
+np = pytest.importorskip('numpy')
+cv2 = pytest.importorskip('cv2')
+
+from camera.camera_manager import CameraManager
+from camera.capture_format import CaptureFormat, fourcc_to_string
+
+
+class FakeCapture:
+    def __init__(self, device):
+        """A device that only accepts the FOURCCs and sizes it supports; None is a missing device"""
+        self.device = device
+        self.opened = device is not None
+        if self.opened:
+            self.fourcc = device['fourccs'][0]
+            self.width, self.height = device['sizes'][0]
+            self.fps = 30.0
+
+    def isOpened(self):
+        return self.opened
+
+    def set(self, prop, value):
+        if prop == cv2.CAP_PROP_FOURCC:
+            fourcc = fourcc_to_string(value)
+            if fourcc not in self.device['fourccs']:
+                return False
+            self.fourcc = fourcc
+        elif prop == cv2.CAP_PROP_FRAME_WIDTH:
+            if not any(width == value for width, _ in self.device['sizes']):
+                return False
+            self.width = int(value)
+        elif prop == cv2.CAP_PROP_FRAME_HEIGHT:
+            if (self.width, int(value)) not in self.device['sizes']:
+                self.width, self.height = self.device['sizes'][0]
+                return False
+            self.height = int(value)
+        elif prop == cv2.CAP_PROP_FPS:
+            self.fps = float(value)
+        return True
+
+    def get(self, prop):
+        if prop == cv2.CAP_PROP_FOURCC:
+            return float(cv2.VideoWriter_fourcc(*self.fourcc))
+        if prop == cv2.CAP_PROP_FRAME_WIDTH:
+            return float(self.width)
+        if prop == cv2.CAP_PROP_FRAME_HEIGHT:
+            return float(self.height)
+        if prop == cv2.CAP_PROP_FPS:
+            return self.fps
+        return 0.0
+
+    def read(self):
+        return True, np.zeros((self.height, self.width, 3), dtype=np.uint8)
+
+    def release(self):
+        self.opened = False
+
+
+class FakeFactory:
+    def __init__(self, devices):
+        """devices maps an index to its capabilities; every open is recorded"""
+        self.devices = devices
+        self.opened = []
+        self.lock = threading.Lock()
+
+    def __call__(self, index):
+        with self.lock:
+            self.opened.append(index)
+        return FakeCapture(self.devices.get(index))
+
+
+WEBCAM = {'fourccs': ['YUYV', 'MJPG'], 'sizes': [(640, 480), (1280, 720)]}
+
+
+def make_manager(cache_path, factory, capture_format=None):
+    return CameraManager('test', indices=range(5), capture_format=capture_format or CaptureFormat(),
+                         cache_path=cache_path, capture_factory=factory, standby_timeout=0)
+
+
+def test_cached_index_opens_first():
+    print("🧪 Testing the cached camera index")
+    print("=" * 45)
+
+    with tempfile.TemporaryDirectory() as directory:
+        cache_path = os.path.join(directory, 'cameras.json')
+        factory = FakeFactory({2: WEBCAM})
+
+        # First run probes and remembers the camera
+        manager = make_manager(cache_path, factory)
+        assert manager.open() is not None
+        assert manager.get_stats()['last_source'] == 'probe'
+        with open(cache_path) as f:
+            assert json.load(f)['test']['index'] == 2
+        manager.close()
+
+        # Next run opens only the cached device
+        factory.opened.clear()
+        manager = make_manager(cache_path, factory)
+        assert manager.open() is not None
+        stats = manager.get_stats()
+        print(f"✅ Reopened {factory.opened} from cache: {stats['last_source']}")
+        assert factory.opened == [2]
+        assert stats['last_source'] == 'cached' and stats['cache_hits'] == 1 and stats['probes'] == 0
+        manager.close()
+
+
+def test_stale_cache_falls_back_to_probe():
+    print("\n🧪 Testing a stale cache entry")
+    print("=" * 45)
+
+    with tempfile.TemporaryDirectory() as directory:
+        cache_path = os.path.join(directory, 'cameras.json')
+        with open(cache_path, 'w') as f:
+            json.dump({'test': {'index': 3}, 'other_service': {'index': 0}}, f)
+
+        # Camera 3 was unplugged; camera 1 is the only one left
+        factory = FakeFactory({1: WEBCAM})
+        manager = make_manager(cache_path, factory)
+        cap = manager.open()
+        stats = manager.get_stats()
+        print(f"✅ Opened camera {stats['device_index']} after trying {sorted(factory.opened)}")
+        assert cap is not None and stats['device_index'] == 1
+        assert stats['last_source'] == 'probe' and stats['cache_hits'] == 0
+        assert factory.opened.count(3) == 1  # The cached index is not probed twice
+        with open(cache_path) as f:
+            cache = json.load(f)
+        assert cache['test']['index'] == 1 and cache['other_service'] == {'index': 0}
+        manager.close()
+
+        # No camera at all
+        manager = make_manager(cache_path, FakeFactory({}))
+        assert manager.open() is None and manager.get_stats()['failures'] == 1
+
+
+def test_rejected_mode_falls_back_to_default():
+    print("\n🧪 Testing FOURCC and resolution fallbacks")
+    print("=" * 45)
+
+    with tempfile.TemporaryDirectory() as directory:
+        cache_path = os.path.join(directory, 'cameras.json')
+
+        # The webcam has no H264: it stays on its default YUYV but still opens
+        manager = make_manager(cache_path, FakeFactory({0: WEBCAM}), CaptureFormat.parse('H264:640x480@30'))
+        cap = manager.open()
+        report = manager.get_stats()['format']
+        print(f"✅ Asked for {report['requested']}, delivered {report['delivered']}")
+        assert cap is not None
+        assert report['mismatches'] == ['fourcc'] and report['delivered']['fourcc'] == 'YUYV'
+        with open(cache_path) as f:
+            assert json.load(f)['test']['format'] == report
+        manager.close()
+
+        # A supported FOURCC is applied before the size
+        manager = make_manager(cache_path, FakeFactory({0: WEBCAM}), CaptureFormat.parse('MJPG:1280x720'))
+        manager.open()
+        report = manager.get_stats()['format']
+        assert report['mismatches'] == [] and report['delivered']['fourcc'] == 'MJPG'
+        manager.close()
+
+        # An unsupported size falls back to the default one, read from the first frame
+        manager = make_manager(cache_path, FakeFactory({0: WEBCAM}), CaptureFormat.parse('1920x1080'))
+        manager.open()
+        report = manager.get_stats()['format']
+        print(f"✅ Asked for {report['requested']}, delivered {report['delivered']}")
+        assert report['mismatches'] == ['resolution']
+        assert (report['delivered']['width'], report['delivered']['height']) == (640, 480)
+        manager.close()
+
+
+if __name__ == "__main__":
+    test_cached_index_opens_first()
+    test_stale_cache_falls_back_to_probe()
+    test_rejected_mode_falls_back_to_default()
+    print("\n🎯 CAMERA MANAGER TEST: PASSED!")
@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+"""
+Classification executor test
+Checks the bounded queue, task states, cancellation and deadlines
+"""
+
+import sys
+import threading
+import time
+sys.path.append('classification')
+
+from classification_executor import ClassificationExecutor
+
+
+def wait_until(condition, timeout=2.0):
+    deadline = time.time() + timeout
+    while not condition() and time.time() < deadline:
+        time.sleep(0.01)
+    return condition()
+
+
+def test_bounded_queue_and_states():
+    print("🧪 Testing bounded queue and task states")
+    print("=" * 45)
+
+    release = threading.Event()
+    acted = []
+
+    def run_task(task):
+        release.wait(2)
+        if not task.is_stale():
+            acted.append(task.frame)
+
+    executor = ClassificationExecutor(run_task, workers=1, max_pending=1, deadline=5.0)
+    executor.start()
+
+    first = executor.submit('frame-1')
+    assert wait_until(lambda: first.state == 'running')
+    second = executor.submit('frame-2')
+    assert second.state == 'queued'
+    assert executor.submit('frame-3') is None  # Queue holds one pending task
+
+    release.set()
+    assert wait_until(lambda: not executor.is_busy())
+    executor.stop()
+
+    stats = executor.get_stats()
+    print(f"✅ States: {first.state}, {second.state} | stats: done={stats['done']} rejected={stats['rejected']}")
+    assert acted == ['frame-1', 'frame-2']
+    assert stats['done'] == 2 and stats['rejected'] == 1
+    assert first.summary()['queue_wait_ms'] is not None
+
+
+def test_cancel_running_task():
+    print("\n🧪 Testing cancellation of a stale running task")
+    print("=" * 45)
+
+    release = threading.Event()
+    acted = []
+
+    def run_task(task):
+        release.wait(2)
+        if not task.is_stale():
+            acted.append(task.frame)
+
+    executor = ClassificationExecutor(run_task, workers=2, max_pending=1, deadline=5.0)
+    executor.start()
+
+    task = executor.submit('old-item', plate_generation=1)
+    assert wait_until(lambda: task.state == 'running')
+    cancelled = executor.cancel_where(lambda t: t.context['plate_generation'] < 2, 'plate changed')
+
+    # The cancelled task no longer counts as busy even though its call is still in flight
+    assert cancelled == 1 and not executor.is_busy()
+    release.set()
+    time.sleep(0.1)
+    executor.stop()
+
+    print(f"✅ {task.state} ({task.cancel_reason}), result acted on: {acted}")
+    assert task.state == 'cancelled'
+    assert acted == []
+    assert executor.get_stats()['cancelled'] == 1
+
+
+def test_deadline_expiry():
+    acted = []
+
+    def run_task(task):
+        time.sleep(0.05)
+        if not task.is_stale():
+            acted.append(task.frame)
+
+    executor = ClassificationExecutor(run_task, workers=1, max_pending=1, deadline=0.01)
+    executor.start()
+    task = executor.submit('slow')
+    assert wait_until(lambda: not executor.is_busy())
+    executor.stop()
+
+    assert task.state == 'expired'
+    assert acted == []
+
+
+def test_shared_pool_owners():
+    print("\n🧪 Testing one pool shared by several bins")
+    print("=" * 45)
+
+    release = threading.Event()
+    acted = {'kitchen': [], 'lobby': []}
+
+    def run_for(bin_id):
+        def run_task(task):
+            release.wait(2)
+            if not task.is_stale():
+                acted[bin_id].append(task.frame)
+        return run_task
+
+    executor = ClassificationExecutor(workers=1, max_pending=2, deadline=5.0)
+    executor.start()
+    kitchen = executor.submit('k-1', run_task=run_for('kitchen'), bin_id='kitchen')
+    lobby = executor.submit('l-1', run_task=run_for('lobby'), bin_id='lobby')
+
+    def owned_by(bin_id):
+        return lambda task: task.context['bin_id'] == bin_id
+
+    assert executor.is_busy(owned_by('kitchen')) and executor.is_busy(owned_by('lobby'))
+    assert executor.cancel_where(owned_by('lobby'), 'stopped') == 1
+    assert not executor.is_busy(owned_by('lobby')) and executor.is_busy(owned_by('kitchen'))
+
+    release.set()
+    assert wait_until(lambda: not executor.is_busy())
+    executor.stop()
+
+    print(f"✅ kitchen={kitchen.state} lobby={lobby.state} acted={acted}")
+    assert acted == {'kitchen': ['k-1'], 'lobby': []}
+
+
+if __name__ == "__main__":
+    test_bounded_queue_and_states()
+    test_cancel_running_task()
+    test_deadline_expiry()
+    test_shared_pool_owners()
+    print("\n🎯 CLASSIFICATION EXECUTOR TEST: PASSED!")
@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""
+Empty-plate model test
+Checks that small items are escalated while lighting changes stay local
+"""
+
+import sys
+sys.path.append('classification')
+
+import pytest
+
+np = pytest.importorskip('numpy')
+cv2 = pytest.importorskip('cv2')
+
+from empty_plate import EmptyPlateModel
+
+rng = np.random.default_rng(0)
+
+
+def make_plate():
+    """Brown plate with a little texture"""
+    plate = np.zeros((480, 640, 3), dtype=np.uint8)
+    plate[:] = (40, 70, 110)
+    texture = rng.integers(0, 25, (480, 640, 1)).astype(np.uint8)
+    return cv2.GaussianBlur(cv2.add(plate, np.repeat(texture, 3, axis=2)), (5, 5), 0)
+
+
+def noisy(frame):
+    return cv2.add(frame, rng.integers(0, 6, frame.shape).astype(np.uint8))
+
+
+def trained_model(plate):
+    model = EmptyPlateModel()
+    for _ in range(5):
+        model.add_empty_sample(noisy(plate))
+    return model
+
+
+def test_empty_and_lighting_stay_local():
+    print("🧪 Testing empty plate and lighting changes")
+    print("=" * 45)
+
+    plate = make_plate()
+    model = trained_model(plate)
+    empty, scores = model.check(noisy(plate))
+    print(f"✅ Empty plate: {scores}")
+    assert empty
+    assert model.check(cv2.convertScaleAbs(noisy(plate), alpha=0.8))[0]  # Dimmer room
+
+
+def test_small_items_are_escalated():
+    print("\n🧪 Testing small items on the plate")
+    print("=" * 45)
+
+    plate = make_plate()
+    model = trained_model(plate)
+
+    can = noisy(plate)
+    cv2.rectangle(can, (300, 200), (330, 250), (180, 180, 190), -1)
+    empty, scores = model.check(can)
+    print(f"✅ Small can: {scores}")
+    assert not empty
+    assert scores['ssim'] >= model.ssim_threshold  # The global score alone would have missed it
+
+    # Red wrapper about as bright as the plate: only the colour changes
+    wrapper = noisy(plate)
+    cv2.circle(wrapper, (200, 300), 15, (20, 20, 200), -1)
+    assert not model.check(wrapper)[0]
+    assert model.get_stats()['escalated'] == 2
+
+
+def test_needs_samples_before_deciding():
+    model = EmptyPlateModel(min_samples=3)
+    plate = make_plate()
+    model.add_empty_sample(plate)
+    assert model.check(plate) == (False, None)
+
+
+if __name__ == "__main__":
+    test_empty_and_lighting_stay_local()
+    test_small_items_are_escalated()
+    test_needs_samples_before_deciding()
+    print("\n🎯 EMPTY PLATE TEST: PASSED!")
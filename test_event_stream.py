@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""
+Event stream test
+Checks sequence numbering, resume-from-sequence and resync on history gaps
+"""
+
+import sys
+sys.path.append('classification')
+
+from event_stream import EventStream
+
+
+def test_resume_from_sequence():
+    print("🧪 Testing event stream resume")
+    print("=" * 45)
+
+    stream = EventStream(history=4, heartbeat_interval=0.01)
+    for i in range(3):
+        stream.publish('plate', {'state': f"state_{i}"})
+
+    events, complete = stream.events_since(1)
+    print(f"✅ Events after #1: {[event['seq'] for event in events]}")
+    assert [event['seq'] for event in events] == [2, 3]
+    assert complete
+
+    # Resuming from the latest sequence yields nothing new
+    assert stream.events_since(3) == ([], True)
+
+    # Generator emits the retry hint, then the buffered events as SSE messages
+    messages = stream.stream(since=1)
+    assert next(messages).startswith("retry:")
+    message = next(messages)
+    assert message.startswith("id: 2\nevent: plate\n")
+    assert '"state": "state_1"' in message
+    messages.close()
+    assert stream.get_stats()['subscribers'] == 0
+
+
+def test_resync_on_gap():
+    print("\n🧪 Testing event stream resync")
+    print("=" * 45)
+
+    stream = EventStream(history=2, heartbeat_interval=0.01)
+    for i in range(5):
+        stream.publish('classification', {'classification': 'can', 'n': i})
+
+    # Events 2-3 were evicted, so the client must resync
+    events, complete = stream.events_since(1)
+    assert not complete
+    assert [event['seq'] for event in events] == [4, 5]
+
+    # A client ahead of a restarted server also resyncs
+    assert not stream.events_since(99)[1]
+
+    messages = stream.stream(since=1)
+    next(messages)
+    assert next(messages).startswith("event: resync")
+    assert next(messages).startswith("id: 4\n")
+    messages.close()
+    print("✅ Resync emitted before replaying buffered events")
+
+
+def test_tentative_results_are_not_counted():
+    print("\n🧪 Testing tentative classification events")
+    print("=" * 45)
+
+    stream = EventStream()
+    stream.publish_classification({'classification': 'can', 'confidence': 0.9})
+    stream.publish_classification({'classification': 'paper', 'confidence': 0.4, 'tentative': True})
+
+    # The UI tallies 'classification' events only
+    events, _ = stream.events_since(0)
+    counted = [event['data']['classification'] for event in events if event['type'] == 'classification']
+    assert counted == ['can']
+    assert events[1]['type'] == 'classification_tentative'
+    print(f"✅ Counted {counted}, tentative sent as {events[1]['type']}")
+
+
+if __name__ == "__main__":
+    test_resume_from_sequence()
+    test_resync_on_gap()
+    test_tentative_results_are_not_counted()
+    print("\n🎯 EVENT STREAM TEST: PASSED!")
@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""
+MJPEG broadcast hub test
+Checks that subscribers share one encode per frame and that a stalled
+subscriber skips to the newest frame without holding up the others
+"""
+
+import time
+
+import pytest
+
+pytest.importorskip('cv2')
+
+import camera.frame_hub as frame_hub
+from camera.frame_hub import FrameHub
+
+
+class FakeBuffer:
+    def __init__(self, data):
+        self.data = data
+
+    def tobytes(self):
+        return self.data
+
+
+class CountingEncoder:
+    def __init__(self):
+        """Stand-in for cv2.imencode while in use: frames are plain strings, every encode is counted"""
+        self.calls = []
+
+    def __call__(self, ext, frame, params):
+        self.calls.append(frame)
+        return True, FakeBuffer(frame.encode())
+
+    def __enter__(self):
+        self.original = frame_hub.cv2.imencode
+        frame_hub.cv2.imencode = self
+        return self
+
+    def __exit__(self, *exc_info):
+        frame_hub.cv2.imencode = self.original
+
+
+def test_one_encode_per_frame():
+    print("🧪 Testing encode-once broadcast")
+    print("=" * 45)
+
+    hub = FrameHub(idle_timeout=0.01)
+    subscribers = [hub.stream() for _ in range(3)]
+
+    with CountingEncoder() as encoder:
+        for i in range(3):
+            hub.publish(f"frame_{i}")
+            parts = [next(subscriber) for subscriber in subscribers]
+            assert all(part == parts[0] for part in parts)
+            assert f"frame_{i}".encode() in parts[0]
+
+    print(f"✅ 3 frames x 3 subscribers -> {len(encoder.calls)} encodes")
+    assert encoder.calls == ['frame_0', 'frame_1', 'frame_2']
+    assert hub.get_stats()['frames_sent'] == 9 and hub.has_subscribers()
+    for subscriber in subscribers:
+        subscriber.close()
+    assert not hub.has_subscribers()
+
+
+def test_stalled_subscriber_is_skipped():
+    print("\n🧪 Testing a stalled subscriber")
+    print("=" * 45)
+
+    hub = FrameHub(idle_timeout=0.01)
+    live, stalled = hub.stream(), hub.stream()
+
+    with CountingEncoder() as encoder:
+        hub.publish("frame_0")
+        next(live)
+        next(stalled)
+
+        # The stalled client reads nothing while the live one keeps up
+        start_time = time.perf_counter()
+        for i in range(1, 5):
+            hub.publish(f"frame_{i}")
+            assert f"frame_{i}".encode() in next(live)
+        assert time.perf_counter() - start_time < 0.5
+
+        # When it reads again it gets the newest frame, not a backlog
+        part = next(stalled)
+
+    print(f"✅ Stalled subscriber resumed on the newest frame: {hub.get_stats()}")
+    assert b"frame_4" in part
+    assert hub.get_stats()['frames_skipped'] == 3
+    assert len(encoder.calls) == 5  # The catch-up reused the live subscriber's encode
+    live.close()
+    stalled.close()
+
+
+if __name__ == "__main__":
+    test_one_encode_per_frame()
+    test_stalled_subscriber_is_skipped()
+    print("\n🎯 FRAME HUB TEST: PASSED!")
@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""
+Capture pipeline ring buffer test
+Checks drop-oldest semantics and latest-frame handoff between stages
+"""
+
+import threading
+import time
+
+from camera.pipeline import FrameRing, StageStats
+
+
+def test_drop_oldest():
+    print("🧪 Testing ring buffer drop-oldest semantics")
+    print("=" * 45)
+
+    ring = FrameRing(capacity=3)
+    for i in range(5):
+        ring.put(f"frame_{i}")
+
+    # Two unconsumed frames were evicted
+    print(f"✅ Ring stats: {ring.stats}")
+    assert ring.stats['dropped'] == 2
+    assert [entry[2] for entry in ring.get_recent(10)] == ['frame_2', 'frame_3', 'frame_4']
+
+    # Consumers always get the newest frame and skip stale ones
+    sequence, _, item = ring.get_latest()
+    assert (sequence, item) == (5, 'frame_4')
+    assert ring.depth() == 0
+    assert ring.get_latest(after=sequence, timeout=0.01) is None
+
+
+def test_stage_handoff():
+    print("\n🧪 Testing stage handoff")
+    print("=" * 45)
+
+    ring = FrameRing(capacity=2)
+    stats = StageStats('analysis')
+    received = []
+
+    def consumer():
+        last_sequence = 0
+        while len(received) < 1:
+            entry = ring.get_latest(last_sequence, timeout=1)
+            if entry is None:
+                break
+            last_sequence = entry[0]
+            received.append(entry[2])
+            stats.record(0.001)
+
+    thread = threading.Thread(target=consumer)
+    thread.start()
+    time.sleep(0.01)
+    ring.put('frame_0')
+    thread.join(timeout=2)
+
+    print(f"✅ Consumer received: {received}")
+    assert received == ['frame_0']
+    assert stats.get_stats(ring)['processed'] == 1
+    assert stats.get_stats(ring)['queue_depth'] == 0
+
+
+def test_restart_after_clear():
+    print("\n🧪 Testing stop, clear and restart")
+    print("=" * 45)
+
+    ring = FrameRing(capacity=3)
+    ring.put('frame_0')
+    ring.put('frame_1')
+    ring.clear()
+
+    # A restarted consumer begins again from sequence 0 and must wait, not crash
+    assert ring.get_latest(0, timeout=0.01) is None
+    received = []
+    thread = threading.Thread(target=lambda: received.append(ring.get_latest(0, timeout=1)))
+    thread.start()
+    time.sleep(0.01)
+    ring.put('frame_2')
+    thread.join(timeout=2)
+
+    print(f"✅ Restarted consumer received: {received}")
+    assert received[0][0] == 3 and received[0][2] == 'frame_2'
+
+
+if __name__ == "__main__":
+    test_drop_oldest()
+    test_stage_handoff()
+    test_restart_after_clear()
+    print("\n🎯 FRAME RING TEST: PASSED!")
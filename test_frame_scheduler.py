@@ -0,0 +1,49 @@
+#!/usr/bin/env python3
+"""
+Frame scheduler test
+Checks deadline pacing, idle mode entry and wake-up on trigger
+"""
+
+import time
+
+from camera.frame_scheduler import FrameScheduler
+
+
+def test_deadline_pacing():
+    print("🧪 Testing deadline pacing")
+    print("=" * 45)
+
+    scheduler = FrameScheduler(active_fps=100, idle_fps=10, idle_after=60)
+    start_time = time.monotonic()
+    for _ in range(10):
+        time.sleep(0.005)  # Simulated work is absorbed into the 10ms period
+        scheduler.wait()
+    elapsed = time.monotonic() - start_time
+
+    print(f"✅ 10 frames at 100 fps took {elapsed * 1000:.0f}ms")
+    assert 0.08 <= elapsed < 0.2
+    assert scheduler.get_stats()['power_state'] == 'active'
+
+
+def test_idle_and_wake():
+    print("\n🧪 Testing idle mode and wake-up")
+    print("=" * 45)
+
+    scheduler = FrameScheduler(active_fps=100, idle_fps=10, idle_after=0.02)
+    time.sleep(0.03)
+    scheduler.wait()
+    stats = scheduler.get_stats()
+    print(f"✅ After quiet period: {stats['power_state']} at {stats['target_fps']} fps")
+    assert stats['power_state'] == 'idle'
+    assert stats['idle_entries'] == 1
+
+    scheduler.trigger()
+    assert scheduler.get_stats()['power_state'] == 'active'
+    assert scheduler.get_stats()['wakeups'] == 1
+    assert abs(scheduler.period() - 0.01) < 1e-9
+
+
+if __name__ == "__main__":
+    test_deadline_pacing()
+    test_idle_and_wake()
+    print("\n🎯 FRAME SCHEDULER TEST: PASSED!")
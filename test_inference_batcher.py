@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""
+Inference batcher test
+Checks that requests from concurrent callers share model calls and that a
+lone caller isn't held back waiting for a batch to fill
+"""
+
+import sys
+import threading
+import time
+sys.path.append('humandetect')
+
+from inference_batcher import DynamicBatcher
+
+
+def slow_double(payloads):
+    """Stand-in model: 20ms per call whatever the batch size"""
+    time.sleep(0.02)
+    return [payload * 2 for payload in payloads]
+
+
+def test_concurrent_callers_are_batched():
+    print("🧪 Testing batching across callers")
+    print("=" * 45)
+
+    batcher = DynamicBatcher(slow_double, max_batch=4, max_wait=0.01)
+    batcher.start()
+    results = {}
+
+    def caller(number):
+        for i in range(5):
+            value = number * 100 + i
+            results[value] = batcher.submit(value).wait(timeout=2.0)
+
+    threads = [threading.Thread(target=caller, args=(number,)) for number in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    batcher.stop()
+
+    stats = batcher.get_stats()
+    print(f"✅ {stats['requests']} requests in {stats['batches']} batches | sizes {stats['batch_sizes']}")
+    assert all(result == value * 2 for value, result in results.items()) and len(results) == 20
+    assert stats['requests'] == 20 and stats['batches'] < 20
+    assert max(stats['batch_sizes']) <= 4
+    assert stats['latency_ms']['total']['p95'] >= stats['latency_ms']['infer']['p50']
+
+
+def test_lone_caller_does_not_linger():
+    batcher = DynamicBatcher(slow_double, max_batch=8, max_wait=0.5, expect_more=lambda: False)
+    batcher.start()
+    request = batcher.submit(21)
+    assert request.wait(timeout=2.0) == 42
+    batcher.stop()
+    # Only the other-callers hint lets a batch wait for more
+    assert request.timings['queue_ms'] < 100 and request.timings['batch_size'] == 1
+
+
+def test_errors_and_backpressure():
+    def broken(payloads):
+        raise ValueError("model failed")
+
+    batcher = DynamicBatcher(broken, max_queue=1)
+    first = batcher.submit(1)
+    assert batcher.submit(2) is None  # Queue full before the thread starts
+    batcher.start()
+    try:
+        first.wait(timeout=2.0)
+        assert False, "the batch error should reach the caller"
+    except ValueError as e:
+        print(f"✅ Error passed to the caller: {e}")
+    batcher.stop()
+    stats = batcher.get_stats()
+    assert stats['rejected'] == 1 and stats['errors'] == 1
+
+
+if __name__ == "__main__":
+    test_concurrent_callers_are_batched()
+    test_lone_caller_does_not_linger()
+    test_errors_and_backpressure()
+    print("\n🎯 INFERENCE BATCHER TEST: PASSED!")
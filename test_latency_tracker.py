@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""
+Latency tracker test
+Checks per-stage durations, histogram buckets and the JSONL trace log
+"""
+
+import json
+import os
+import sys
+import tempfile
+sys.path.append('classification')
+
+from latency_tracker import LatencyTracker
+
+
+def test_stage_durations():
+    print("🧪 Testing per-stage durations")
+    print("=" * 45)
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        log_path = os.path.join(temp_dir, 'traces.jsonl')
+        tracker = LatencyTracker(trace_log=log_path)
+
+        trace = tracker.start()
+        trace.mark('capture', 100.0)
+        trace.mark('motion_trigger', 100.03)
+        trace.mark('frame_selected', 100.035)
+        trace.mark('model_response', 101.2)
+        trace.finish('gemini')
+        trace.finish('gemini')  # Second finish is ignored
+
+        summary = tracker.get_summary()
+        print(f"✅ Summary: {summary}")
+        assert abs(summary['motion_trigger']['avg_ms'] - 30) < 0.5
+        assert abs(summary['model_response']['avg_ms'] - 1165) < 0.5
+        assert abs(summary['total']['avg_ms'] - 1200) < 0.5
+        assert 'capture' not in summary
+
+        metrics = tracker.get_metrics()
+        assert metrics['finished'] == 1
+        assert metrics['histograms']['motion_trigger']['buckets']['50'] == 1
+        assert metrics['histograms']['model_response']['buckets']['2500'] == 1
+
+        with open(log_path) as f:
+            entries = [json.loads(line) for line in f]
+        print(f"✅ Trace log: {entries[0]['stages_ms']}")
+        assert len(entries) == 1
+        assert entries[0]['outcome'] == 'gemini'
+        assert entries[0]['marks'] == ['capture', 'motion_trigger', 'frame_selected', 'model_response']
+
+
+def test_log_disabled():
+    tracker = LatencyTracker(trace_log='')
+    trace = tracker.start()
+    trace.mark('frame_selected')
+    trace.finish('no_object')
+    assert tracker.get_metrics()['recent_traces'][0]['stages_ms'] == {'total': 0.0}
+
+
+def test_finish_callback():
+    finished = []
+    tracker = LatencyTracker(trace_log='', on_finish=lambda trace, entry: finished.append((trace, entry)))
+    trace = tracker.start()
+    trace.attach(result={'classification': 'can'})
+    trace.mark('capture')
+    trace.finish('sorted')
+
+    assert len(finished) == 1
+    assert finished[0][0].attachments['result']['classification'] == 'can'
+    assert finished[0][1]['outcome'] == 'sorted'
+
+
+if __name__ == "__main__":
+    test_stage_durations()
+    test_log_disabled()
+    test_finish_callback()
+    print("\n🎯 LATENCY TRACKER TEST: PASSED!")
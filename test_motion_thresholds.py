@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""
+Adaptive motion threshold test
+Checks that the contour-area trigger follows idle-plate noise
+"""
+
+import random
+import sys
+sys.path.append('classification')
+
+from motion_thresholds import AdaptiveMotionThreshold
+
+
+def feed_idle(thresholds, areas, fg_ratio, start=0.0):
+    now = start
+    for area in areas:
+        now += 0.2
+        thresholds.observe(area, fg_ratio, idle=True, ready=True, now=now)
+    return now
+
+
+def test_threshold_rises_with_flicker():
+    print("🧪 Testing threshold under flickering light")
+    print("=" * 45)
+
+    random.seed(1)
+    thresholds = AdaptiveMotionThreshold(base_area=5000, min_samples=100, adjust_every=5.0)
+
+    # Flicker produces blobs up to ~4000 px, with occasional 6000 px bursts
+    noise = [random.uniform(500, 4000) for _ in range(300)]
+    now = feed_idle(thresholds, noise, fg_ratio=0.05)
+    for area in (6000, 6500, 6200):
+        thresholds.record_false_trigger(area)
+    feed_idle(thresholds, noise[:100], fg_ratio=0.05, start=now)
+
+    stats = thresholds.get_stats()
+    print(f"✅ Threshold {stats['area_threshold']} px, variance {stats['var_threshold']}")
+    assert stats['area_threshold'] > 6500
+    assert stats['var_threshold'] > 50  # High idle foreground ratio makes the subtractor less sensitive
+
+    # A flicker burst that would have triggered the fixed threshold is now ignored
+    assert not thresholds.observe(6000, 0.05, idle=True, ready=True, now=now + 100)
+    assert thresholds.get_stats()['api_calls_avoided'] >= 1
+    # A real item is still well above the noise
+    assert thresholds.observe(25000, 0.2, idle=True, ready=True, now=now + 100.2)
+
+
+def test_threshold_falls_when_quiet():
+    thresholds = AdaptiveMotionThreshold(base_area=5000, min_area=1500, min_samples=100, adjust_every=5.0)
+    feed_idle(thresholds, [random.uniform(0, 300) for _ in range(200)], fg_ratio=0.0005)
+
+    stats = thresholds.get_stats()
+    assert stats['area_threshold'] == 1500  # Clamped at the floor
+    assert stats['var_threshold'] < 50
+    # A small item the fixed threshold would have missed now triggers
+    assert thresholds.observe(3000, 0.01, idle=True, ready=True, now=1000)
+    assert thresholds.get_stats()['extra_triggers'] == 1
+
+
+def test_not_enough_samples_keeps_base():
+    thresholds = AdaptiveMotionThreshold(base_area=5000, min_samples=100)
+    feed_idle(thresholds, [100] * 50, fg_ratio=0.0)
+    assert thresholds.area_threshold == 5000
+
+
+def test_outlier_does_not_ratchet_threshold():
+    print("\n🧪 Testing that one outlier can't hide real items")
+    print("=" * 45)
+
+    random.seed(2)
+    thresholds = AdaptiveMotionThreshold(base_area=5000, min_area=1500, min_samples=100, adjust_every=5.0)
+    now = feed_idle(thresholds, [random.uniform(100, 600) for _ in range(300)], fg_ratio=0.001)
+    assert thresholds.area_threshold == 1500
+
+    # One large trigger found an empty plate, and one idle frame had a big blob
+    thresholds.record_false_trigger(20000)
+    now = feed_idle(thresholds, [20000] + [random.uniform(100, 600) for _ in range(100)], fg_ratio=0.001,
+                    start=now)
+    # An item resting on the plate while nothing is running is not noise
+    now = feed_idle(thresholds, [25000] * 100, fg_ratio=0.05, start=now)
+
+    stats = thresholds.get_stats()
+    print(f"✅ Threshold {stats['area_threshold']} px, variance {stats['var_threshold']}")
+    assert stats['area_threshold'] < 5000
+    assert stats['var_threshold'] <= 50
+    assert thresholds.observe(25000, 0.05, idle=True, ready=True, now=now + 0.2)
+
+
+def test_old_samples_expire():
+    thresholds = AdaptiveMotionThreshold(base_area=5000, min_samples=100, max_age=60.0, adjust_every=5.0)
+    now = feed_idle(thresholds, [2000] * 200, fg_ratio=0.01)
+    assert thresholds.area_threshold == 4000
+    # The noisy period ages out once the plate has been quiet for a while
+    feed_idle(thresholds, [200] * 400, fg_ratio=0.01, start=now + 120)
+    assert thresholds.area_threshold == 1500
+
+
+if __name__ == "__main__":
+    test_threshold_rises_with_flicker()
+    test_threshold_falls_when_quiet()
+    test_not_enough_samples_keeps_base()
+    test_outlier_does_not_ratchet_threshold()
+    test_old_samples_expire()
+    print("\n🎯 ADAPTIVE MOTION THRESHOLD TEST: PASSED!")
@@ -0,0 +1,165 @@
+#!/usr/bin/env python3
+"""
+Robot actuation scheduler test
+Runs the actuation worker against a fake robot to check phase ordering and timings
+"""
+
+import sys
+import threading
+import time
+sys.path.append('classification')
+
+from robot_actuator import RobotActuator, estimate_motion_time, motor_targets, travel_time
+from latency_tracker import LatencyTracker
+
+
+def test_motion_estimates():
+    print("🧪 Testing motion time estimates")
+    print("=" * 45)
+
+    # Targets are clamped to the firmware LIMIT
+    assert motor_targets(65, 40) == (105, 25)
+    assert motor_targets(300, 0) == (200, 200)
+
+    # Short moves never reach full speed, long moves do
+    assert travel_time(0) == 0.0
+    assert abs(travel_time(100) - 2 * (100 / 1000) ** 0.5) < 1e-9
+    assert travel_time(200) > travel_time(100)
+
+    move_time = estimate_motion_time((0, 0), (65, 40))
+    print(f"✅ Neutral -> plastic bin: {move_time:.3f}s")
+    assert 0 < move_time < 2.0
+    assert estimate_motion_time((65, 40), (65, 40)) == 0.0
+
+
+def test_actuator_phases():
+    print("\n🧪 Testing actuation worker phases")
+    print("=" * 45)
+
+    sent = []
+    events = []
+
+    def fake_send(spin, pivot):
+        sent.append((spin, pivot))
+        return True
+
+    actuator = RobotActuator(
+        fake_send, dwell_time=0, settle_time=0, motion_margin=0,
+        on_busy=lambda: events.append('busy'),
+        on_idle=lambda: events.append('idle')
+    )
+    tracker = LatencyTracker(trace_log='')
+    trace = tracker.start()
+    trace.mark('model_response')
+
+    actuator.start()
+    assert actuator.enqueue('can', 65, 40, trace)
+
+    deadline = time.time() + 5
+    while 'idle' not in events and time.time() < deadline:
+        time.sleep(0.01)
+    actuator.stop()
+
+    print(f"✅ Commands sent: {sent}")
+    assert sent == [(65, 40), (0, 0)]
+    assert events == ['busy', 'idle']
+
+    timing = actuator.timings[-1]
+    print(f"✅ Sort total: {timing['total']:.3f}s")
+    assert timing['success']
+    for phase in ('queue_wait', 'move_request', 'move_motion', 'dwell', 'reset_request', 'reset_motion'):
+        assert phase in timing
+    assert actuator.get_status()['stats']['completed'] == 1
+
+    # The item trace is finished by the worker with robot marks
+    recent = tracker.get_metrics()['recent_traces'][-1]
+    print(f"✅ Item trace: {recent['marks']} -> {recent['outcome']}")
+    assert recent['marks'] == ['model_response', 'robot_move', 'robot_reset']
+    assert recent['outcome'] == 'sorted'
+
+
+def test_failed_sequence_resets_arm():
+    print("\n🧪 Testing reset after a failed sort sequence")
+    print("=" * 45)
+
+    sent = []
+
+    def fake_send(spin, pivot):
+        sent.append((spin, pivot))
+        return True
+
+    def failed_sequence(spin, pivot, dwell):
+        return {'success': False, 'request_time': 0.01, 'motion_time': 0.0}
+
+    actuator = RobotActuator(fake_send, send_sequence=failed_sequence, dwell_time=0, settle_time=0,
+                             motion_margin=0)
+    timing = actuator._execute({'classification': 'can', 'spin': 65, 'pivot': 40,
+                                'enqueued_at': time.time()})
+
+    print(f"✅ Commands after the failed sequence: {sent}")
+    assert sent == [(0, 0)]
+    assert not timing['success'] and 'reset_request' in timing
+    assert actuator.position == (0, 0)
+    assert actuator.get_status()['stats']['failed'] == 1
+
+
+def test_dropped_move_is_not_success():
+    print("\n🧪 Testing moves the robot never confirms")
+    print("=" * 45)
+
+    confirms = iter([False, True])
+    actuator = RobotActuator(lambda spin, pivot: True, dwell_time=0, settle_time=0, motion_margin=0,
+                             confirm_move=lambda max_wait: next(confirms))
+    timing = actuator._execute({'classification': 'can', 'spin': 65, 'pivot': 40,
+                                'enqueued_at': time.time()})
+
+    print(f"✅ Unconfirmed move: success={timing['success']}")
+    assert not timing['success'] and 'dwell' not in timing
+    assert actuator.position == (0, 0)
+    assert actuator.get_status()['stats']['failed'] == 1
+
+
+def test_restart_waits_for_stopped_worker():
+    print("\n🧪 Testing stop/start while a sort is in flight")
+    print("=" * 45)
+
+    moving = threading.Event()
+    release = threading.Event()
+
+    def slow_send(spin, pivot):
+        moving.set()
+        return release.wait(timeout=5)
+
+    actuator = RobotActuator(slow_send, dwell_time=0, settle_time=0, motion_margin=0)
+    actuator.restart_timeout = 0.05
+    tracker = LatencyTracker(trace_log='')
+    actuator.start()
+    assert actuator.enqueue('can', 65, 40, tracker.start())
+    assert moving.wait(timeout=2)
+    assert actuator.enqueue('paper', -65, -40, tracker.start())
+
+    # The worker outlives a short stop; the queued sort is cancelled, not lost
+    old_worker = actuator.worker_thread
+    actuator.stop(timeout=0.05)
+    assert old_worker.is_alive()
+    assert actuator.get_status()['stats']['cancelled'] == 1
+    assert tracker.get_metrics()['recent_traces'][-1]['outcome'] == 'robot_cancelled'
+
+    # No second worker while the first still drives the arm
+    assert not actuator.start()
+    release.set()
+    actuator.restart_timeout = 5.0  # Long enough for the old worker's reset phase
+    assert actuator.start()
+    old_worker.join(timeout=2)
+    assert not old_worker.is_alive() and actuator.worker_thread is not old_worker
+    actuator.stop()
+    print(f"✅ Restarted after the in-flight sort: {actuator.get_status()['stats']}")
+
+
+if __name__ == "__main__":
+    test_motion_estimates()
+    test_actuator_phases()
+    test_failed_sequence_resets_arm()
+    test_dropped_move_is_not_success()
+    test_restart_waits_for_stopped_worker()
+    print("\n🎯 ROBOT ACTUATOR TEST: PASSED!")
@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""
+Robot driver test
+Checks /sort handling of busy replies and unexpected bodies, and /move confirmation,
+against a fake session
+"""
+
+import json
+import sys
+sys.path.append('classification')
+
+import pytest
+
+pytest.importorskip('requests')
+
+from robot_driver import RobotDriver
+
+
+class FakeResponse:
+    def __init__(self, status_code, text):
+        self.status_code = status_code
+        self.text = text
+
+    def json(self):
+        return json.loads(self.text)
+
+
+class FakeSession:
+    def __init__(self, replies):
+        """replies maps a path to the list of (status, body) it answers with, in order"""
+        self.replies = replies
+        self.calls = []
+
+    def get(self, url, params=None, timeout=None):
+        path = '/' + url.rsplit('/', 1)[-1]
+        self.calls.append(path)
+        status, body = self.replies[path].pop(0) if len(self.replies[path]) > 1 else self.replies[path][0]
+        return FakeResponse(status, body)
+
+    def close(self):
+        pass
+
+
+def make_driver(replies):
+    driver = RobotDriver(base_url='http://robot.test', busy_retries=3, busy_delay=0.001)
+    driver.session = FakeSession(replies)
+    return driver
+
+
+def test_busy_is_retried():
+    print("🧪 Testing /sort busy backoff")
+    print("=" * 45)
+
+    driver = make_driver({'/sort': [(409, "Busy\n"), (409, "Busy\n"), (200, "7\n")],
+                          '/status': [(200, '{"completed": 7}')]})
+    result = driver.sort(65, 40, 0.5, poll_interval=0)
+    print(f"✅ Sort after two busy replies: {result}")
+    assert result['success']
+    assert driver.stats['retries_busy'] == 2
+
+    # Still busy after every retry: a failed sort, not an endless wait
+    driver = make_driver({'/sort': [(409, "Busy\n")]})
+    assert not driver.sort(65, 40, 0.5)['success']
+    assert driver.session.calls.count('/sort') == 4 and driver.stats['failures'] == 1
+
+
+def test_unexpected_body_fails_sort():
+    driver = make_driver({'/sort': [(200, "OK\n")]})
+    result = driver.sort(65, 40, 0.5)
+    print(f"✅ Non-numeric sort id: {result}")
+    assert result == {'success': False, 'request_time': result['request_time'], 'motion_time': 0.0}
+    assert driver.supports_sequences and driver.stats['failures'] == 1
+
+
+def test_missing_endpoint_falls_back():
+    driver = make_driver({'/sort': [(404, "Not found\n")]})
+    assert driver.sort(65, 40, 0.5) is None
+    assert driver.supports_sequences is False
+
+
+def test_move_is_confirmed_by_status():
+    print("\n🧪 Testing /move confirmation")
+    print("=" * 45)
+
+    driver = make_driver({'/status': [(200, '{"state": "idle", "running": true}'),
+                                      (200, '{"state": "idle", "running": false}')]})
+    assert driver.wait_for_move(poll_interval=0) is True
+    assert driver.session.calls.count('/status') == 2
+
+    # The firmware acknowledges /move during a sort sequence but drops it
+    driver = make_driver({'/status': [(200, '{"state": "dwell", "running": false}')]})
+    assert driver.wait_for_move(poll_interval=0) is False
+    assert driver.stats['failures'] == 1
+
+    # Motors that never stop within max_wait
+    driver = make_driver({'/status': [(200, '{"state": "idle", "running": true}')]})
+    assert driver.wait_for_move(max_wait=0.01, poll_interval=0.001) is False
+
+    # No /status endpoint: the caller falls back to the motion estimate
+    driver = make_driver({'/status': [(404, "Not found\n")]})
+    assert driver.wait_for_move(poll_interval=0) is None
+    assert driver.supports_status is False
+    print("✅ Confirmed, dropped, stuck and unsupported moves told apart")
+
+
+if __name__ == "__main__":
+    test_busy_is_retried()
+    test_unexpected_body_fails_sort()
+    test_missing_endpoint_falls_back()
+    test_move_is_confirmed_by_status()
+    print("\n🎯 ROBOT DRIVER TEST: PASSED!")
@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""
+ESP32 simulator test
+Checks that the local simulator reproduces the /move and /sort semantics of code.ino
+"""
+
+import json
+import sys
+import time
+import urllib.error
+import urllib.request
+sys.path.append('classification')
+
+from robot_simulator import CMD_INTERVAL_MS, start_simulator
+
+
+def get(url):
+    """GET a URL and return (status, body) without raising on HTTP errors"""
+    try:
+        with urllib.request.urlopen(url, timeout=2) as response:
+            return response.status, response.read().decode()
+    except urllib.error.HTTPError as e:
+        return e.code, e.read().decode()
+
+
+def test_move_semantics():
+    print("🧪 Testing simulated /move semantics")
+    print("=" * 45)
+
+    server, simulator, base_url = start_simulator()
+    try:
+        # Accepted move starts both motors
+        assert get(f"{base_url}/move?spin=65&pivot=40") == (200, "OK\n")
+        assert simulator.is_running()
+
+        # Back-to-back command inside CMD_INTERVAL_MS is rejected
+        status, body = get(f"{base_url}/move?spin=0&pivot=0")
+        print(f"✅ Rapid command: {status} {body.strip()}")
+        assert status == 429
+
+        # Command while motors are running is acknowledged but ignored
+        time.sleep(CMD_INTERVAL_MS / 1000 * 2)
+        assert get(f"{base_url}/move?spin=0&pivot=0") == (200, "OK\n")
+        assert simulator.stats['ignored_while_running'] == 1
+        assert simulator.motor_a.position == 105
+
+        # Missing arguments are a bad request
+        time.sleep(CMD_INTERVAL_MS / 1000 * 2)
+        status, _ = get(f"{base_url}/move?spin=10")
+        assert status == 400
+
+        # Targets are clamped once the motors are idle
+        while simulator.is_running():
+            time.sleep(0.01)
+        assert get(f"{base_url}/move?spin=500&pivot=0")[0] == 200
+        assert (simulator.motor_a.position, simulator.motor_b.position) == (200, 200)
+
+        print(f"✅ Simulator stats: {simulator.stats}")
+    finally:
+        server.shutdown()
+
+
+def test_sort_sequence():
+    print("\n🧪 Testing simulated /sort sequence")
+    print("=" * 45)
+
+    server, simulator, base_url = start_simulator()
+    try:
+        status, body = get(f"{base_url}/sort?spin=65&pivot=-40&dwell=50")
+        assert status == 200
+        sort_id = int(body)
+
+        # A second sort while the first is running is refused
+        time.sleep(CMD_INTERVAL_MS / 1000 * 2)
+        assert get(f"{base_url}/sort?spin=65&pivot=40&dwell=0")[0] == 409
+
+        # /status reports completion once the arm is back at neutral
+        deadline = time.time() + 5
+        while time.time() < deadline:
+            state = json.loads(get(f"{base_url}/status")[1])
+            if state['completed'] >= sort_id:
+                break
+            time.sleep(0.02)
+
+        print(f"✅ Final state: {state}")
+        assert state['state'] == 'idle'
+        assert state['completed'] == sort_id
+        assert (simulator.motor_a.position, simulator.motor_b.position) == (0, 0)
+    finally:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    test_move_semantics()
+    test_sort_sequence()
+    print("\n🎯 ROBOT SIMULATOR TEST: PASSED!")
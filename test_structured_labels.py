@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+"""
+Structured label test
+Drives the schema-constrained labeler through the offline stub model
+"""
+
+import json
+import sys
+sys.path.append('classification')
+
+from structured_labels import StructuredLabeler, StubModel, parse_label_response, response_schema
+
+LABELS = ['can', 'plastic', 'paper', 'other', 'no_object']
+
+
+def test_parse_label_response():
+    print("🧪 Testing response parsing")
+    print("=" * 45)
+
+    assert response_schema(LABELS)['properties']['label']['enum'] == LABELS
+    assert parse_label_response('{"label": "Can", "confidence": 0.9}', LABELS) == \
+        {'label': 'can', 'confidence': 0.9, 'error': None}
+    assert parse_label_response('It looks like a can', LABELS)['error'] == 'invalid_json'
+    assert parse_label_response('["can"]', LABELS)['error'] == 'invalid_json'
+    assert parse_label_response('{"label": "glass", "confidence": 0.9}', LABELS)['error'] == 'unknown_label'
+    assert parse_label_response('{"label": "can", "confidence": 7}', LABELS)['error'] == 'bad_confidence'
+    assert parse_label_response('{"label": "can", "confidence": true}', LABELS)['error'] == 'bad_confidence'
+    print("✅ Free text, unknown labels and bad confidences are rejected, not guessed")
+
+
+def test_stub_reaches_every_branch():
+    print("\n🧪 Testing labeler outcomes with the stub model")
+    print("=" * 45)
+
+    # Default cycle: confident, low, free text, unknown label, out-of-range confidence
+    labeler = StructuredLabeler(StubModel(LABELS), LABELS, min_confidence=0.6, max_attempts=2)
+    first = labeler.classify(b'frame')
+    assert first['status'] == 'accepted' and first['label'] == 'can' and first['attempts'] == 1
+
+    second = labeler.classify(b'frame')  # Low confidence, then free text on the retry
+    assert second['status'] == 'low_confidence' and second['label'] == 'plastic'
+    assert second['confidence'] == 0.35 and second['attempts'] == 2
+
+    third = labeler.classify(b'frame')  # Unknown label, then out-of-range confidence
+    assert third['status'] == 'unparseable' and third['label'] is None
+
+    stats = labeler.get_stats()
+    print(f"✅ {stats}")
+    assert stats['requests'] == 3 and stats['model_calls'] == 5 and stats['retries'] == 2
+    assert stats['accepted'] == 1 and stats['low_confidence'] == 1 and stats['unparseable'] == 1
+    assert stats['parse_failures'] == {'invalid_json': 1, 'unknown_label': 1, 'bad_confidence': 1}
+
+
+def test_retry_recovers():
+    stub = StubModel(LABELS, responses=['not json', json.dumps({'label': 'paper', 'confidence': 0.8})])
+    labeler = StructuredLabeler(stub, LABELS)
+    result = labeler.classify()
+    assert result['status'] == 'accepted' and result['label'] == 'paper' and result['attempts'] == 2
+
+    # The more confident of two low answers is kept
+    stub = StubModel(LABELS, responses=[json.dumps({'label': 'can', 'confidence': 0.5}),
+                                        json.dumps({'label': 'other', 'confidence': 0.2})])
+    result = StructuredLabeler(stub, LABELS).classify()
+    assert result['status'] == 'low_confidence' and result['label'] == 'can'
+
+
+if __name__ == "__main__":
+    test_parse_label_response()
+    test_stub_reaches_every_branch()
+    test_retry_recovers()
+    print("\n🎯 STRUCTURED LABEL TEST: PASSED!")
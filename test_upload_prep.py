@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+"""
+Upload preparation test
+Checks that uploads stay within the byte budget for large noisy frames and that
+the plate crop and upload info match the ROI
+"""
+
+import sys
+sys.path.append('classification')
+
+import pytest
+
+np = pytest.importorskip('numpy')
+cv2 = pytest.importorskip('cv2')
+
+from upload_prep import UploadPreparer
+
+
+def noisy_frame(shape=(1080, 1920, 3), seed=0):
+    """Full-HD sensor noise, about the worst case for JPEG"""
+    return np.random.default_rng(seed).integers(0, 256, size=shape, dtype=np.uint8)
+
+
+def test_noisy_frame_stays_under_budget():
+    print("🧪 Testing the byte budget on a noisy frame")
+    print("=" * 45)
+
+    frame = noisy_frame()
+    for budget in (40000, 20000, 8000):
+        preparer = UploadPreparer(byte_budget=budget)
+        for _ in range(3):  # Later calls start from the quality the last one settled on
+            data, info = preparer.prepare(frame)
+            assert len(data) <= budget and info['upload_bytes'] == len(data)
+        print(f"✅ Budget {budget}: {info['upload_bytes']} bytes at q{info['quality']}, "
+              f"{info['width']}x{info['height']}")
+        assert preparer.get_stats()['over_budget'] == 0
+        assert cv2.imdecode(np.frombuffer(data, dtype=np.uint8), cv2.IMREAD_COLOR) is not None
+
+
+def test_roi_crop_and_info():
+    print("\n🧪 Testing the plate crop")
+    print("=" * 45)
+
+    frame = np.zeros((480, 640, 3), dtype=np.uint8)
+    frame[100:300, 200:400] = 255  # The plate
+    preparer = UploadPreparer(roi=(200, 100, 200, 200), margin=0.1)
+
+    # The crop is the ROI grown by the margin on every side
+    crop = preparer.crop(frame)
+    assert crop.shape == (240, 240, 3)
+    assert crop[20:220, 20:220].min() == 255 and crop[:20].max() == 0
+
+    # The margin is clipped at the frame edge
+    edge = UploadPreparer(roi=(0, 0, 100, 100), margin=0.5).crop(frame)
+    assert edge.shape == (150, 150, 3)
+
+    data, info = preparer.prepare(frame)
+    print(f"✅ Upload info: {info}")
+    assert (info['width'], info['height']) == (240, 240)
+    assert info['upload_bytes'] == len(data) <= preparer.byte_budget
+    assert preparer.min_quality <= info['quality'] <= preparer.max_quality
+    assert info['encodes'] >= 1 and info['encode_ms'] >= 0
+    assert cv2.imdecode(np.frombuffer(data, dtype=np.uint8), cv2.IMREAD_COLOR).shape == (240, 240, 3)
+
+    preparer.record_call(info, 512.0)
+    stats = preparer.get_stats()
+    assert stats['last_call']['latency_ms'] == 512.0 and stats['avg_upload_bytes'] == len(data)
+
+
+if __name__ == "__main__":
+    test_noisy_frame_stays_under_budget()
+    test_roi_crop_and_info()
+    print("\n🎯 UPLOAD PREP TEST: PASSED!")